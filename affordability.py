@@ -0,0 +1,159 @@
+"""
+Affordability Search
+"Where can I afford with $X/year?" — every university × program whose annual
+total fits a budget, cheapest first.
+
+An annual total splits into living costs, which depend only on the city and
+the student's profile (rent, lifestyle, transit, summer plan), and tuition,
+which depends only on the university and program. AffordabilityIndex keeps
+each city × program's universities sorted by tuition, built once per
+reference tables. A query evaluates the profile once per city in a single
+batched engine call, bisects each sorted list at budget − living cost, and
+merges the surviving runs in total order, so no combination is recomputed:
+
+    python affordability.py 60000 --rent 1100 --program Engineering --top 20
+"""
+
+import argparse
+import heapq
+import sys
+from bisect import bisect_right
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from models import Housing, Lifestyle, Scenario, SummerPlan
+from reference_data import CUSTOM_UNIVERSITY
+from result_cache import ResultCache, cached_totals
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class AffordabilityIndex:
+    """(city, program) → universities sorted by program-adjusted tuition."""
+
+    def __init__(self, universities: Mapping[str, Mapping], programs: Mapping[str, Mapping]):
+        self.programs: Tuple[str, ...] = tuple(programs)
+        self.cities: Tuple[str, ...] = ()
+        self._tuitions: Dict[Tuple[str, str], List[float]] = {}
+        self._universities: Dict[Tuple[str, str], List[str]] = {}
+
+        by_city: Dict[str, List[Tuple[float, str]]] = {}
+        for uni, data in universities.items():
+            if uni != CUSTOM_UNIVERSITY and data['city'] is not None:
+                by_city.setdefault(data['city'], []).append((data['tuition'], uni))
+        self.cities = tuple(by_city)
+        for city, entries in by_city.items():
+            entries.sort()
+            for program, info in programs.items():
+                # one multiplier per program, so base-tuition order is also adjusted-tuition order
+                self._tuitions[city, program] = [tuition * info['multiplier'] for tuition, _ in entries]
+                self._universities[city, program] = [uni for _, uni in entries]
+
+    def __len__(self) -> int:
+        return sum(map(len, self._tuitions.values()))
+
+    def _run(self, city: str, program: str, living: float, budget: float) -> Iterator[Dict]:
+        tuitions, unis = self._tuitions[city, program], self._universities[city, program]
+        for i in range(bisect_right(tuitions, budget - living)):
+            total = living + tuitions[i]
+            yield {'university': unis[i], 'program': program, 'city': city, 'tuition': tuitions[i],
+                   'living': living, 'total': total, 'headroom': budget - total}
+
+    def search(self, budget: float, living: Mapping[str, float], programs: Iterable[str] = None,
+               cities: Iterable[str] = None, limit: int = None) -> List[Dict]:
+        """
+        Combinations with living[city] + tuition <= budget, cheapest first.
+
+        `living` maps city → annual living cost for the student's profile
+        (see living_costs); cities missing from it are skipped.
+        """
+        programs = self.programs if programs is None else tuple(programs)
+        cities = self.cities if cities is None else tuple(cities)
+        runs = [self._run(city, program, living[city], budget)
+                for city in cities if city in living for program in programs
+                if (city, program) in self._tuitions]
+        return list(islice(heapq.merge(*runs, key=lambda row: row['total']), limit))
+
+    def count(self, budget: float, living: Mapping[str, float], programs: Iterable[str] = None) -> int:
+        """Number of affordable combinations (bisection only, no rows built)."""
+        programs = set(self.programs if programs is None else programs)
+        return sum(bisect_right(tuitions, budget - living[city])
+                   for (city, program), tuitions in self._tuitions.items() if city in living and program in programs)
+
+# ============================================================================
+# LIVING COSTS
+# ============================================================================
+
+def living_costs(city_data: Mapping[str, Mapping[str, float]], rent: float, lifestyle: Lifestyle = None,
+                 transport_covered: bool = False, summer: SummerPlan = None, cities: Iterable[str] = None,
+                 cache: ResultCache = None) -> Dict[str, float]:
+    """
+    Annual living cost (total without tuition) per city for one profile.
+
+    Utilities and internet use each city's defaults; one batched engine call.
+    """
+    scenarios = []
+    for city in (city_data if cities is None else cities):
+        costs = city_data[city]
+        housing = Housing(rent, costs['utilities'], costs['internet_phone'], transport_covered)
+        scenarios.append(Scenario(city, 0.0, housing, lifestyle, summer))
+    return {s.city: totals[-1] for s, totals in zip(scenarios, cached_totals(scenarios, city_data, cache))}
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: List[str] = None) -> int:
+    from batch import non_negative_int
+    from currency import BASE_CURRENCY, format_amount, load_rates
+    from reference_data import load_tables
+    from student_profile import add_profile_arguments, currency_error, profile_lifestyle, profile_summer
+
+    parser = argparse.ArgumentParser(description="List every university × program within an annual budget")
+    parser.add_argument('budget', type=float, help="annual budget including tuition")
+    add_profile_arguments(parser)
+    parser.add_argument('--program', action='append', help="only this program (repeatable)")
+    parser.add_argument('--city', action='append', help="only this city (repeatable)")
+    parser.add_argument('--top', type=non_negative_int, default=25, help="rows to show (default: 25; 0 for all)")
+    parser.add_argument('--currency', default=BASE_CURRENCY, type=str.upper,
+                        help="budget and amounts in this currency (default: CAD)")
+    args = parser.parse_args(argv)
+
+    tables = load_tables()
+    rates = load_rates()
+    for name, given, known in [('program', args.program, tables['programs']),
+                               ('city', args.city, tables['city_data'])]:
+        unknown = [g for g in given or () if g not in known]
+        if unknown:
+            print(f"✗ Unknown {name}: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+    error = currency_error(args.currency, rates)
+    if error:
+        print(f"✗ {error}", file=sys.stderr)
+        return 2
+
+    rate = rates.rate(args.currency)
+    living = living_costs(tables['city_data'], args.rent, profile_lifestyle(args), args.transit_pass, profile_summer(args),
+                          cities=args.city)
+    index = AffordabilityIndex(tables['universities'], tables['programs'])
+    budget = args.budget / rate
+    matches = index.search(budget, living, programs=args.program, limit=args.top or None)
+    total = index.count(budget, living, programs=args.program)
+
+    money = lambda value: format_amount(value * rate, args.currency, 0)
+    print(f"\n🔎 {total:,} of {len(index):,} university/program combinations fit {money(budget)}/year")
+    if not matches:
+        cheapest = min(living.values())
+        print(f"   The cheapest city costs {money(cheapest)}/year to live in before tuition.")
+        return 0
+    print(f"   {'University':<42} {'Program':<22} {'Total':>14} {'Headroom':>14}")
+    for row in matches:
+        print(f"   {row['university'][:42]:<42} {row['program'][:22]:<22} "
+              f"{money(row['total']):>14} {money(row['headroom']):>14}")
+    if len(matches) < total:
+        print(f"   … {total - len(matches):,} more (use --top 0 to list all)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,29 +4,167 @@ Streamlit Web Application for International Student Cost Estimator
 
 """
 
-import streamlit as st
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import pandas as pd
+import streamlit as st
 from datetime import datetime
-import requests
 
-S3_BASE_URL = "https://intl-student-budget-data.s3.amazonaws.com"
+import instrument
+from charts import annual_bar_png, chart_key, comparison_png, monthly_pie_png
+from comparison import MAX_COLUMNS, compare, comparison_rows, pick_label
+from exporter import estimate_csv
+from models import Housing, Lifestyle, Scenario, SummerPlan, breakdowns
+from timeline import COMPONENTS, MAX_YEARS, Timeline
+from data_loader import DataLoader
+from affordability import AffordabilityIndex, living_costs
+from catalog import Catalog
+from currency import BASE_CURRENCY, format_amount, load_rates
+from depgraph import Graph
+from reference_data import SchemaError, load_tables
+from result_cache import ResultCache
+from store import open_store
+
+# One JSON report per rerun when BUDGET_PROFILE is set (see instrument.py)
+profile = instrument.start('app-rerun')
+
+SUMMER_PLANS = {"Staying in same city": "staying", "Moving to another city": "moving", "Going home": "home"}
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def load_reference_data():
+    # Precompiled snapshot when it matches the (cached/remote) data versions;
+    # a remote outage or invalid remote data falls back to the bundled JSON
+    return load_tables(DataLoader())
 
-@st.cache_data(show_spinner=False)
-def load_json(name: str):
-    url = f"{S3_BASE_URL}/{name}"
-    response = requests.get(url, timeout=5)
-    response.raise_for_status()
-    return response.json()
 try:
-    PROGRAMS = load_json("programs.json")
-    CITY_DATA = load_json("city_data.json")
-    UNIVERSITIES = load_json("universities.json")
-except requests.RequestException:
+    _data = load_reference_data()
+except (OSError, SchemaError):
+    # only reached when the bundled files themselves are unreadable or invalid
     st.error("Unable to load budget data. Please try again later.")
     st.stop()
+PROGRAMS, CITY_DATA, UNIVERSITIES = _data['programs'], _data['city_data'], _data['universities']
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def exchange_rates():
+    # Cached rate file, refreshed from BUDGET_RATES_URL when stale (see currency.py)
+    return load_rates()
+
+RATES = exchange_rates()
+
+@st.cache_resource(show_spinner=False)
+def reference_store():
+    # Optional SQLite store (BUDGET_DATA_DB) for institution lists too large for the JSON tables
+    return open_store()
+
+STORE = reference_store()
+
+@st.cache_resource(show_spinner=False)
+def result_cache():
+    # Shared by every session: identical scenarios from different users hit the same entry
+    return ResultCache(maxsize=50_000)
+STORE_PAGE_SIZE = 50
+
+def pick_from_store(store, query: str):
+    """City filter + paged university selectbox backed by the SQLite store."""
+    city_filter = st.selectbox("Filter by city:", ["All cities"] + store.cities())
+    city_filter = None if city_filter == "All cities" else city_filter
+    search = query or None
+    total = store.count(city=city_filter, search=search)
+    if not total:
+        st.caption(f"No institutions match '{query}'")
+        search, total = None, store.count(city=city_filter)
+    pages = -(-total // STORE_PAGE_SIZE)
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+    rows = store.page(page - 1, STORE_PAGE_SIZE, city=city_filter, search=search)
+    labels = {name: name if city is None else f"{name} ({city.split()[0]}, ${tuition // 1000:,.0f}k)"
+              for name, city, tuition in rows}
+    return st.selectbox(f"Select university ({total:,} found):", list(labels), format_func=labels.get)
+
+# ============================================================================
+# COMPUTATION GRAPH
+# ============================================================================
+
+APP_LIFESTYLE = ("Dining Out", "Entertainment", "Social", "Shopping", "Miscellaneous")
+
+def build_graph() -> Graph:
+    """Derived values for one session; each node reruns only when its inputs change."""
+    graph = Graph()
+
+    @graph.node('universities', 'programs')
+    def catalog(universities, programs):
+        return Catalog(universities, programs)
+
+    @graph.node('universities', 'programs', 'uni', 'program')
+    def adjusted_tuition(universities, programs, uni, program):
+        return int(universities[uni]["tuition"] * programs[program]["multiplier"])
+
+    @graph.node('rent', 'utilities', 'internet', 'transport_covered', 'rent_incl_util', 'rent_incl_internet')
+    def housing(*values):
+        return Housing(*values)
+
+    @graph.node('dining', 'entertainment', 'social', 'shopping', 'misc')
+    def lifestyle(*values):
+        return Lifestyle(values, APP_LIFESTYLE)
+
+    @graph.node('city_data', 'summer_type', 'summer_city', 'summer_rent')
+    def summer_plan(city_data, summer_type, summer_city, summer_rent):
+        if SUMMER_PLANS[summer_type] != 'moving':
+            return SummerPlan(SUMMER_PLANS[summer_type])
+        # Summer relocation uses the destination city's default utilities/internet/transit
+        sc = city_data[summer_city]
+        return SummerPlan('moving', summer_city, Housing(summer_rent, sc["utilities"], sc["internet_phone"]),
+                          Lifestyle())
+
+    @graph.node('city', 'tuition', 'housing', 'lifestyle', 'summer_plan', 'uni', 'program')
+    def scenario(city, tuition, housing, lifestyle, summer_plan, uni, program):
+        return Scenario(city, tuition, housing, lifestyle, summer_plan, university=uni, program=program)
+
+    @graph.node('scenario', 'city_data', 'result_cache')
+    def costs(scenario, city_data, cache):
+        return breakdowns([scenario], city_data, cache)[0]
+
+    @graph.node('universities', 'programs')
+    def afford_index(universities, programs):
+        return AffordabilityIndex(universities, programs)
+
+    @graph.node('city_data', 'rent', 'transport_covered', 'lifestyle', 'summer_plan', 'result_cache')
+    def city_living(city_data, rent, transport_covered, lifestyle, summer_plan, cache):
+        return living_costs(city_data, rent, lifestyle, transport_covered, summer_plan, cache=cache)
+
+    @graph.node('compare_picks', 'scenario', 'universities', 'programs', 'city_data', 'result_cache')
+    def comparison(picks, scenario, universities, programs, city_data, cache):
+        # The shared result cache makes this per-column: only newly added picks reach the engine
+        tables = {'universities': universities, 'programs': programs, 'city_data': city_data}
+        return compare(picks, scenario, tables, cache)
+
+    @graph.node('rates', 'costs', 'currency')
+    def shown_costs(rates, costs, currency):
+        return rates.convert_breakdown(costs, currency)
+
+    @graph.node('costs', 'shown_costs')
+    def monthly_table(costs, shown):
+        df = pd.DataFrame({'Category': costs.labels, 'Amount': costs.monthly})
+        if shown.currency != BASE_CURRENCY:
+            df[f"Amount ({shown.currency})"] = shown.monthly
+        return df[df['Amount'] > 0]
+
+    @graph.node('costs', 'shown_costs')
+    def annual_table(costs, shown):
+        df = pd.DataFrame({
+            'Period': ['Fall & Winter (8mo)', 'Summer (4mo)', 'Tuition', 'TOTAL'],
+            'Amount': [costs.fall_winter, costs.summer, costs.tuition, costs.total]
+        })
+        if shown.currency != BASE_CURRENCY:
+            df[f"Amount ({shown.currency})"] = [shown.fall_winter, shown.summer, shown.tuition, shown.total]
+        return df
+
+    return graph
+
+if 'graph' not in st.session_state:
+    st.session_state.graph = build_graph()
+graph = st.session_state.graph
+graph.start_rerun()
+graph.set(programs=PROGRAMS, city_data=CITY_DATA, universities=UNIVERSITIES, result_cache=result_cache(),
+          rates=RATES)
+
 # ============================================================================
 # CONFIG
 # ============================================================================
@@ -50,53 +188,49 @@ st.markdown("<p class='sub-header'>Plan Your International Student Expenses</p>"
 with st.sidebar:
     st.header("🎓 University & Program")
     
-    # Group universities by city for better UX
-    uni_options = []
-    for uni, data in UNIVERSITIES.items():
-        if uni == "Custom/Other":
-            uni_options.append(uni)
-        else:
-            city_short = data['city'].split()[0]
-            tuition_k = data['tuition'] // 1000
-            uni_options.append(f"{uni} ({city_short}, ${tuition_k}k)")
-    
-    uni_display = st.selectbox("Select university:", uni_options)
-    
-    # Extract actual university name
-    if "Custom/Other" in uni_display:
-        uni = "Custom/Other"
+    catalog = graph.get('catalog')
+    query = st.text_input("Find university", placeholder="Name or abbreviation, e.g. UBC, U of T")
+    if STORE is None:
+        uni_choices = (catalog.search(query, limit=len(catalog)) if query else None) or catalog.universities
+        uni = st.selectbox("Select university:", uni_choices, format_func=catalog.university_label)
+        university = UNIVERSITIES[uni]
     else:
-        uni = uni_display.split(" (")[0]
+        uni = pick_from_store(STORE, query)
+        university = STORE.university(uni)
     
     # Always show program selection
-    program_options = [f"{PROGRAMS[p]['emoji']} {p}" for p in PROGRAMS.keys()]
-    program_display = st.selectbox("Select your program/major:", program_options, 
-                                     help="Different programs have different tuition rates")
-    program = program_display.split(" ", 1)[1]  # Remove emoji
+    program = st.selectbox("Select your program/major:", catalog.programs, format_func=catalog.program_label,
+                           help="Different programs have different tuition rates")
     
     if uni == "Custom/Other":
         city = st.selectbox("Select city:", list(CITY_DATA.keys()))
         tuition = st.number_input("Annual Tuition (CAD)", min_value=0, value=25000, step=1000)
     else:
-        city = UNIVERSITIES[uni]["city"]
-        base_tuition = UNIVERSITIES[uni]["tuition"]
+        city = university["city"]
+        base_tuition = university["tuition"]
         
         # Show info about tuition calculation
         multiplier = PROGRAMS[program]["multiplier"]
         if multiplier != 1.0:
             st.info(f"ℹ️ {program} tuition is typically {multiplier}x the base rate")
         
-        # Calculate adjusted tuition based on program
-        adjusted_tuition = int(base_tuition * multiplier)
+        # Calculate adjusted tuition based on program (the store may list per-program tuition)
+        if STORE is None:
+            graph.set(uni=uni, program=program)
+            adjusted_tuition = graph.get('adjusted_tuition')
+        else:
+            adjusted_tuition = int(STORE.tuition(uni, program))
+        estimate = int(base_tuition * multiplier)
         
         tuition = st.number_input(
             f"Annual Tuition (CAD)", 
             min_value=0, 
             value=adjusted_tuition, 
             step=1000,
-            help=f"Estimated for {program}: ${base_tuition:,} × {multiplier} = ${adjusted_tuition:,}"
+            help=(f"Estimated for {program}: ${base_tuition:,.0f} × {multiplier} = ${adjusted_tuition:,}"
+                  if adjusted_tuition == estimate else f"Listed {program} tuition: ${adjusted_tuition:,}")
         )
-        st.caption(f"📍 {city} | Base rate: ${base_tuition:,}/year")
+        st.caption(f"📍 {city} | Base rate: ${base_tuition:,.0f}/year")
     
     st.header("🏠 Housing")
     rent = st.number_input("Monthly Rent (CAD)", min_value=0, value=1200, step=50)
@@ -119,8 +253,7 @@ with st.sidebar:
     misc = st.number_input("Miscellaneous (monthly)", min_value=0, value=100, step=10)
     
     st.header("☀️ Summer (4 months)")
-    summer_type = st.radio("Where will you be?",
-        ["Staying in same city", "Moving to another city", "Going home"])
+    summer_type = st.radio("Where will you be?", list(SUMMER_PLANS))
     
     summer_city = city
     summer_rent = rent
@@ -128,117 +261,175 @@ with st.sidebar:
         summer_city = st.selectbox("Summer city:", [c for c in CITY_DATA.keys() if c != city])
         summer_rent = st.number_input("Summer rent", min_value=0, value=1000, step=50)
 
+    st.header("💱 Currency")
+    currency = st.selectbox("Show amounts in", RATES.codes,
+                            help=f"Inputs stay in CAD · rates as of {RATES.as_of} ({RATES.source})")
+
 # ============================================================================
 # CALCULATIONS
 # ============================================================================
 
-city_costs = CITY_DATA[city]
-
-monthly_expenses = {
-    "Rent": rent,
-    "Groceries": city_costs["groceries"],
-    "Utilities": utilities,
-    "Internet & Phone": internet,
-    "Transportation": 0 if transport_covered else city_costs["transportation"],
-    "Dining Out": dining,
-    "Entertainment": entertainment,
-    "Social": social,
-    "Shopping": shopping,
-    "Miscellaneous": misc
-}
-
-monthly_total = sum(monthly_expenses.values())
-fall_winter_total = monthly_total * 8
-
-if summer_type == "Going home":
-    summer_total = 0
-elif summer_type == "Staying in same city":
-    summer_total = monthly_total * 4
-else:
-    sc = CITY_DATA[summer_city]
-    summer_monthly = summer_rent + sc["groceries"] + sc["utilities"] + sc["internet_phone"] + sc["transportation"]
-    summer_total = summer_monthly * 4
-
-annual_total = fall_winter_total + summer_total + tuition
+graph.set(
+    uni=uni, program=program, city=city, tuition=tuition,
+    rent=rent, utilities=utilities, internet=internet, transport_covered=transport_covered,
+    rent_incl_util=rent_incl_util, rent_incl_internet=rent_incl_internet,
+    dining=dining, entertainment=entertainment, social=social, shopping=shopping, misc=misc,
+    summer_type=summer_type, summer_city=summer_city, summer_rent=summer_rent, currency=currency,
+)
+scenario = graph.get('scenario')
+costs = graph.get('costs')
+shown = graph.get('shown_costs')
+money = lambda value, decimals=0: format_amount(value, currency, decimals)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def uncertainty_bands(key: str, _scenario: Scenario):
+    # keyed on the scenario's repr; a fixed seed keeps the bands stable across reruns
+    from simulation import percentile_bands, simulate
+    return percentile_bands(simulate(_scenario, CITY_DATA, 100_000, seed=0))
+
+monthly_total = shown.monthly_total
+fall_winter_total = shown.fall_winter
+summer_total = shown.summer
+annual_total = shown.total
 
 # ============================================================================
 # DISPLAY
 # ============================================================================
 
 # Header with university and program info
-st.info(f"🎓 **{uni}** | 📍 {city} | 📚 {program} | 💰 Tuition: ${tuition:,}")
+st.info(f"🎓 **{uni}** | 📍 {city} | 📚 {program} | 💰 Tuition: {money(shown.tuition)}")
 
 col1, col2, col3, col4 = st.columns(4)
-col1.metric("Monthly", f"${monthly_total:,.0f}", "Fall/Winter")
-col2.metric("8 Months", f"${fall_winter_total:,.0f}", "Fall + Winter")
-col3.metric("4 Months", f"${summer_total:,.0f}", "Summer")
-col4.metric("Annual Total", f"${annual_total:,.0f}", "All-in")
+col1.metric("Monthly", money(monthly_total), "Fall/Winter")
+col2.metric("8 Months", money(fall_winter_total), "Fall + Winter")
+col3.metric("4 Months", money(summer_total), "Summer")
+col4.metric("Annual Total", money(annual_total), "All-in")
 
 st.markdown("---")
 
-tab1, tab2, tab3 = st.tabs(["📊 Breakdown", "📈 Charts", "💾 Export"])
+tab1, tab2, tab_compare, tab_timeline, tab_afford, tab3 = st.tabs(
+    ["📊 Breakdown", "📈 Charts", "⚖️ Compare", "🗓️ Timeline", "🔎 Where Can I Afford?", "💾 Export"])
 
 with tab1:
     col1, col2 = st.columns(2)
+    amount_formats = {'Amount': '${:,.2f}', f"Amount ({currency})": lambda value: money(value, 2)}
     
     with col1:
         st.subheader("Monthly Expenses")
-        df = pd.DataFrame({
-            'Category': monthly_expenses.keys(),
-            'Amount': monthly_expenses.values()
-        })
-        df = df[df['Amount'] > 0]
-        st.dataframe(df.style.format({'Amount': '${:,.2f}'}), hide_index=True, use_container_width=True)
-        st.metric("Total", f"${monthly_total:,.0f}")
+        with instrument.span('app.breakdown_tables'):
+            df = graph.get('monthly_table')
+            st.dataframe(df.style.format(amount_formats), hide_index=True, use_container_width=True)
+        st.metric("Total", money(monthly_total))
     
     with col2:
         st.subheader("Annual Summary")
-        summary = pd.DataFrame({
-            'Period': ['Fall & Winter (8mo)', 'Summer (4mo)', 'Tuition', 'TOTAL'],
-            'Amount': [fall_winter_total, summer_total, tuition, annual_total]
-        })
-        st.dataframe(summary.style.format({'Amount': '${:,.2f}'}), hide_index=True, use_container_width=True)
+        with instrument.span('app.breakdown_tables'):
+            summary = graph.get('annual_table')
+            st.dataframe(summary.style.format(amount_formats), hide_index=True, use_container_width=True)
+
+        if st.checkbox("Show uncertainty bands (100k simulations)"):
+            bands = uncertainty_bands(repr(scenario), scenario)
+            rate = RATES.rate(currency)
+            st.dataframe(pd.DataFrame({
+                'Period': ['Fall & Winter (8mo)', 'Summer (4mo)', 'TOTAL'],
+                **{p: [bands[k][p] * rate for k in ('fall_winter', 'summer', 'total')] for p in ('P10', 'P50', 'P90')},
+            }).style.format({p: money for p in ('P10', 'P50', 'P90')}),
+                hide_index=True, use_container_width=True)
 
 with tab2:
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Monthly Distribution")
-        data = {k: v for k, v in monthly_expenses.items() if v > 0}
-        fig, ax = plt.subplots(figsize=(8, 8))
-        colors = plt.cm.Set3(range(len(data)))
-        ax.pie(data.values(), labels=data.keys(), autopct='%1.1f%%', colors=colors, startangle=90)
-        ax.set_title(f"${monthly_total:,.0f}/month", fontsize=14, fontweight='bold')
-        st.pyplot(fig)
+        with instrument.span('app.charts'):
+            st.image(monthly_pie_png(chart_key(costs.monthly_items()), f"{money(monthly_total)}/month"))
     
     with col2:
         st.subheader("Annual Breakdown")
-        fig, ax = plt.subplots(figsize=(8, 6))
-        periods = ['Fall/Winter', 'Summer', 'Tuition']
-        amounts = [fall_winter_total, summer_total, tuition]
-        bars = ax.bar(periods, amounts, color=['#2E86AB', '#F18F01', '#A23B72'])
-        ax.set_ylabel("Amount (CAD)", fontweight='bold')
-        ax.set_title(f"Total: ${annual_total:,.0f}", fontsize=14, fontweight='bold')
-        for bar in bars:
-            h = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2, h, f'${h:,.0f}', 
-                   ha='center', va='bottom', fontweight='bold')
-        st.pyplot(fig)
+        with instrument.span('app.charts'):
+            st.image(annual_bar_png(round(fall_winter_total), round(summer_total), round(shown.tuition),
+                                    f"Total: {money(annual_total)}", currency))
+
+with tab_compare:
+    st.subheader("Compare Universities")
+    col1, col2 = st.columns([3, 2])
+    comparable = [u for u in catalog.universities if catalog.city[u] is not None and u != "Custom/Other"]
+    # Empty by default: every tab renders on each rerun, and an unused comparison chart would cost a render
+    compare_unis = col1.multiselect("Universities to compare", comparable, format_func=catalog.university_label,
+                                    max_selections=MAX_COLUMNS)
+    compare_programs = col2.multiselect("Programs", catalog.programs, default=[program],
+                                        format_func=catalog.program_label)
+    picks = tuple((u, p) for u in compare_unis for p in compare_programs)
+    if len(picks) > MAX_COLUMNS:
+        st.warning(f"Showing the first {MAX_COLUMNS} of {len(picks)} university/program combinations")
+        picks = picks[:MAX_COLUMNS]
+    if picks:
+        graph.set(compare_picks=picks)
+        columns = [RATES.convert_breakdown(c, currency) for c in graph.get('comparison')]
+        labels = [pick_label(p) for p in picks]
+        rows = comparison_rows(columns)
+        st.dataframe(pd.DataFrame([values for _, values in rows], index=[label for label, _ in rows],
+                                  columns=labels).style.format(money), use_container_width=True)
+        with instrument.span('app.charts'):
+            st.image(comparison_png(tuple(labels), tuple(round(c.fall_winter) for c in columns),
+                                    tuple(round(c.summer) for c in columns), tuple(round(c.tuition) for c in columns),
+                                    "Annual Cost by University", currency))
+        st.caption("Same rent, lifestyle, transit and summer plan as the sidebar; "
+                   "utilities and internet use each city's defaults outside your own city")
+    else:
+        st.caption("Pick one or more universities and programs to compare")
+
+with tab_timeline:
+    st.subheader("Monthly Cash Flow")
+    col1, col2, col3 = st.columns(3)
+    years = col1.slider("Years of study", 1, MAX_YEARS, 1)
+    inflation = col2.number_input("Cost inflation (%/year)", min_value=0.0, max_value=20.0, value=3.0, step=0.5)
+    deposit = col3.number_input("Deposit (months of rent)", min_value=0.0, max_value=3.0, value=1.0, step=0.5)
+
+    # The timeline survives reruns; a sidebar change only recomputes the months it affects
+    options = (years, inflation, deposit)
+    timeline = st.session_state.get('timeline')
+    if timeline is None or st.session_state.get('timeline_options') != options:
+        timeline = Timeline(scenario, CITY_DATA, years, inflation / 100, deposit_months=deposit)
+        st.session_state.timeline, st.session_state.timeline_options = timeline, options
+    else:
+        timeline.update(scenario)
+
+    start_year = datetime.now().year
+    flows = pd.DataFrame(timeline.rows(start_year)).set_index('month') * RATES.rate(currency)
+    st.bar_chart(flows[list(COMPONENTS)])
+    peak = flows['total'].idxmax()
+    st.caption(f"Largest month: {peak} ({money(flows['total'][peak])}) · "
+               f"{len(flows)}-month total: {money(flows['cumulative'].iloc[-1])}")
+    st.dataframe(flows.style.format(money), use_container_width=True)
+
+with tab_afford:
+    st.subheader("Every University & Program Within Budget")
+    col1, col2 = st.columns(2)
+    budget = col1.number_input(f"Annual budget incl. tuition ({currency})", min_value=0,
+                               value=int(round(annual_total, -3)), step=1000)
+    only_program = col2.checkbox(f"Only {program}")
+
+    # Bisection over per-city tuition lists; living costs come from one batched call per sidebar change
+    index, living = graph.get('afford_index'), graph.get('city_living')
+    budget_cad, programs = budget / RATES.rate(currency), [program] if only_program else None
+    matches = index.search(budget_cad, living, programs=programs, limit=200)
+    st.caption(f"{index.count(budget_cad, living, programs):,} of {len(index):,} combinations fit, using your "
+               f"rent, lifestyle, transit and summer plan with each city's default utilities")
+    if matches:
+        rate = RATES.rate(currency)
+        st.dataframe(pd.DataFrame({
+            'University': [m['university'] for m in matches], 'Program': [m['program'] for m in matches],
+            'City': [m['city'] for m in matches], 'Total': [m['total'] * rate for m in matches],
+            'Headroom': [m['headroom'] * rate for m in matches],
+        }).style.format({'Total': money, 'Headroom': money}), hide_index=True, use_container_width=True)
 
 with tab3:
     st.subheader("Download Your Budget")
     
-    export_data = pd.DataFrame({
-        'Category': ['University', 'City', 'Program', '', 'MONTHLY EXPENSES'] + 
-                    list(monthly_expenses.keys()) + 
-                    ['', 'ANNUAL SUMMARY', 'Fall & Winter Total', 'Summer Total', 
-                     'Tuition', 'ANNUAL TOTAL'],
-        'Amount': [uni, city, program, '', ''] + 
-                  list(monthly_expenses.values()) + 
-                  ['', '', fall_winter_total, summer_total, tuition, annual_total]
-    })
-    
-    csv = export_data.to_csv(index=False)
+    with instrument.span('app.export_csv'):
+        # built outside the memoized graph so every download carries the current timestamp as its id
+        csv = estimate_csv(datetime.now().strftime('%Y%m%d%H%M%S'), graph.get('scenario'), costs, currency, RATES)
     st.download_button(
         label="📥 Download CSV",
         data=csv,
@@ -253,4 +444,18 @@ st.markdown("""
 <div style='text-align: center; color: #888; font-size: 0.9rem;'>
     Made for international students 🍁 | Data based on 2024 estimates
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+graph.end_rerun()
+last_profile = profile.stop()
+with st.expander("⚙️ Performance"):
+    latencies = sorted(graph.reruns)
+    st.caption(f"Rerun latency: last {graph.reruns[-1] * 1000:,.1f} ms · "
+               f"median {latencies[len(latencies) // 2] * 1000:,.1f} ms over {len(latencies)} reruns")
+    st.dataframe(graph.stats(), hide_index=True, use_container_width=True)
+    cache_stats = result_cache().stats()
+    st.caption(f"Result cache (all sessions): {cache_stats['entries']:,} entries · "
+               f"{cache_stats['hit_rate']:.0%} hit rate ({cache_stats['hits']:,} hits, {cache_stats['misses']:,} misses)")
+    if last_profile:
+        st.caption(f"Profile: {profile.path}")
+        st.json(last_profile['spans'], expanded=False)
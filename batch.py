@@ -0,0 +1,203 @@
+"""
+Headless Batch Mode
+Streams scenario records (JSONL) through the cost engine without prompts.
+
+Each input line is one JSON object shaped like the interactive collectors'
+output, e.g.
+
+    {"id": "s1", "university": "McGill University", "program": "Law",
+     "housing": {"rent": 1100, "transport_covered": false},
+     "lifestyle": {"Dining Out": 150, "Shopping": 60},
+     "summer": {"type": "moving", "city": "Toronto", "rent": 1400}}
+
+Missing utilities/internet fall back to the city defaults (or 0 when
+`util_incl`/`net_incl` is set), `tuition` defaults to the university's rate
+times the program multiplier, and `city` is required only for Custom/Other.
+"""
+
+import csv
+import json
+from itertools import islice
+from typing import Dict, IO, Iterable, Iterator, List
+
+from cost_engine import SUMMER_CODES
+from models import Housing, Lifestyle, Scenario, SummerPlan
+from result_cache import TOTALS, ResultCache, cached_totals
+
+RESULT_FIELDS = ['id', 'university', 'program', 'city', 'monthly', 'fall_winter', 'summer',
+                 'tuition', 'total', 'error']
+
+DEFAULT_CHUNK_SIZE = 1024
+
+# ============================================================================
+# INPUT
+# ============================================================================
+
+def read_records(stream: IO[str]) -> Iterator[Dict]:
+    """Yield one JSON object per non-blank line; never reads ahead."""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            record = {'id': f"line {line_no}", '_error': f"invalid JSON: {exc.msg}"}
+        if not isinstance(record, dict):
+            record = {'id': f"line {line_no}", '_error': "record must be a JSON object"}
+        yield record
+
+def _housing(raw: Dict, city_costs: Dict) -> Housing:
+    """Fill in housing the way collect_housing() would."""
+    util_incl = bool(raw.get('util_incl', False))
+    net_incl = bool(raw.get('net_incl', False))
+    utilities = raw.get('utilities')
+    internet = raw.get('internet')
+    return Housing(
+        float(raw['rent']),
+        0 if util_incl else (city_costs['utilities'] if utilities is None else float(utilities)),
+        0 if net_incl else (city_costs['internet_phone'] if internet is None else float(internet)),
+        bool(raw.get('transport_covered', False)), util_incl, net_incl
+    )
+
+def _lifestyle(raw: Dict) -> Lifestyle:
+    return Lifestyle.from_dict({k: float(v) for k, v in raw.items()})
+
+def normalize_record(record: Dict, tables: Dict) -> Scenario:
+    """Resolve defaults and validate one record into a Scenario. Raises ValueError."""
+    if '_error' in record:
+        raise ValueError(record['_error'])
+    city_data, universities, programs = tables['city_data'], tables['universities'], tables['programs']
+
+    uni = record.get('university', 'Custom/Other')
+    if uni not in universities:
+        raise ValueError(f"unknown university: {uni}")
+    program = record.get('program')
+    if program is not None and program not in programs:
+        raise ValueError(f"unknown program: {program}")
+
+    city = record.get('city') or universities[uni]['city']
+    if city not in city_data:
+        raise ValueError(f"unknown city: {city}")
+
+    tuition = record.get('tuition')
+    if tuition is None:
+        if uni == 'Custom/Other':
+            raise ValueError("tuition is required for Custom/Other")
+        multiplier = programs[program]['multiplier'] if program else 1.0
+        tuition = universities[uni]['tuition'] * multiplier
+
+    try:
+        housing = _housing(record.get('housing', {}), city_data[city])
+    except KeyError as exc:
+        raise ValueError(f"housing is missing {exc}") from None
+
+    raw_summer = record.get('summer', {'type': 'staying'})
+    summer_type = raw_summer.get('type')
+    if summer_type not in SUMMER_CODES:
+        raise ValueError(f"unknown summer type: {summer_type}")
+    if summer_type == 'moving':
+        summer_city = raw_summer.get('city')
+        if summer_city not in city_data:
+            raise ValueError(f"unknown summer city: {summer_city}")
+        try:
+            summer_housing = _housing(raw_summer, city_data[summer_city])
+        except KeyError as exc:
+            raise ValueError(f"summer is missing {exc}") from None
+        summer = SummerPlan('moving', summer_city, summer_housing, _lifestyle(raw_summer.get('lifestyle', {})))
+    else:
+        summer = SummerPlan(summer_type)
+
+    return Scenario(city, float(tuition), housing, _lifestyle(record.get('lifestyle', {})), summer,
+                    university=uni, program=program, id=record.get('id'))
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+def evaluate_scenarios(scenarios: List[Scenario], city_data: Dict, cache: ResultCache = None) -> List[Dict]:
+    """Run one chunk of scenarios through the batch engine (and `cache`, if given)."""
+    return [
+        {'id': s.id, 'university': s.university, 'program': s.program, 'city': s.city, **dict(zip(TOTALS, totals))}
+        for s, totals in zip(scenarios, cached_totals(scenarios, city_data, cache))
+    ]
+
+def evaluate_chunk(records: List[Dict], tables: Dict, cache: ResultCache = None) -> List[Dict]:
+    """Normalize and evaluate one chunk of raw records, keeping input order."""
+    results: List[Dict] = [None] * len(records)
+    valid, positions = [], []
+    for i, record in enumerate(records):
+        try:
+            valid.append(normalize_record(record, tables))
+            positions.append(i)
+        except (ValueError, TypeError, AttributeError) as exc:
+            results[i] = {'id': record.get('id'), 'error': str(exc)}
+    for i, row in zip(positions, evaluate_scenarios(valid, tables['city_data'], cache)):
+        results[i] = row
+    return results
+
+def positive_int(text: str) -> int:
+    """argparse type for sizes that must be >= 1 (--chunk-size, --flush-rows)."""
+    import argparse
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def non_negative_int(text: str) -> int:
+    """argparse type for counts where 0 means off or unlimited (--simulate, --cache-size, --top)."""
+    import argparse
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {text!r}") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+    return value
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Split a stream into lists of at most `size` items."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def evaluate_stream(records: Iterable[Dict], tables: Dict, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    cache: ResultCache = None) -> Iterator[Dict]:
+    """Evaluate a record stream chunk by chunk; memory is bounded by chunk_size."""
+    for chunk in chunked(records, chunk_size):
+        yield from evaluate_chunk(chunk, tables, cache)
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def write_jsonl(results: Iterable[Dict], out: IO[str]) -> int:
+    """Stream results as JSON lines. Returns the number of rows written."""
+    count = 0
+    for row in results:
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+def write_csv(results: Iterable[Dict], out: IO[str], fields: List[str] = RESULT_FIELDS) -> int:
+    """Stream results as CSV rows. Returns the number of rows written."""
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    count = 0
+    for row in results:
+        writer.writerow({k: (f"{v:.2f}" if isinstance(v, float) else v) for k, v in row.items()})
+        count += 1
+    return count
+
+WRITERS = {'jsonl': write_jsonl, 'csv': write_csv}
+
+def run_batch(source: IO[str], out: IO[str], tables: Dict, fmt: str = 'jsonl',
+              chunk_size: int = DEFAULT_CHUNK_SIZE, cache: ResultCache = None) -> int:
+    """Read JSONL scenarios from `source` and stream results to `out`."""
+    return WRITERS[fmt](evaluate_stream(read_records(source), tables, chunk_size, cache), out)
@@ -0,0 +1,302 @@
+"""
+Concurrent-Session Load Test
+Simulates N students using app.py at once: each session is a Streamlit
+AppTest in its own process (AppTest keeps one global runtime per process, so
+sessions cannot share one), changing random sidebar widgets:
+
+    python benchmarks/load.py --sessions 1,8,32 --reruns 30
+    python benchmarks/load.py --sessions 16 --think-ms 500 -o load.json
+    python benchmarks/load.py --sessions 8 --max-p95-ms 1500     # exit 1 on regression
+
+For each concurrency level it reports rerun latency percentiles (overall and
+per widget), reruns/second, CPU per rerun, and resident memory: the cost of
+opening a session and its growth over the run. Every process warms up with a
+throwaway session before the level starts, so imports and its caches are not
+charged to the measurement; sessions therefore do not share st.cache_data /
+st.cache_resource entries as they would on one server, and the figures are
+CPU contention between concurrent reruns rather than cache sharing.
+--tracemalloc adds each session's Python heap growth.
+
+A level fails if any session raises or completes fewer than --reruns reruns.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from run import ROOT, SEED, environment
+
+APP = os.path.join(ROOT, 'app.py')
+STARTUP_S = 120  # allowance for a session process to start, import streamlit and warm up
+
+# ============================================================================
+# USER ACTIONS
+# ============================================================================
+
+def _widget(elements, label: str):
+    # AppTest widgets without an explicit key have no stable key, so look them up by label
+    return next(w for w in elements if w.label.startswith(label))
+
+def _number(label: str, lo: int, hi: int, step: int) -> Callable:
+    return lambda at, rng: _widget(at.number_input, label).set_value(rng.randrange(lo, hi, step))
+
+def _select(label: str) -> Callable:
+    def act(at, rng):
+        box = _widget(at.selectbox, label)
+        box.select_index(rng.randrange(len(box.options)))  # options are display labels, so pick by index
+    return act
+
+def _radio(label: str) -> Callable:
+    def act(at, rng):
+        radio = _widget(at.radio, label)
+        radio.set_value(rng.choice(radio.options))
+    return act
+
+def _toggle(label: str) -> Callable:
+    def act(at, rng):
+        box = _widget(at.checkbox, label)
+        box.set_value(not box.value)
+    return act
+
+# Sidebar changes a student makes, weighted roughly by how often they happen
+ACTIONS: Dict[str, Tuple[Callable, int]] = {
+    'rent': (_number("Monthly Rent", 600, 2500, 25), 4),
+    'dining': (_number("Dining Out", 0, 600, 20), 2),
+    'shopping': (_number("Shopping", 0, 400, 10), 1),
+    'transit': (_toggle("Free transit pass"), 1),
+    'summer': (_radio("Where will you be?"), 1),
+    'program': (_select("Select your program/major"), 1),
+    'university': (_select("Select university"), 2),
+}
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource  # peak, not current, where /proc is unavailable
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {'count': len(ordered), 'p50_ms': pick(0.50), 'p90_ms': pick(0.90), 'p95_ms': pick(0.95),
+            'p99_ms': pick(0.99), 'max_ms': ordered[-1] * 1000} if ordered else {'count': 0}
+
+class Session:
+    """One simulated student: an AppTest plus a private random action stream."""
+
+    def __init__(self, index: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+        self.rng = random.Random(SEED + index)
+        self.app = AppTest.from_file(APP, default_timeout=timeout)
+        self.timings: List[Tuple[str, float]] = []
+        self.errors: List[str] = []
+        self._names = list(ACTIONS)
+        self._weights = [weight for _, weight in ACTIONS.values()]
+
+    def open(self) -> float:
+        start = time.perf_counter()
+        try:
+            self.app.run()
+        except Exception as exc:
+            self.errors.append(f"open: {exc!r}")
+        self._check('open')
+        return time.perf_counter() - start
+
+    def step(self) -> bool:
+        """Make one widget change and rerun; False if it could not be completed."""
+        names = self.rng.sample(self._names, counts=self._weights, k=sum(self._weights))
+        for name in dict.fromkeys(names):  # weighted order; fall through actions whose widget is not on screen
+            try:
+                ACTIONS[name][0](self.app, self.rng)
+            except StopIteration:
+                continue
+            except Exception as exc:
+                self.errors.append(f"{name}: {exc!r}")
+                return False
+            start = time.perf_counter()
+            try:
+                self.app.run()
+            except Exception as exc:
+                self.errors.append(f"{name}: {exc!r}")
+                return False
+            self.timings.append((name, time.perf_counter() - start))
+            return self._check(name)
+        self.errors.append("no action available")
+        return False
+
+    def _check(self, action: str) -> bool:
+        if self.app.exception:
+            self.errors.append(f"{action}: {self.app.exception[0].message}")
+            return False
+        return True
+
+def _wait(barrier, timeout: float):
+    try:
+        barrier.wait(timeout)
+    except threading.BrokenBarrierError:
+        pass  # another session failed; carry on so this one still reports
+
+def _user(index: int, reruns: int, think_ms: float, timeout: float, trace: bool, start, ready, results):
+    """One session process: warm up, open together with the others, then rerun `reruns` times."""
+    import logging
+    import streamlit.testing.v1  # noqa: F401  (configures streamlit's loggers, so quiet them afterwards)
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    report = {'index': index, 'opens': [], 'timings': [], 'errors': [], 'completed': 0}
+    try:
+        import tracemalloc
+        warmup = Session(-1 - index, timeout)
+        warmup.open()
+        for _ in range(3):
+            warmup.step()
+        del warmup
+        if trace:
+            tracemalloc.start()
+        session = Session(index, timeout)
+        report['rss_before'] = rss_bytes()
+        _wait(start, timeout)
+        report['opens'].append(session.open())
+        _wait(ready, timeout)
+        report.update(rss_open=rss_bytes(), heap_open=tracemalloc.get_traced_memory()[0] if trace else 0,
+                      cpu=time.process_time(), began=time.time())
+        for _ in range(reruns):
+            report['completed'] += session.step()
+            if think_ms:
+                time.sleep(session.rng.expovariate(1000 / think_ms))
+        report.update(ended=time.time(), cpu=time.process_time() - report['cpu'], rss_end=rss_bytes(),
+                      heap_end=tracemalloc.get_traced_memory()[0] if trace else 0)
+        report['timings'], report['errors'] = session.timings, session.errors
+    except Exception as exc:
+        report['errors'].append(f"session: {exc!r}")
+        start.abort()
+        ready.abort()
+    results.put(report)
+
+def run_level(sessions: int, reruns: int, think_ms: float, timeout: float, trace: bool) -> Dict:
+    """Start `sessions` session processes, open them together, then have each make `reruns` widget changes."""
+    ctx = multiprocessing.get_context('spawn')
+    start, ready, results = ctx.Barrier(sessions), ctx.Barrier(sessions), ctx.Queue()
+    procs = [ctx.Process(target=_user, args=(i, reruns, think_ms, timeout, trace, start, ready, results),
+                         daemon=True) for i in range(sessions)]
+    for proc in procs:
+        proc.start()
+    users = []
+    deadline = time.monotonic() + STARTUP_S + timeout * (reruns + 4)
+    while len(users) < sessions:
+        try:
+            users.append(results.get(timeout=max(1, deadline - time.monotonic())))
+        except Exception:  # queue.Empty: a session process died or hung
+            break
+    for proc in procs:
+        proc.join(1)
+        if proc.is_alive():
+            proc.terminate()
+    lost = sessions - len(users)
+
+    measured = [u for u in users if 'ended' in u]
+    wall = (max(u['ended'] for u in measured) - min(u['began'] for u in measured)) if measured else 0
+    timings = [tuple(t) for u in users for t in u['timings']]
+    completed = sum(u['completed'] for u in users)
+    by_action: Dict[str, List[float]] = {}
+    for name, seconds in timings:
+        by_action.setdefault(name, []).append(seconds)
+    mean = lambda key: sum(key(u) for u in measured) / len(measured) / 2**20 if measured else None
+    errors = [e for u in users for e in u['errors']]
+    if lost:
+        errors.append(f"{lost} session process(es) exited without reporting")
+    report = {
+        'sessions': sessions, 'reruns_per_session': reruns, 'think_ms': think_ms,
+        'wall_s': wall, 'reruns': len(timings), 'completed': completed, 'expected': sessions * reruns,
+        'reruns_per_s': len(timings) / wall if wall else None,
+        'open': percentiles([s for u in users for s in u['opens']]), 'rerun': percentiles([s for _, s in timings]),
+        'by_action': {name: percentiles(samples) for name, samples in sorted(by_action.items())},
+        'cpu_ms_per_rerun': sum(u['cpu'] for u in measured) * 1000 / len(timings) if timings else None,
+        'rss_per_session_mb': mean(lambda u: u['rss_open'] - u['rss_before']),
+        'rss_growth_per_session_mb': mean(lambda u: u['rss_end'] - u['rss_open']),
+        'error_count': len(errors), 'errors': errors[:20],
+    }
+    if trace and measured:
+        report['heap_per_session_kb'] = sum(u['heap_end'] - u['heap_open'] for u in measured) / 1024 / len(measured)
+    return report
+
+def summary_line(level: Dict) -> str:
+    rerun = level['rerun']
+    line = (f"   {level['sessions']:>4} sessions: {level['reruns_per_s'] or 0:>6.1f} reruns/s · "
+            f"p50 {rerun.get('p50_ms', 0):>6.0f} ms · p95 {rerun.get('p95_ms', 0):>6.0f} ms · "
+            f"p99 {rerun.get('p99_ms', 0):>6.0f} ms · CPU {level['cpu_ms_per_rerun'] or 0:>4.0f} ms/rerun · "
+            f"{level['rss_per_session_mb'] or 0:+.1f} MB/session "
+            f"({level['rss_growth_per_session_mb'] or 0:+.1f} MB over the run)")
+    if level['completed'] < level['expected']:
+        line += f" · {level['completed']}/{level['expected']} reruns completed"
+    return line + (f" · {level['error_count']} errors" if level['error_count'] else "")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for app.py")
+    parser.add_argument('--sessions', default='1,4,16', help="concurrency levels, comma separated (default: 1,4,16)")
+    parser.add_argument('--reruns', type=int, default=20, help="widget changes per session (default: 20)")
+    parser.add_argument('--think-ms', type=float, default=0,
+                        help="mean pause between a session's changes; 0 = back-to-back (default: 0)")
+    parser.add_argument('--timeout', type=float, default=120, help="per-rerun AppTest timeout in seconds")
+    parser.add_argument('--tracemalloc', action='store_true', help="also report Python heap growth (slower)")
+    parser.add_argument('--max-p95-ms', type=float, help="exit 1 if any level's p95 rerun latency exceeds this")
+    parser.add_argument('--output', '-o', default='-', help="JSON output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        print("✗ The load test requires streamlit (pip install streamlit)", file=sys.stderr)
+        return 1
+    os.environ.setdefault('BUDGET_DATA_URL', '')  # inherited by the session processes
+
+    levels = []
+    for sessions in (int(n) for n in args.sessions.split(',')):
+        print(f"👥 {sessions} concurrent sessions...", file=sys.stderr)
+        levels.append(run_level(sessions, args.reruns, args.think_ms, args.timeout, args.tracemalloc))
+        print(summary_line(levels[-1]), file=sys.stderr)
+
+    report = {'environment': environment(), 'levels': levels}
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Wrote {args.output}", file=sys.stderr)
+
+    failed = [lvl['sessions'] for lvl in levels
+              if args.max_p95_ms is not None and lvl['rerun'].get('p95_ms', 0) > args.max_p95_ms]
+    short = [lvl['sessions'] for lvl in levels if lvl['completed'] < lvl['expected']]
+    errors = sum(lvl['error_count'] for lvl in levels)
+    if failed:
+        print(f"✗ p95 above {args.max_p95_ms:,.0f} ms at {', '.join(map(str, failed))} sessions", file=sys.stderr)
+    if short:
+        print(f"✗ reruns missing at {', '.join(map(str, short))} sessions", file=sys.stderr)
+    if errors:
+        print(f"✗ {errors} session errors", file=sys.stderr)
+    return 1 if failed or short or errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Benchmark Suite
+Reproducible timings for the cost engine, CSV export, chart rendering and a
+Streamlit rerun, written as JSON so results can be compared across commits:
+
+    python benchmarks/run.py                      # full suite → stdout
+    python benchmarks/run.py --quick -o bench.json
+    python benchmarks/run.py --only engine,export
+
+Every benchmark uses a fixed random seed, so inputs are identical run to run.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import matplotlib
+matplotlib.use("Agg")
+
+SEED = 20251117
+
+# ============================================================================
+# HARNESS
+# ============================================================================
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Time `fn` `repeat` times after `warmup` untimed calls; seconds per call."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        'repeat': repeat,
+        'mean_s': statistics.fmean(samples),
+        'median_s': statistics.median(samples),
+        'p95_s': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'min_s': samples[0],
+    }
+
+def result(name: str, timing: Dict[str, float], items: int = 1, unit: str = 'calls') -> Dict:
+    """One benchmark record; throughput is based on the median."""
+    return {'name': name, 'items_per_call': items, 'unit': unit,
+            f'{unit}_per_s': items / timing['median_s'] if timing['median_s'] else None, **timing}
+
+def random_scenarios(n: int, tables: Dict) -> List:
+    """Deterministic mix of staying/home/moving scenarios across all universities."""
+    from models import Housing, Lifestyle, Scenario, SummerPlan
+
+    rng = random.Random(SEED)
+    cities = list(tables['city_data'])
+    unis = [(u, d) for u, d in tables['universities'].items() if d['city']]
+    scenarios = []
+    for _ in range(n):
+        uni, data = rng.choice(unis)
+        city = data['city']
+        housing = Housing(rng.uniform(600, 2500), tables['city_data'][city]['utilities'],
+                          tables['city_data'][city]['internet_phone'], rng.random() < 0.3)
+        lifestyle = Lifestyle([rng.uniform(0, 300) for _ in range(5)])
+        kind = rng.choice(['staying', 'home', 'moving'])
+        if kind == 'moving':
+            dest = rng.choice(cities)
+            summer = SummerPlan('moving', dest, Housing(rng.uniform(600, 2000), 100, 60), Lifestyle([50, 50]))
+        else:
+            summer = SummerPlan(kind)
+        scenarios.append(Scenario(city, float(data['tuition']), housing, lifestyle, summer, university=uni))
+    return scenarios
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def bench_engine(quick: bool) -> List[Dict]:
+    """calculate_costs one scenario at a time vs one batched call."""
+    import cost_estimator
+    from cost_engine import calculate_scenarios
+
+    n = 2_000 if quick else 20_000
+    scenarios = random_scenarios(n, cost_estimator.reference_tables())
+    scalar = measure(lambda: [cost_estimator.calculate_costs(s) for s in scenarios], repeat=3)
+    batch = measure(lambda: calculate_scenarios(scenarios, cost_estimator.CITY_DATA), repeat=10)
+    return [result('engine.calculate_costs_scalar', scalar, n, 'scenarios'),
+            result('engine.calculate_scenarios_batch', batch, n, 'scenarios')]
+
+def bench_export(quick: bool) -> List[Dict]:
+    """export_csv: one file per estimate, rows written per second."""
+    import cost_estimator
+
+    scenarios = random_scenarios(50 if quick else 200, cost_estimator.reference_tables())
+    costs = [cost_estimator.calculate_costs(s) for s in scenarios]
+    rows_per_file = 13 + sum(1 for _ in costs[0].monthly_items())
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                timing = measure(lambda: [cost_estimator.export_csv(s.city, s.university, c)
+                                          for s, c in zip(scenarios, costs)], repeat=3)
+        finally:
+            os.chdir(cwd)
+    return [result('export.export_csv', timing, len(costs) * rows_per_file, 'rows')]
+
+def bench_charts(quick: bool) -> List[Dict]:
+    """create_visualizations (uncached pyplot path) and the app's cached PNG path."""
+    import matplotlib.pyplot as plt
+    import charts
+    import cost_estimator
+
+    scenarios = random_scenarios(5 if quick else 20, cost_estimator.reference_tables())
+    costs = [cost_estimator.calculate_costs(s) for s in scenarios]
+
+    def render_cli():
+        for s, c in zip(scenarios, costs):
+            cost_estimator.create_visualizations(s.city, c)
+            plt.close('all')
+
+    def render_cached():
+        for c in costs:
+            charts.monthly_pie_png(charts.chart_key(c.monthly_items()), f"${c.monthly_total:,.0f}/month")
+            charts.annual_bar_png(round(c.fall_winter), round(c.summer), round(c.tuition), f"${c.total:,.0f}")
+
+    cli = measure(render_cli, repeat=2)
+    charts.monthly_pie_png.cache_clear()
+    charts.annual_bar_png.cache_clear()
+    cold = measure(render_cached, repeat=1, warmup=0)
+    warm = measure(render_cached, repeat=5)
+    return [result('charts.create_visualizations', cli, len(costs), 'reports'),
+            result('charts.app_png_cold', cold, len(costs), 'reports'),
+            result('charts.app_png_cached', warm, len(costs), 'reports')]
+
+def bench_app(quick: bool) -> List[Dict]:
+    """Full app.py script reruns through Streamlit's AppTest."""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return [{'name': 'app.rerun', 'skipped': 'streamlit.testing is not available'}]
+
+    import logging
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    os.environ.setdefault('BUDGET_DATA_URL', '')
+    app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60)
+    app.run()
+    rents = iter(range(500, 100_000, 25))
+
+    def rerun():
+        # unkeyed widgets have key None, so find the input by label each time
+        next(n for n in app.number_input if n.label.startswith("Monthly Rent")).set_value(next(rents)).run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+
+    first = measure(lambda: AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60).run(),
+                    repeat=1 if quick else 3, warmup=0)
+    return [result('app.first_run', first),
+            result('app.rerun_rent_change', measure(rerun, repeat=5 if quick else 20))]
+
+def bench_service(quick: bool) -> List[Dict]:
+    """Concurrent POST /estimate calls through the in-process ASGI client (coalesced)."""
+    import asyncio
+    try:
+        import service
+        app = service.create_app()
+    except RuntimeError as exc:
+        return [{'name': 'service.estimate', 'skipped': str(exc)}]
+
+    from reference_data import load_tables
+
+    n = 200 if quick else 2_000
+    rng = random.Random(SEED)
+    unis = [u for u, d in load_tables()['universities'].items() if d['city']]
+    records = [{'id': i, 'university': rng.choice(unis), 'housing': {'rent': rng.uniform(600, 2500)}}
+               for i in range(n)]
+
+    async def burst():
+        await asyncio.gather(*[service.request(app, 'POST', '/estimate', r) for r in records])
+
+    timing = measure(lambda: asyncio.run(burst()), repeat=3)
+    latency = app.state.latency.summary()['estimate']
+    return [{**result('service.estimate_concurrent', timing, n, 'requests'),
+             'request_p50_ms': latency['p50_ms'], 'request_p99_ms': latency['p99_ms'],
+             'mean_coalesced_batch': app.state.coalescer.stats()['mean_batch']}]
+
+BENCHMARKS = {'engine': bench_engine, 'export': bench_export, 'charts': bench_charts, 'app': bench_app,
+              'service': bench_service}
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    import numpy
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'numpy': numpy.__version__, 'matplotlib': matplotlib.__version__,
+            'commit': commit, 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cost estimator benchmark suite")
+    parser.add_argument('--only', help=f"comma list from: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--quick', action='store_true', help="smaller inputs for a fast smoke run")
+    parser.add_argument('--output', '-o', default='-', help="JSON output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    results = []
+    for name in names:
+        print(f"⏱️  {name}...", file=sys.stderr)
+        results.extend(BENCHMARKS[name](args.quick))
+
+    report = {'environment': environment(), 'quick': args.quick, 'results': results}
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Wrote {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
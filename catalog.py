@@ -0,0 +1,141 @@
+"""
+University Catalog
+Lookup indexes over the reference tables, built once when the data is
+loaded and shared by the CLI and the app:
+
+    by_city          city → universities, in data order
+    lookup()         exact name or alias ("UBC", "U of T", "SFU") in O(1)
+    search()         exact/alias, then word-prefix (bisect over sorted keys),
+                     then fuzzy matches for typos
+    tuition_range()  universities with lo <= tuition <= hi in O(log n + k)
+
+Display labels are precomputed so front ends can select by key instead of
+parsing label strings back apart.
+"""
+
+import difflib
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from reference_data import CUSTOM_UNIVERSITY
+
+STOPWORDS = frozenset(('of', 'de', 'du', 'la', 'le', 'the', 'and', 'et'))
+
+# Common names that acronyms of the official names don't produce;
+# entries whose university isn't in the loaded data are ignored
+ALIASES = {
+    "U of T": "University of Toronto",
+    "UofT": "University of Toronto",
+    "Ryerson": "Toronto Metropolitan University",
+    "University of British Columbia": "UBC",
+    "UdeM": "Université de Montréal",
+    "uOttawa": "University of Ottawa",
+    "UCalgary": "University of Calgary",
+    "UAlberta": "University of Alberta",
+    "U of A": "University of Alberta",
+    "UWaterloo": "University of Waterloo",
+    "Laurier": "Wilfrid Laurier University",
+    "U of G": "University of Guelph",
+    "UManitoba": "University of Manitoba",
+    "UWinnipeg": "University of Winnipeg",
+    "Dal": "Dalhousie University",
+    "SMU": "Saint Mary's University",
+}
+
+def normalize(text: str) -> str:
+    """Case-, accent- and punctuation-insensitive key: 'Université  de Montréal' → 'universite de montreal'."""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r"[^\w\s]", ' ', text.replace("'", '')).split())
+
+def acronym(name: str) -> str:
+    """Initials of the significant words: 'Simon Fraser University' → 'sfu'."""
+    words = normalize(name).split()
+    return ''.join(w[0] for w in words if w not in STOPWORDS) if len(words) > 1 else ''
+
+class Catalog:
+    """Indexes over the universities and programs tables."""
+
+    def __init__(self, universities: Mapping[str, Mapping], programs: Mapping[str, Mapping]):
+        self.by_city: Dict[str, Tuple[str, ...]] = {}
+        for uni, data in universities.items():
+            if uni != CUSTOM_UNIVERSITY and data['city'] is not None:
+                self.by_city[data['city']] = self.by_city.get(data['city'], ()) + (uni,)
+
+        # City-grouped order with Custom/Other last: the numbering both front ends show
+        self.universities: Tuple[str, ...] = tuple(u for unis in self.by_city.values() for u in unis)
+        if CUSTOM_UNIVERSITY in universities:
+            self.universities += (CUSTOM_UNIVERSITY,)
+        self.programs: Tuple[str, ...] = tuple(programs)
+
+        self.city = {u: universities[u]['city'] for u in self.universities}
+        self.tuition = {u: universities[u]['tuition'] for u in self.universities}
+        self.university_labels = {
+            u: u if u == CUSTOM_UNIVERSITY else f"{u} ({self.city[u].split()[0]}, ${self.tuition[u] // 1000:,.0f}k)"
+            for u in self.universities}
+        self.program_labels = {p: f"{programs[p]['emoji']} {p}" for p in self.programs}
+
+        # normalized name/alias → university; ambiguous generated acronyms are dropped
+        self._names: Dict[str, str] = {}
+        acronyms: Dict[str, List[str]] = {}
+        for uni in self.universities:
+            self._names[normalize(uni)] = uni
+            acronyms.setdefault(acronym(uni), []).append(uni)
+        for key, unis in acronyms.items():
+            if key and len(unis) == 1:
+                self._names.setdefault(key, unis[0])
+        for alias, uni in ALIASES.items():
+            if uni in self.tuition:
+                self._names.setdefault(normalize(alias), uni)
+
+        # (key, university) for every word-start suffix of every name/alias, sorted for prefix bisection
+        words = sorted({(' '.join(key.split()[i:]), uni)
+                        for key, uni in self._names.items() for i in range(len(key.split()))})
+        self._prefix_keys = [key for key, _ in words]
+        self._prefix_unis = [uni for _, uni in words]
+
+        by_tuition = sorted((t, u) for u, t in self.tuition.items() if u != CUSTOM_UNIVERSITY)
+        self._tuitions = [t for t, _ in by_tuition]
+        self._by_tuition = [u for _, u in by_tuition]
+
+    def __len__(self) -> int:
+        return len(self.universities)
+
+    def university_label(self, uni: str) -> str:
+        return self.university_labels[uni]
+
+    def program_label(self, program: str) -> str:
+        return self.program_labels[program]
+
+    def lookup(self, query: str) -> Optional[str]:
+        """Canonical university for an exact name or alias (any case/accents), else None."""
+        return self._names.get(normalize(query))
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Best matches for free text: exact/alias, then word prefixes, then close spellings."""
+        key = normalize(query)
+        if not key:
+            return []
+        exact = self._names.get(key)
+        matches = [exact] if exact else []
+
+        i = bisect_left(self._prefix_keys, key)
+        while i < len(self._prefix_keys) and self._prefix_keys[i].startswith(key) and len(matches) < limit:
+            if self._prefix_unis[i] not in matches:
+                matches.append(self._prefix_unis[i])
+            i += 1
+
+        if not matches:
+            for close in difflib.get_close_matches(key, self._names, n=limit, cutoff=0.75):
+                if self._names[close] not in matches:
+                    matches.append(self._names[close])
+        return matches[:limit]
+
+    def tuition_range(self, lo: float = 0, hi: float = float('inf')) -> List[str]:
+        """Universities with lo <= tuition <= hi, cheapest first."""
+        return self._by_tuition[bisect_left(self._tuitions, lo):bisect_right(self._tuitions, hi)]
+
+    def in_city(self, city: str) -> Tuple[str, ...]:
+        return self.by_city.get(city, ())
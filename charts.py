@@ -0,0 +1,93 @@
+"""
+Chart Rendering
+Monthly pie, annual bar and comparison charts rendered to PNG bytes and memoized.
+
+Figures are built with matplotlib.figure.Figure (never registered with
+pyplot, so nothing accumulates in pyplot's figure manager) and cleared after
+rendering. Results are cached per process in a bounded LRU keyed on the
+breakdown rounded to whole dollars, which is the precision the charts display.
+"""
+
+import io
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+from instrument import timed
+
+CHART_CACHE_SIZE = 128
+
+PIE_COLORMAP = 'Set3'
+BAR_COLORS = ['#2E86AB', '#F18F01', '#A23B72']
+
+def chart_key(items: Iterable[Tuple[str, float]]) -> Tuple[Tuple[str, float], ...]:
+    """Positive (label, amount) pairs rounded to dollars: the cache key for a pie."""
+    return tuple((label, float(round(value))) for label, value in items if value > 0)
+
+def _png(fig) -> bytes:
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format='png', bbox_inches='tight')
+    finally:
+        fig.clear()
+    return buf.getvalue()
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+@timed('charts.monthly_pie')
+def monthly_pie_png(items: Tuple[Tuple[str, float], ...], title: str) -> bytes:
+    """Pie chart of monthly categories; pass chart_key(...) as items."""
+    from matplotlib import colormaps
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 8))
+    ax = fig.subplots()
+    labels = [label for label, _ in items]
+    values = [value for _, value in items]
+    colors = colormaps[PIE_COLORMAP](range(len(items)))
+    ax.pie(values, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    return _png(fig)
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+@timed('charts.annual_bar')
+def annual_bar_png(fall_winter: float, summer: float, tuition: float, title: str, currency: str = 'CAD') -> bytes:
+    """Bar chart of the annual Fall/Winter, Summer and Tuition amounts (whole units of `currency`)."""
+    from currency import format_amount
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    bars = ax.bar(['Fall/Winter', 'Summer', 'Tuition'], [fall_winter, summer, tuition], color=BAR_COLORS)
+    ax.set_ylabel(f"Amount ({currency})", fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    for bar in bars:
+        h = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2, h, format_amount(h, currency, 0),
+                ha='center', va='bottom', fontweight='bold')
+    return _png(fig)
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+@timed('charts.comparison')
+def comparison_png(labels: Tuple[str, ...], fall_winter: Tuple[float, ...], summer: Tuple[float, ...],
+                   tuition: Tuple[float, ...], title: str, currency: str = 'CAD') -> bytes:
+    """Grouped bars (Fall/Winter, Summer, Tuition) per compared university (whole units of `currency`)."""
+    from matplotlib.figure import Figure
+    from currency import format_amount
+
+    n = len(labels)
+    width = 0.27
+    fig = Figure(figsize=(max(8, 1.1 * n + 2), 6))
+    ax = fig.subplots()
+    for offset, (name, values, color) in enumerate(zip(['Fall/Winter', 'Summer', 'Tuition'],
+                                                       [fall_winter, summer, tuition], BAR_COLORS)):
+        ax.bar([i + (offset - 1) * width for i in range(n)], values, width, label=name, color=color)
+    ax.set_xticks(range(n), labels, rotation=30 if n > 3 else 0, ha='right' if n > 3 else 'center', fontsize=9)
+    ax.yaxis.set_major_formatter(lambda value, _: format_amount(value, currency, 0))
+    ax.set_ylabel(f"Amount ({currency})", fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.legend()
+    return _png(fig)
+
+def cache_info() -> dict:
+    """Hit/miss counters for the chart caches."""
+    return {'pie': monthly_pie_png.cache_info()._asdict(), 'bar': annual_bar_png.cache_info()._asdict(),
+            'comparison': comparison_png.cache_info()._asdict()}
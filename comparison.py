@@ -0,0 +1,165 @@
+"""
+University Comparison
+Side-by-side estimates for many university × program picks under one
+student profile (rent, lifestyle, transit, summer plan):
+
+    python comparison.py UBC SFU "McGill University:Law" --rent 1100 --chart compare.png
+    python cost_estimator.py compare UBC "U of T:Engineering" --currency INR
+
+Every column is evaluated in one batched engine call. Passing a ResultCache
+makes that call per-column incremental: columns already seen are served from
+the cache and only new picks reach the engine, so adding one more university
+to the comparison costs one column.
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from catalog import Catalog
+from models import CostBreakdown, Housing, Scenario, breakdowns
+from reference_data import CUSTOM_UNIVERSITY
+from result_cache import ResultCache
+
+MAX_COLUMNS = 48
+
+Pick = Tuple[str, Optional[str]]
+
+# ============================================================================
+# COLUMNS
+# ============================================================================
+
+def pick_label(pick: Pick) -> str:
+    uni, program = pick
+    return f"{uni} · {program}" if program else uni
+
+def comparison_scenarios(picks: Sequence[Pick], base: Scenario, tables: Dict) -> List[Scenario]:
+    """
+    One Scenario per (university, program) pick, sharing `base`'s profile.
+
+    Picks in base's city keep its utilities/internet amounts; other cities
+    use their defaults (or 0 where base's rent includes them).
+    """
+    universities, programs, city_data = tables['universities'], tables['programs'], tables['city_data']
+    h = base.housing
+    scenarios = []
+    for uni, program in picks:
+        city = universities[uni]['city']
+        if city is None:
+            raise ValueError(f"{uni} has no city; it can't be compared")
+        multiplier = programs[program]['multiplier'] if program else 1.0
+        if city == base.city:
+            housing = h
+        else:
+            costs = city_data[city]
+            housing = Housing(h.rent, 0 if h.util_incl else costs['utilities'],
+                              0 if h.net_incl else costs['internet_phone'], h.transport_covered,
+                              h.util_incl, h.net_incl)
+        scenarios.append(Scenario(city, universities[uni]['tuition'] * multiplier, housing, base.lifestyle,
+                                  base.summer, university=uni, program=program))
+    return scenarios
+
+def compare(picks: Sequence[Pick], base: Scenario, tables: Dict, cache: ResultCache = None) -> List[CostBreakdown]:
+    """Breakdowns for every pick in one batched call (through `cache`, if given)."""
+    if len(picks) > MAX_COLUMNS:
+        raise ValueError(f"compare at most {MAX_COLUMNS} universities/programs at a time")
+    return breakdowns(comparison_scenarios(picks, base, tables), tables['city_data'], cache)
+
+def comparison_rows(costs: Sequence[CostBreakdown]) -> List[Tuple[str, List[float]]]:
+    """(line item, one amount per column) for the monthly categories, then the annual totals."""
+    if not costs:
+        return []
+    rows = [(label, [c.monthly[i] for c in costs]) for i, label in enumerate(costs[0].labels)]
+    return rows + [
+        ('Monthly total', [c.monthly_total for c in costs]),
+        ('Fall & Winter (8mo)', [c.fall_winter for c in costs]),
+        ('Summer (4mo)', [c.summer for c in costs]),
+        ('Tuition', [c.tuition for c in costs]),
+        ('TOTAL', [c.total for c in costs]),
+    ]
+
+def parse_pick(text: str, catalog: Catalog, programs: Dict, default_program: str = None) -> Pick:
+    """'UBC', 'U of T:Engineering' or a full name → (university, program). Raises ValueError."""
+    name, program = text, default_program
+    head, sep, tail = text.rpartition(':')
+    if sep and tail.strip() in programs:
+        name, program = head, tail.strip()
+    uni = catalog.lookup(name)
+    if uni is None:
+        matches = catalog.search(name, limit=5)
+        if len(matches) != 1:
+            hint = f" (did you mean: {'; '.join(matches)}?)" if matches else ""
+            raise ValueError(f"no single university matches '{name}'{hint}")
+        uni = matches[0]
+    if uni == CUSTOM_UNIVERSITY:
+        raise ValueError("Custom/Other can't be compared; it has no tuition or city")
+    return uni, program
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: List[str] = None) -> int:
+    from currency import BASE_CURRENCY, format_amount, load_rates
+    from reference_data import load_tables
+    from student_profile import (add_profile_arguments, currency_error, profile_housing, profile_lifestyle,
+                                 profile_summer)
+
+    parser = argparse.ArgumentParser(description="Compare universities/programs side by side")
+    parser.add_argument('picks', nargs='+', metavar='UNIVERSITY[:PROGRAM]',
+                        help="name or abbreviation, optionally with a program, e.g. 'UBC:Engineering'")
+    parser.add_argument('--program', help="program for picks that don't name one (default: base tuition)")
+    add_profile_arguments(parser)
+    parser.add_argument('--currency', default=BASE_CURRENCY, type=str.upper,
+                        help="show amounts in this currency (default: CAD)")
+    parser.add_argument('--chart', metavar='FILE', help="also save a grouped bar chart (PNG)")
+    args = parser.parse_args(argv)
+
+    tables = load_tables()
+    rates = load_rates()
+    if args.program is not None and args.program not in tables['programs']:
+        print(f"✗ Unknown program: {args.program}", file=sys.stderr)
+        return 2
+    error = currency_error(args.currency, rates)
+    if error:
+        print(f"✗ {error}", file=sys.stderr)
+        return 2
+    catalog = Catalog(tables['universities'], tables['programs'])
+    try:
+        picks = list(dict.fromkeys(parse_pick(p, catalog, tables['programs'], args.program) for p in args.picks))
+    except ValueError as exc:
+        print(f"✗ {exc}", file=sys.stderr)
+        return 2
+
+    first_city = tables['universities'][picks[0][0]]['city']
+    base = Scenario(first_city, 0.0, profile_housing(args, tables['city_data'][first_city]),
+                    profile_lifestyle(args), profile_summer(args))
+    try:
+        costs = [rates.convert_breakdown(c, args.currency) for c in compare(picks, base, tables)]
+    except ValueError as exc:
+        print(f"✗ {exc}", file=sys.stderr)
+        return 2
+
+    money = lambda value: format_amount(value, args.currency, 0)
+    cheapest = min(range(len(costs)), key=lambda i: costs[i].total)
+    print(f"\n{'='*100}\n⚖️  COMPARISON ({len(picks)} picks, amounts in {args.currency})\n{'='*100}")
+    print(f"   {'University / Program':<44} {'Monthly':>11} {'Fall+Winter':>13} {'Summer':>12} "
+          f"{'Tuition':>13} {'TOTAL':>13}")
+    for i, (pick, c) in enumerate(zip(picks, costs)):
+        marker = '★' if i == cheapest else ' '
+        print(f" {marker} {pick_label(pick)[:44]:<44} {money(c.monthly_total):>11} {money(c.fall_winter):>13} "
+              f"{money(c.summer):>12} {money(c.tuition):>13} {money(c.total):>13}")
+    print("="*100)
+    print(f"★ Cheapest: {pick_label(picks[cheapest])} at {money(costs[cheapest].total)}/year")
+
+    if args.chart:
+        from charts import comparison_png
+        with open(args.chart, 'wb') as f:
+            f.write(comparison_png(tuple(map(pick_label, picks)), tuple(round(c.fall_winter) for c in costs),
+                                   tuple(round(c.summer) for c in costs), tuple(round(c.tuition) for c in costs),
+                                   "Annual Cost by University", args.currency))
+        print(f"✓ Chart saved to: {args.chart}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
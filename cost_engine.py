@@ -0,0 +1,150 @@
+"""
+Vectorized Cost Engine
+Batch evaluation of student budgets shared by the CLI and the Streamlit app.
+"""
+
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from instrument import timed
+
+FALL_WINTER_MONTHS = 8
+SUMMER_MONTHS = 4
+
+# Summer plan codes used in the `summer_type` array
+SUMMER_HOME = 0
+SUMMER_STAYING = 1
+SUMMER_MOVING = 2
+
+SUMMER_CODES = {'home': SUMMER_HOME, 'staying': SUMMER_STAYING, 'moving': SUMMER_MOVING}
+
+# ============================================================================
+# LOOKUPS
+# ============================================================================
+
+def city_columns(city_data: Mapping[str, Mapping[str, float]], cities: Sequence) -> Dict[str, np.ndarray]:
+    """
+    Resolve per-record city defaults (groceries, transportation, ...) as arrays.
+
+    `cities` holds city names or integer codes (positions in `city_data`);
+    codes skip the per-record name lookup for large generated batches.
+    """
+    names = list(city_data.keys())
+    codes = np.asarray(cities)
+    if codes.dtype.kind in 'iu':
+        idx = codes.astype(np.intp, copy=False)
+    else:
+        index = {name: i for i, name in enumerate(names)}
+        idx = np.fromiter((index[c] for c in cities), dtype=np.intp)
+    fields = ('groceries', 'utilities', 'transportation', 'internet_phone')
+    table = {f: np.array([float(city_data[n][f]) for n in names]) for f in fields}
+    return {f: table[f][idx] for f in fields}
+
+def _as_array(values, n: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(values, dtype=np.float64), (n,))
+
+def _as_matrix(values, n: int) -> np.ndarray:
+    """Lifestyle input as an (n, k) matrix; k may be zero."""
+    if values is None:
+        return np.zeros((n, 0))
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.size == 0:
+        return np.zeros((n, 0))
+    return arr.reshape(n, -1) if arr.ndim == 1 else arr
+
+# ============================================================================
+# CALCULATIONS
+# ============================================================================
+
+def monthly_totals(rent, groceries, utilities, internet, transportation, lifestyle=None) -> np.ndarray:
+    """
+    Sum monthly categories column by column.
+
+    Columns are accumulated left to right (rather than with np.sum's pairwise
+    reduction) so every element matches the scalar `sum(monthly.values())`
+    bit for bit.
+    """
+    columns = [np.asarray(c, dtype=np.float64) for c in (rent, groceries, utilities, internet, transportation)]
+    shape = np.broadcast(*columns).shape
+    n = shape[0] if shape else 1
+    total = _as_array(columns[0], n).copy()
+    for column in columns[1:]:
+        total += _as_array(column, n)
+    for column in _as_matrix(lifestyle, n).T:
+        total += column
+    return total
+
+def calculate_batch(city: Sequence, tuition, rent, utilities, internet, transport_covered,
+                    lifestyle, summer_type, city_data: Mapping[str, Mapping[str, float]],
+                    summer_city: Sequence = None, summer_rent=None, summer_utilities=None,
+                    summer_internet=None, summer_transport_covered=None,
+                    summer_lifestyle=None) -> Dict[str, np.ndarray]:
+    """
+    Evaluate many scenarios in one pass.
+
+    Every argument is an array-like with one entry per scenario (scalars are
+    broadcast) and cities may be names or integer codes. `lifestyle` and
+    `summer_lifestyle` are (n, k) matrices of monthly lifestyle spending,
+    `summer_type` holds SUMMER_* codes and the `summer_*` housing arrays are
+    only read where the plan is SUMMER_MOVING.
+
+    Returns arrays 'monthly', 'fall_winter', 'summer', 'tuition' and 'total'.
+    """
+    n = len(city)
+    costs = city_columns(city_data, city)
+
+    transport = np.where(np.asarray(transport_covered, dtype=bool), 0.0, costs['transportation'])
+    monthly = monthly_totals(rent, costs['groceries'], utilities, internet, transport, lifestyle)
+    fall_winter = monthly * FALL_WINTER_MONTHS
+
+    summer_type = np.broadcast_to(np.asarray(summer_type, dtype=np.int8), (n,))
+    summer = np.where(summer_type == SUMMER_STAYING, monthly * SUMMER_MONTHS, 0.0)
+
+    moving = summer_type == SUMMER_MOVING
+    if moving.any():
+        where = np.flatnonzero(moving)
+        sc = city_columns(city_data, np.asarray(summer_city)[where])
+        pick = lambda values: _as_array(values, n)[where]
+        covered = np.asarray(pick(summer_transport_covered), dtype=bool)
+        summer_monthly = monthly_totals(
+            pick(summer_rent), sc['groceries'], pick(summer_utilities), pick(summer_internet),
+            np.where(covered, 0.0, sc['transportation']),
+            _as_matrix(summer_lifestyle, n)[where],
+        )
+        summer[where] = summer_monthly * SUMMER_MONTHS
+
+    tuition = _as_array(tuition, n).copy()
+    return {
+        'monthly': monthly,
+        'fall_winter': fall_winter,
+        'summer': summer,
+        'tuition': tuition,
+        'total': fall_winter + summer + tuition,
+    }
+
+def _padded(rows: List[Sequence[float]]) -> List[List[float]]:
+    """Right-pad ragged lifestyle rows with zeros (x + 0.0 leaves sums unchanged)."""
+    width = max((len(r) for r in rows), default=0)
+    return [list(r) + [0.0] * (width - len(r)) for r in rows]
+
+@timed('engine.calculate_scenarios')
+def calculate_scenarios(scenarios: Sequence, city_data: Mapping[str, Mapping[str, float]]) -> Dict[str, np.ndarray]:
+    """calculate_batch over a list of models.Scenario records."""
+    housing = [s.housing for s in scenarios]
+    summers = [s.summer for s in scenarios]
+    moving = [p if p.type == 'moving' else None for p in summers]
+    fallback_city = next(iter(city_data))
+    pick = lambda key, default: [getattr(m.housing, key) if m else default for m in moving]
+
+    return calculate_batch(
+        [s.city for s in scenarios], [s.tuition for s in scenarios],
+        [h.rent for h in housing], [h.utilities for h in housing],
+        [h.internet for h in housing], [h.transport_covered for h in housing],
+        _padded([s.lifestyle.values for s in scenarios]),
+        [SUMMER_CODES[p.type] for p in summers], city_data,
+        summer_city=[m.city if m else fallback_city for m in moving],
+        summer_rent=pick('rent', 0.0), summer_utilities=pick('utilities', 0.0),
+        summer_internet=pick('internet', 0.0), summer_transport_covered=pick('transport_covered', False),
+        summer_lifestyle=_padded([m.lifestyle.values if m else () for m in moving]),
+    )
@@ -3,112 +3,30 @@ International Student Cost of Living Estimator for Canada
 A comprehensive tool to estimate living expenses for international students.
 """
 
-import matplotlib.pyplot as plt
+import argparse
 import csv
 import sys
 from datetime import datetime
 from typing import Dict, List
 
+import instrument
+from catalog import Catalog
+from currency import BASE_CURRENCY, RateTable, format_amount, load_rates
+from cost_engine import FALL_WINTER_MONTHS, SUMMER_MONTHS
+from models import CostBreakdown, Housing, Lifestyle, Scenario, SummerPlan, breakdowns, summary_rows
+from reference_data import load_tables
+from student_profile import currency_error
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-PROGRAMS = {
-    "Engineering": {"multiplier": 1.4, "emoji": "⚙️"},
-    "Computer Science": {"multiplier": 1.35, "emoji": "💻"},
-    "Business/Commerce": {"multiplier": 1.25, "emoji": "💼"},
-    "Medicine": {"multiplier": 2.0, "emoji": "🩺"},
-    "Dentistry": {"multiplier": 1.8, "emoji": "🦷"},
-    "Law": {"multiplier": 1.5, "emoji": "⚖️"},
-    "Architecture": {"multiplier": 1.3, "emoji": "🏛️"},
-    "Sciences (Biology, Chemistry, Physics)": {"multiplier": 1.1, "emoji": "🔬"},
-    "Mathematics/Statistics": {"multiplier": 1.0, "emoji": "📊"},
-    "Arts/Humanities": {"multiplier": 0.95, "emoji": "📚"},
-    "Social Sciences": {"multiplier": 0.95, "emoji": "🌍"},
-    "Fine Arts/Design": {"multiplier": 1.0, "emoji": "🎨"},
-    "Nursing": {"multiplier": 1.2, "emoji": "🏥"},
-    "Education": {"multiplier": 0.9, "emoji": "👨‍🏫"},
-    "Psychology": {"multiplier": 1.0, "emoji": "🧠"},
-    "Economics": {"multiplier": 1.15, "emoji": "📈"},
-    "Environmental Studies": {"multiplier": 1.0, "emoji": "🌱"},
-    "Communications/Media": {"multiplier": 1.0, "emoji": "📡"},
-    "Culinary Arts": {"multiplier": 0.85, "emoji": "👨‍🍳"},
-    "Hospitality/Tourism": {"multiplier": 0.85, "emoji": "🏨"},
-}
-
-CITY_DATA = {
-    "Toronto": {"groceries": 400, "utilities": 150, "transportation": 156, "internet_phone": 80},
-    "Vancouver": {"groceries": 420, "utilities": 130, "transportation": 136, "internet_phone": 75},
-    "Montreal": {"groceries": 350, "utilities": 120, "transportation": 94, "internet_phone": 70},
-    "Ottawa": {"groceries": 380, "utilities": 140, "transportation": 122, "internet_phone": 75},
-    "Calgary": {"groceries": 390, "utilities": 160, "transportation": 112, "internet_phone": 80},
-    "Edmonton": {"groceries": 370, "utilities": 155, "transportation": 103, "internet_phone": 75},
-    "Waterloo": {"groceries": 370, "utilities": 145, "transportation": 100, "internet_phone": 75},
-    "Guelph": {"groceries": 365, "utilities": 140, "transportation": 95, "internet_phone": 75},
-    "Quebec City": {"groceries": 340, "utilities": 115, "transportation": 90, "internet_phone": 70},
-    "Winnipeg": {"groceries": 360, "utilities": 145, "transportation": 105, "internet_phone": 70},
-    "Halifax": {"groceries": 385, "utilities": 135, "transportation": 82, "internet_phone": 75}
-}
-
-UNIVERSITIES = {
-    # Toronto
-    "University of Toronto": {"city": "Toronto", "tuition_intl": 58160},
-    "York University": {"city": "Toronto", "tuition_intl": 35000},
-    "Toronto Metropolitan University (TMU)": {"city": "Toronto", "tuition_intl": 33000},
-    "OCAD University": {"city": "Toronto", "tuition_intl": 27000},
-    
-    # Vancouver
-    "University of British Columbia (UBC)": {"city": "Vancouver", "tuition_intl": 51000},
-    "Simon Fraser University (SFU)": {"city": "Vancouver", "tuition_intl": 32000},
-    "Emily Carr University": {"city": "Vancouver", "tuition_intl": 24000},
-    
-    # Montreal
-    "McGill University": {"city": "Montreal", "tuition_intl": 48000},
-    "Concordia University": {"city": "Montreal", "tuition_intl": 29000},
-    "Université de Montréal": {"city": "Montreal", "tuition_intl": 27000},
-    
-    # Ottawa
-    "University of Ottawa": {"city": "Ottawa", "tuition_intl": 45000},
-    "Carleton University": {"city": "Ottawa", "tuition_intl": 33000},
-    "Algonquin College": {"city": "Ottawa", "tuition_intl": 16000},
-    
-    # Calgary
-    "University of Calgary": {"city": "Calgary", "tuition_intl": 32000},
-    "Mount Royal University": {"city": "Calgary", "tuition_intl": 21000},
-    "SAIT Polytechnic": {"city": "Calgary", "tuition_intl": 18000},
-    
-    # Edmonton
-    "University of Alberta": {"city": "Edmonton", "tuition_intl": 31000},
-    "MacEwan University": {"city": "Edmonton", "tuition_intl": 20000},
-    "NAIT": {"city": "Edmonton", "tuition_intl": 17000},
-    
-    # Waterloo
-    "University of Waterloo": {"city": "Waterloo", "tuition_intl": 53000},
-    "Wilfrid Laurier University": {"city": "Waterloo", "tuition_intl": 28000},
-    "Conestoga College": {"city": "Waterloo", "tuition_intl": 16000},
-    
-    # Guelph
-    "University of Guelph": {"city": "Guelph", "tuition_intl": 31000},
-    
-    # Quebec City
-    "Université Laval": {"city": "Quebec City", "tuition_intl": 26000},
-    "Collège Mérici": {"city": "Quebec City", "tuition_intl": 14000},
-    
-    # Winnipeg
-    "University of Manitoba": {"city": "Winnipeg", "tuition_intl": 19000},
-    "University of Winnipeg": {"city": "Winnipeg", "tuition_intl": 17000},
-    "Red River College": {"city": "Winnipeg", "tuition_intl": 15000},
-    
-    # Halifax
-    "Dalhousie University": {"city": "Halifax", "tuition_intl": 28000},
-    "Saint Mary's University": {"city": "Halifax", "tuition_intl": 21000},
-    "NSCAD University": {"city": "Halifax", "tuition_intl": 19000},
-    
-    "Custom/Other": {"city": None, "tuition_intl": 0}
-}
-
-FALL_WINTER_MONTHS = 8
-SUMMER_MONTHS = 4
+# Loaded from the bundled JSON via a precompiled snapshot (see reference_data.py)
+_TABLES = load_tables()
+PROGRAMS = _TABLES['programs']
+CITY_DATA = _TABLES['city_data']
+UNIVERSITIES = _TABLES['universities']
+CATALOG = Catalog(UNIVERSITIES, PROGRAMS)
 
 # ============================================================================
 # INPUT UTILITIES (Unified & DRY)
@@ -154,47 +72,80 @@ def select_from_menu(title: str, options: List[str]) -> int:
 # DATA COLLECTION (Refactored)
 # ============================================================================
 
-def select_university() -> tuple:
-    """Select university and get city/tuition."""
-    options = list(UNIVERSITIES.keys())
+def select_university(store=None) -> tuple:
+    """Select university (by number, name, alias or search) and get city/tuition."""
+    if store is not None:
+        return select_university_paged(store)
     
-    # Group by city for better display
     print("\n" + "="*60)
     print("SELECT YOUR UNIVERSITY")
     print("="*60)
     
-    current_city = None
     idx = 1
-    uni_map = {}
-    
-    for uni, data in UNIVERSITIES.items():
-        if data['city'] != current_city and data['city'] is not None:
-            current_city = data['city']
-            print(f"\n📍 {current_city.upper()}")
-        
-        if uni == "Custom/Other":
-            print(f"\n🔧 OTHER")
-            print(f"{idx}. {uni}")
-        else:
-            tuition_k = data['tuition_intl'] // 1000
-            print(f"{idx}. {uni} (${tuition_k}k)")
-        
-        uni_map[idx] = uni
-        idx += 1
+    for city, unis in CATALOG.by_city.items():
+        print(f"\n📍 {city.upper()}")
+        for uni in unis:
+            print(f"{idx}. {uni} (${CATALOG.tuition[uni] // 1000:,.0f}k)")
+            idx += 1
+    if "Custom/Other" in CATALOG.tuition:
+        print(f"\n🔧 OTHER")
+        print(f"{idx}. Custom/Other")
     
     print("="*60)
     
-    while True:
-        try:
-            choice = int(input("\nSelect university number: "))
-            if 1 <= choice < idx:
-                break
-            print(f"Enter 1-{idx-1}")
-        except ValueError:
-            print("Enter a number")
+    uni = None
+    while uni is None:
+        query = input("\nSelect university number or type a name (e.g. UBC): ").strip()
+        if query.isdecimal():
+            if 1 <= int(query) <= len(CATALOG):
+                uni = CATALOG.universities[int(query) - 1]
+            else:
+                print(f"Enter 1-{len(CATALOG)}")
+            continue
+        matches = CATALOG.search(query)
+        if not matches:
+            print("No match. Try a number, a name or an abbreviation.")
+        elif len(matches) == 1:
+            uni = matches[0]
+        else:
+            uni = matches[select_from_menu(f"MATCHES FOR '{query}'", matches) - 1]
     
-    uni = uni_map[choice]
+    return confirm_tuition(uni, UNIVERSITIES[uni]["city"], UNIVERSITIES[uni]["tuition"])
+
+def select_university_paged(store) -> tuple:
+    """Page through a SQLite reference store (see store.py) and get city/tuition."""
+    from store import PAGE_SIZE
     
+    page, search = 0, None
+    while True:
+        total = store.count(search=search)
+        pages = max(1, -(-total // PAGE_SIZE))
+        rows = store.page(page, search=search)
+        title = f"SELECT YOUR UNIVERSITY (page {page + 1}/{pages}, {total:,} {'matches' if search else 'total'})"
+        print(f"\n{'='*60}\n{title}\n{'='*60}")
+        current_city = None
+        for i, (uni, city, tuition) in enumerate(rows, 1):
+            if city != current_city:
+                current_city = city
+                print(f"\n📍 {city.upper()}" if city else f"\n🔧 OTHER")
+            print(f"{i}. {uni}" if city is None else f"{i}. {uni} (${tuition // 1000:,.0f}k)")
+        print("="*60)
+        
+        choice = input("\nNumber, n/p for next/previous page, or type to search (blank clears): ").strip()
+        if choice.isdecimal() and 1 <= int(choice) <= len(rows):
+            uni, city, tuition = rows[int(choice) - 1]
+            return confirm_tuition(uni, city, tuition)
+        if choice.lower() == 'n':
+            page = min(page + 1, pages - 1)
+        elif choice.lower() == 'p':
+            page = max(page - 1, 0)
+        elif choice.isdecimal():
+            print(f"Enter 1-{len(rows)}")
+        else:
+            page, search = 0, choice or None
+
+def confirm_tuition(uni: str, city: str, tuition: float) -> tuple:
+    """Confirm the listed tuition (or ask for city/tuition for Custom/Other)."""
     if uni == "Custom/Other":
         cities = list(CITY_DATA.keys())
         city_choice = select_from_menu("SELECT YOUR CITY", cities)
@@ -203,15 +154,13 @@ def select_university() -> tuple:
         tuition = get_input("Enter annual tuition (CAD): $")
         return city, tuition, uni
     
-    city = UNIVERSITIES[uni]["city"]
-    tuition = UNIVERSITIES[uni]["tuition_intl"]
-    print(f"\n✓ {uni} - {city} (Int'l Tuition: ${tuition:,})")
+    print(f"\n✓ {uni} - {city} (Int'l Tuition: ${tuition:,.0f})")
     if get_yes_no("Use this tuition amount? (y/n): "):
         return city, tuition, uni
     tuition = get_input("Enter your tuition (CAD): $")
     return city, tuition, uni
 
-def collect_housing(city: str) -> Dict:
+def collect_housing(city: str) -> Housing:
     """Collect housing expenses."""
     print(f"\n{'='*60}\n🏠 HOUSING EXPENSES - {city.upper()}\n{'='*60}")
     rent = get_input("Monthly rent (CAD): $")
@@ -228,12 +177,9 @@ def collect_housing(city: str) -> Dict:
     
     transport_covered = get_yes_no("Transportation covered by university? (y/n): ")
     
-    return {
-        'rent': rent, 'utilities': utilities, 'internet': internet,
-        'transport_covered': transport_covered, 'util_incl': util_incl, 'net_incl': net_incl
-    }
+    return Housing(rent, utilities, internet, transport_covered, util_incl, net_incl)
 
-def collect_lifestyle() -> Dict[str, float]:
+def collect_lifestyle() -> Lifestyle:
     """Collect lifestyle expenses."""
     print(f"\n{'='*60}\n🎉 LIFESTYLE EXPENSES\n{'='*60}")
     
@@ -243,125 +189,116 @@ def collect_lifestyle() -> Dict[str, float]:
         ("Social Activities", "☕ cafes/bars/friends")
     ]
     
-    lifestyle = {}
+    amounts = []
     for name, desc in categories:
         print(f"\n{desc}")
         times = get_input(f"Times per month: ", type_='int', allow_zero=True)
         if times > 0:
             avg = get_input(f"Avg cost per time: $", allow_zero=True)
-            lifestyle[name] = times * avg
+            amounts.append(times * avg)
         else:
-            lifestyle[name] = 0
+            amounts.append(0)
     
-    lifestyle["Shopping"] = get_input("\n🛍️  Shopping budget (monthly): $", allow_zero=True)
-    lifestyle["Miscellaneous"] = get_input("🔧 Misc (gym/haircuts/etc): $", allow_zero=True)
+    amounts.append(get_input("\n🛍️  Shopping budget (monthly): $", allow_zero=True))
+    amounts.append(get_input("🔧 Misc (gym/haircuts/etc): $", allow_zero=True))
     
-    print(f"\nTotal Lifestyle: ${sum(lifestyle.values()):,.2f}")
+    lifestyle = Lifestyle(amounts)
+    print(f"\nTotal Lifestyle: ${lifestyle.total():,.2f}")
     return lifestyle
 
-def collect_summer(city: str, housing: Dict, lifestyle: Dict) -> Dict:
+def collect_summer(city: str, housing: Housing, lifestyle: Lifestyle) -> SummerPlan:
     """Collect summer plans."""
     options = [f"Staying in {city}", "Moving to another city", "Going home"]
     choice = select_from_menu("☀️ SUMMER PLANS", options)
     
     if choice == 1:
-        return {'type': 'staying'}
+        return SummerPlan('staying')
     elif choice == 3:
-        return {'type': 'home'}
+        return SummerPlan('home')
     else:
         cities = [c for c in CITY_DATA.keys() if c != city]
         city_choice = select_from_menu("Summer city:", cities)
         summer_city = cities[city_choice - 1]
         summer_housing = collect_housing(summer_city)
         summer_lifestyle = collect_lifestyle()
-        return {'type': 'moving', 'city': summer_city, **summer_housing, 'lifestyle': summer_lifestyle}
+        return SummerPlan('moving', summer_city, summer_housing, summer_lifestyle)
 
 # ============================================================================
 # CALCULATIONS
 # ============================================================================
 
-def calculate_costs(city: str, tuition: float, housing: Dict, lifestyle: Dict, summer: Dict) -> Dict:
-    """Calculate all costs."""
-    city_costs = CITY_DATA[city]
-    
-    monthly = {
-        "Rent": housing['rent'],
-        "Groceries": city_costs["groceries"],
-        "Utilities": housing['utilities'],
-        "Internet & Phone": housing['internet'],
-        "Transportation": 0 if housing['transport_covered'] else city_costs["transportation"],
-        **lifestyle
-    }
-    
-    fall_winter_total = sum(monthly.values()) * FALL_WINTER_MONTHS
-    
-    if summer['type'] == 'home':
-        summer_total = 0
-    elif summer['type'] == 'staying':
-        summer_total = sum(monthly.values()) * SUMMER_MONTHS
-    else:
-        sc = CITY_DATA[summer['city']]
-        summer_monthly = sum([
-            summer['rent'], sc['groceries'], summer['utilities'], summer['internet'],
-            0 if summer['transport_covered'] else sc['transportation'],
-            *summer['lifestyle'].values()
-        ])
-        summer_total = summer_monthly * SUMMER_MONTHS
-    
-    return {
-        'monthly': monthly,
-        'fall_winter': fall_winter_total,
-        'summer': summer_total,
-        'tuition': tuition,
-        'total': fall_winter_total + summer_total + tuition
-    }
+def calculate_costs(scenario: Scenario, currency: str = BASE_CURRENCY, rates: RateTable = None) -> CostBreakdown:
+    """
+    Calculate all costs (a one-row call into the batch engine), converted to `currency`.
+
+    Pass the caller's `rates` when converting many estimates; otherwise they are loaded per call.
+    """
+    costs = breakdowns([scenario], CITY_DATA)[0]
+    return costs if currency == BASE_CURRENCY else (rates or load_rates()).convert_breakdown(costs, currency)
 
 # ============================================================================
 # OUTPUT & VISUALIZATION
 # ============================================================================
 
-def display_summary(city: str, uni: str, costs: Dict, summer: Dict):
+def display_summary(city: str, uni: str, costs: CostBreakdown, summer: SummerPlan):
     """Display complete summary."""
+    money = lambda value, width: f"{format_amount(value, costs.currency):>{width}}"
+    monthly, annual = summary_rows(costs)
     print(f"\n{'='*60}\n📊 COST ESTIMATE - {uni}\n{'='*60}")
-    print(f"\n💰 MONTHLY (Fall/Winter): ${sum(costs['monthly'].values()):,.2f}")
-    for cat, val in costs['monthly'].items():
-        if val > 0: print(f"   {cat:<30} ${val:>10,.2f}")
+    if costs.currency != BASE_CURRENCY:
+        print(f"💱 Amounts in {costs.currency}")
+    print(f"\n💰 MONTHLY (Fall/Winter): {format_amount(costs.monthly_total, costs.currency)}")
+    for cat, val in monthly:
+        print(f"   {cat:<30} {money(val, 11)}")
     
     print(f"\n📅 ANNUAL BREAKDOWN:")
-    print(f"   Fall & Winter (8 months)     ${costs['fall_winter']:>12,.2f}")
-    print(f"   Summer (4 months)            ${costs['summer']:>12,.2f}")
-    print(f"   Tuition                      ${costs['tuition']:>12,.2f}")
-    print(f"   {'─'*45}")
-    print(f"   TOTAL                        ${costs['total']:>12,.2f}")
+    for label, val in annual:
+        if label == "TOTAL": print(f"   {'─'*45}")
+        print(f"   {label:<28} {money(val, 13)}")
+    print("="*60)
+
+def display_bands(bands: Dict[str, Dict[str, float]], samples: int, currency: str = BASE_CURRENCY,
+                  rate: float = 1.0):
+    """Display Monte Carlo percentile bands (CAD, shown at `rate` in `currency`) under the summary."""
+    print(f"\n🎲 UNCERTAINTY ({samples:,} simulations)")
+    print(f"   {'':<28} {'P10':>12} {'P50':>12} {'P90':>12}")
+    for key, label in [('fall_winter', 'Fall & Winter'), ('summer', 'Summer'), ('total', 'TOTAL')]:
+        band = bands[key]
+        print(f"   {label:<28} " + " ".join(f"{format_amount(band[p] * rate, currency, 0):>12}"
+                                             for p in ('P10', 'P50', 'P90')))
     print("="*60)
 
-def create_visualizations(city: str, costs: Dict):
+@instrument.timed('cli.visualizations')
+def create_visualizations(city: str, costs: CostBreakdown):
     """Create all charts."""
-    data = {k: v for k, v in costs['monthly'].items() if v > 0}
+    import matplotlib.pyplot as plt  # deferred: only the interactive path draws charts
+    
+    data = {k: v for k, v in costs.monthly_items() if v > 0}
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
     
     # Pie chart
     colors = plt.cm.Set3(range(len(data)))
     ax1.pie(data.values(), labels=data.keys(), autopct='%1.1f%%', colors=colors)
-    ax1.set_title(f'Monthly Breakdown - ${sum(data.values()):,.0f}')
+    ax1.set_title(f'Monthly Breakdown - {format_amount(sum(data.values()), costs.currency, 0)}')
     
     # Bar chart
-    annual_data = {'Fall/Winter': costs['fall_winter'], 'Summer': costs['summer'], 
-                   'Tuition': costs['tuition']}
+    annual_data = {'Fall/Winter': costs.fall_winter, 'Summer': costs.summer, 
+                   'Tuition': costs.tuition}
     bars = ax2.bar(annual_data.keys(), annual_data.values(), 
                    color=['#2E86AB', '#F18F01', '#A23B72'])
-    ax2.set_ylabel('Amount (CAD)')
-    ax2.set_title(f'Annual Breakdown - ${costs["total"]:,.0f}')
+    ax2.set_ylabel(f'Amount ({costs.currency})')
+    ax2.set_title(f'Annual Breakdown - {format_amount(costs.total, costs.currency, 0)}')
     for bar in bars:
         height = bar.get_height()
         ax2.text(bar.get_x() + bar.get_width()/2, height,
-                f'${height:,.0f}', ha='center', va='bottom')
+                format_amount(height, costs.currency, 0), ha='center', va='bottom')
     
     plt.tight_layout()
     plt.show()
 
-def export_csv(city: str, uni: str, costs: Dict):
+@instrument.timed('cli.export_csv')
+def export_csv(city: str, uni: str, costs: CostBreakdown):
     """Export to CSV."""
     filename = f"estimate_{city.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     with open(filename, 'w', newline='') as f:
@@ -370,48 +307,176 @@ def export_csv(city: str, uni: str, costs: Dict):
         writer.writerow(['University', uni])
         writer.writerow(['City', city])
         writer.writerow(['Date', datetime.now().strftime("%Y-%m-%d")])
+        writer.writerow(['Currency', costs.currency])
         writer.writerow([])
         writer.writerow(['MONTHLY EXPENSES'])
-        for cat, val in costs['monthly'].items():
+        for cat, val in costs.monthly_items():
             if val > 0: writer.writerow([cat, f"{val:.2f}"])
         writer.writerow([])
         writer.writerow(['ANNUAL SUMMARY'])
-        writer.writerow(['Fall & Winter', f"{costs['fall_winter']:.2f}"])
-        writer.writerow(['Summer', f"{costs['summer']:.2f}"])
-        writer.writerow(['Tuition', f"{costs['tuition']:.2f}"])
-        writer.writerow(['TOTAL', f"{costs['total']:.2f}"])
+        writer.writerow(['Fall & Winter', f"{costs.fall_winter:.2f}"])
+        writer.writerow(['Summer', f"{costs.summer:.2f}"])
+        writer.writerow(['Tuition', f"{costs.tuition:.2f}"])
+        writer.writerow(['TOTAL', f"{costs.total:.2f}"])
     print(f"\n✓ Exported to: {filename}")
 
 # ============================================================================
 # MAIN
 # ============================================================================
 
-def main():
+def main(export_to: str = None, simulate: int = 0, db: str = None, currency: str = BASE_CURRENCY):
     print("\n" + "="*60)
     print("🍁 CANADA STUDENT COST ESTIMATOR")
     print("="*60)
     
-    city, tuition, uni = select_university()
-    housing = collect_housing(city)
-    lifestyle = collect_lifestyle()
-    summer = collect_summer(city, housing, lifestyle)
-    
-    costs = calculate_costs(city, tuition, housing, lifestyle, summer)
-    
-    display_summary(city, uni, costs, summer)
-    create_visualizations(city, costs)
+    from store import open_store
+    store = open_store(db)
+    rates = load_rates()
+    error = currency_error(currency, rates)
+    if error:
+        print(error)
+        return
     
-    if get_yes_no("\nExport to CSV? (y/n): "):
-        export_csv(city, uni, costs)
-    
-    if get_yes_no("\nCalculate for another university? (y/n): "):
-        main()
-    else:
-        print("\n🍁 Good luck with your studies in Canada!\n")
+    while True:
+        city, tuition, uni = select_university(store)
+        housing = collect_housing(city)
+        lifestyle = collect_lifestyle()
+        summer = collect_summer(city, housing, lifestyle)
+        
+        scenario = Scenario(city, tuition, housing, lifestyle, summer, university=uni)
+        costs = calculate_costs(scenario)
+        shown = rates.convert_breakdown(costs, currency)
+        
+        display_summary(city, uni, shown, summer)
+        if simulate:
+            from simulation import percentile_bands, simulate as run_simulation
+            display_bands(percentile_bands(run_simulation(scenario, CITY_DATA, simulate)), simulate,
+                          currency, rates.rate(currency))
+        create_visualizations(city, shown)
+        
+        if export_to:
+            from exporter import EstimateWriter
+            with EstimateWriter(export_to, append=True, currency=currency, rates=rates) as writer:
+                writer.write_estimate(f"{datetime.now():%Y%m%d%H%M%S%f}", scenario, costs)  # microseconds: unique per append
+            print(f"\n✓ Appended to: {export_to}")
+        elif get_yes_no("\nExport to CSV? (y/n): "):
+            export_csv(city, uni, shown)
+        
+        if not get_yes_no("\nCalculate for another university? (y/n): "):
+            break
+    print("\n🍁 Good luck with your studies in Canada!\n")
+
+def reference_tables() -> Dict:
+    """Reference data bundle handed to the headless paths."""
+    return {'city_data': CITY_DATA, 'universities': UNIVERSITIES, 'programs': PROGRAMS}
+
+def run_headless(args: argparse.Namespace) -> int:
+    """Stream JSONL scenarios from a file/stdin to JSONL/CSV/Parquet without prompting."""
+    from batch import RESULT_FIELDS, WRITERS, read_records, write_csv
+    from currency import convert_results, converted_fields
+    from exporter import EstimateWriter
+    from parallel import evaluate_parallel
+    from result_cache import DEFAULT_CACHE_SIZE, ResultCache
+    
+    if args.format == 'parquet' and args.output == '-':
+        print("Parquet output needs --output FILE", file=sys.stderr)
+        return 2
+    rates = load_rates()
+    error = currency_error(args.currency, rates)
+    if error:
+        print(error, file=sys.stderr)
+        return 2
+    source = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+    out = sys.stdout if args.output == '-' or args.format == 'parquet' else \
+        open(args.output, 'w', newline='', encoding='utf-8')
+    cache_size = args.cache_size or (DEFAULT_CACHE_SIZE if args.cache_db else 0)
+    cache = ResultCache(cache_size, args.cache_db) if cache_size else None
+    try:
+        results = evaluate_parallel(read_records(source), reference_tables(), workers=args.workers,
+                                    chunk_size=args.chunk_size, cache=cache)
+        if args.format in ('tidy', 'parquet'):
+            target = args.output if args.format == 'parquet' else out
+            with EstimateWriter(target, fmt='parquet' if args.format == 'parquet' else 'csv',
+                                flush_rows=args.flush_rows, currency=args.currency, rates=rates) as writer:
+                count = writer.write_results(results)
+        elif args.currency != BASE_CURRENCY:
+            results = convert_results(results, rates, args.currency, args.chunk_size)
+            if args.format == 'csv':
+                count = write_csv(results, out, RESULT_FIELDS[:-1] + converted_fields(args.currency) + ['error'])
+            else:
+                count = WRITERS[args.format](results, out)
+        else:
+            count = WRITERS[args.format](results, out)
+    finally:
+        if source is not sys.stdin: source.close()
+        if out is not sys.stdout: out.close()
+        if cache is not None: cache.close()
+    print(f"✓ Processed {count:,} scenarios", file=sys.stderr)
+    if cache is not None and args.workers == 1:
+        stats = cache.stats()
+        print(f"   cache: {stats['hit_rate']:.1%} hit rate ({stats['hits']:,} hits, "
+              f"{stats['disk_hits']:,} from disk, {stats['misses']:,} misses)", file=sys.stderr)
+    return 0
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    from batch import non_negative_int, positive_int
+    from parallel import worker_count
+    
+    parser = argparse.ArgumentParser(description="Canada student cost estimator")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND',
+                                     description="run a command instead of the interactive estimator")
+    # their options are parsed by comparison.main / reports.main from the remaining arguments
+    commands.add_parser('compare', add_help=False, help="compare universities/programs side by side "
+                                                        "(compare --help for its options)")
+    commands.add_parser('reports', add_help=False, help="render a report per student in a JSONL file "
+                                                        "(reports --help for its options)")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run headless on a JSONL scenario file ('-' for stdin)")
+    parser.add_argument('--output', '-o', default='-', metavar='FILE',
+                        help="batch output file (default: stdout)")
+    parser.add_argument('--format', choices=['jsonl', 'csv', 'tidy', 'parquet'], default='jsonl',
+                        help="batch output: jsonl/csv (one row per scenario) or tidy/parquet "
+                             "(one row per line item, see exporter.py; default: jsonl)")
+    parser.add_argument('--flush-rows', type=positive_int, default=50_000,
+                        help="tidy/parquet rows buffered per write (default: 50000)")
+    parser.add_argument('--simulate', type=non_negative_int, default=0, metavar='N',
+                        help="interactive mode: show P10/P50/P90 bands from N Monte Carlo samples")
+    parser.add_argument('--db', metavar='FILE',
+                        help="interactive mode: page universities from a SQLite store (see store.py; "
+                             "default: $BUDGET_DATA_DB)")
+    parser.add_argument('--export-to', metavar='FILE',
+                        help="interactive mode: append every estimate to one tidy CSV file")
+    parser.add_argument('--chunk-size', type=positive_int, default=1024,
+                        help="scenarios evaluated per vectorized call (default: 1024)")
+    parser.add_argument('--cache-size', type=non_negative_int, default=0, metavar='N',
+                        help="batch: memoize up to N distinct scenario results (default: off)")
+    parser.add_argument('--cache-db', metavar='FILE',
+                        help="batch: persist memoized results in a SQLite file across runs")
+    parser.add_argument('--currency', default=BASE_CURRENCY, type=str.upper, metavar='CODE',
+                        help="show amounts in CODE (e.g. INR, CNY, NGN); batch outputs keep CAD and add "
+                             "converted columns (default: CAD; rates from currency.py)")
+    parser.add_argument('--workers', type=worker_count, default=1,
+                        help="batch worker processes; 0 uses every core (default: 1)")
+    args, args.command_args = parser.parse_known_args(argv)
+    if args.command_args and args.command is None:
+        parser.error(f"unrecognized arguments: {' '.join(args.command_args)}")
+    return args
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.command == 'compare':
+        from comparison import main as compare
+        sys.exit(compare(args.command_args))
+    if args.command == 'reports':
+        from reports import main as reports
+        sys.exit(reports(args.command_args))
+    if args.batch:
+        with instrument.capture('batch'):
+            status = run_headless(args)
+        sys.exit(status)
     try:
-        main()
+        with instrument.capture('cli'):
+            main(args.export_to, args.simulate, args.db, args.currency)
     except KeyboardInterrupt:
         print("\n\nExiting...")
-        sys.exit(0)
\ No newline at end of file
+        sys.exit(0)
@@ -0,0 +1,242 @@
+"""
+Currency Conversion
+Every amount in the engine is CAD; this module converts results for display
+and export using a rate table (units of each currency per 1 CAD).
+
+Rates come from, in order:
+  1. the local cache ($BUDGET_DATA_CACHE/exchange_rates.json), if it was
+     fetched within `max_age` seconds
+  2. BUDGET_RATES_URL, an http(s) URL or a local JSON file in the same
+     layout as exchange_rates.json (a stand-in for a live rates API); the
+     result is written to the cache, which is kept on any fetch error
+  3. the stale cache, then the exchange_rates.json shipped with the repository
+
+A failed fetch is recorded in the cache file too, so an unreachable source
+is retried once per `max_age` rather than on every load.
+
+    python currency.py refresh    # fetch from BUDGET_RATES_URL into the cache
+    python currency.py show       # print the table in use
+
+Batch outputs convert a whole array (or chunk of result rows) with one
+NumPy multiply; rates never enter the cost engine or the result cache.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from data_loader import BUNDLED_DIR, default_cache_dir
+from models import CostBreakdown
+from result_cache import TOTALS
+
+BASE_CURRENCY = 'CAD'
+RATES_FILE = 'exchange_rates.json'
+RATES_MAX_AGE = 24 * 3600
+
+SYMBOLS = {
+    'CAD': '$', 'USD': 'US$', 'EUR': '€', 'GBP': '£', 'AUD': 'A$', 'INR': '₹', 'CNY': 'CN¥', 'HKD': 'HK$',
+    'JPY': 'JP¥', 'KRW': '₩', 'PHP': '₱', 'VND': '₫', 'NGN': '₦', 'GHS': 'GH₵', 'BRL': 'R$', 'MXN': 'MX$',
+    'TRY': '₺',
+}
+
+# ============================================================================
+# RATE TABLE
+# ============================================================================
+
+def format_amount(value: float, currency: str = BASE_CURRENCY, decimals: int = 2) -> str:
+    """'$1,234.50', '₹74,210.00', or 'KES 1,234.50' for codes without a symbol."""
+    symbol = SYMBOLS.get(currency)
+    number = f"{value:,.{decimals}f}"
+    return f"{symbol}{number}" if symbol else f"{currency} {number}"
+
+class RateTable:
+    """Units of each currency per 1 CAD."""
+
+    def __init__(self, rates: Mapping[str, float], as_of: str = None, source: str = 'bundled'):
+        bad = [code for code, rate in rates.items()
+               if not isinstance(rate, (int, float)) or isinstance(rate, bool) or rate <= 0]
+        if bad:
+            raise ValueError(f"invalid exchange rates for: {', '.join(sorted(bad))}")
+        self.rates: Dict[str, float] = {code.upper(): float(rate) for code, rate in rates.items()}
+        self.rates[BASE_CURRENCY] = 1.0
+        self.as_of = as_of
+        self.source = source
+        self.codes = tuple(sorted(self.rates, key=lambda code: (code != BASE_CURRENCY, code)))
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self.rates
+
+    def rate(self, currency: str) -> float:
+        try:
+            return self.rates[currency]
+        except KeyError:
+            raise ValueError(f"unknown currency: {currency}") from None
+
+    def convert(self, amount: float, currency: str) -> float:
+        return amount * self.rate(currency)
+
+    def convert_array(self, amounts, currency: str) -> np.ndarray:
+        """CAD amounts (any array-like, e.g. a million engine totals) in `currency`, in one multiply."""
+        return np.asarray(amounts, dtype=np.float64) * self.rate(currency)
+
+    def convert_breakdown(self, costs: CostBreakdown, currency: str) -> CostBreakdown:
+        """A copy of a CAD CostBreakdown with every amount in `currency`."""
+        if costs.currency != BASE_CURRENCY:
+            raise ValueError(f"expected a {BASE_CURRENCY} breakdown, got {costs.currency}")
+        if currency == BASE_CURRENCY:
+            return costs
+        rate = self.rate(currency)
+        return CostBreakdown(costs.labels, tuple(v * rate for v in costs.monthly), costs.fall_winter * rate,
+                             costs.summer * rate, costs.tuition * rate, costs.total * rate, currency)
+
+    def as_dict(self) -> Dict:
+        return {'base': BASE_CURRENCY, 'as_of': self.as_of, 'rates': self.rates}
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def _read(path: str) -> Optional[Dict]:
+    """A rate file's contents, or None when it is missing or unreadable (it may lack rates)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+def _has_rates(data: Optional[Dict]) -> bool:
+    return data is not None and isinstance(data.get('rates'), dict)
+
+def _write_cache(path: str, data: Dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+def _record_failure(path: str, cached: Optional[Dict]):
+    """Mark the cache as checked-and-failed so load_rates backs off for max_age."""
+    try:
+        _write_cache(path, {**(cached or {}), 'checked_at': time.time(), 'failed': True})
+    except OSError:
+        pass  # unwritable cache: retry next time rather than fail the load
+
+def _table(data: Dict, source: str) -> RateTable:
+    if data.get('base', BASE_CURRENCY) != BASE_CURRENCY:
+        raise ValueError(f"rates must be quoted per 1 {BASE_CURRENCY}, not {data['base']}")
+    return RateTable(data['rates'], data.get('as_of'), source)
+
+def fetch_rates(source: str, cache_dir: str = None, timeout: float = 5) -> RateTable:
+    """Fetch a rate file from a URL or path and write it to the cache. Raises ValueError/OSError."""
+    if source.startswith(('http://', 'https://')):
+        import requests
+        try:
+            response = requests.get(source, timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as exc:
+            raise OSError(f"could not fetch rates: {exc}") from None
+    else:
+        with open(source, encoding='utf-8') as f:
+            data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get('rates'), dict):
+        raise ValueError("rate file must be an object with a 'rates' mapping")
+    table = _table(data, source)
+
+    now = time.time()
+    _write_cache(os.path.join(cache_dir or default_cache_dir(), RATES_FILE),
+                 {**table.as_dict(), 'source': source, 'fetched_at': now, 'checked_at': now})
+    return table
+
+def load_rates(source: str = None, cache_dir: str = None, max_age: float = RATES_MAX_AGE,
+               refresh: bool = False) -> RateTable:
+    """The best available rate table (see the module docstring for the order)."""
+    source = source if source is not None else os.environ.get('BUDGET_RATES_URL')
+    path = os.path.join(cache_dir or default_cache_dir(), RATES_FILE)
+    state = _read(path)
+    cached = state if _has_rates(state) else None
+    if cached and not refresh and time.time() - cached.get('fetched_at', 0) < max_age:
+        try:
+            return _table(cached, cached.get('source', 'cache'))
+        except ValueError:
+            cached = None
+    backing_off = state is not None and state.get('failed') and time.time() - state.get('checked_at', 0) < max_age
+    if source and (refresh or not backing_off):
+        try:
+            return fetch_rates(source, cache_dir)
+        except (OSError, ValueError):
+            _record_failure(path, cached)
+    if cached:
+        try:
+            return _table(cached, cached.get('source', 'cache'))
+        except ValueError:
+            pass
+    bundled = os.path.join(BUNDLED_DIR, RATES_FILE)
+    data = _read(bundled)
+    if not _has_rates(data):
+        raise RuntimeError(f"No usable exchange rates: {bundled} is missing or not a valid rate file")
+    return _table(data, 'bundled')
+
+# ============================================================================
+# BATCH RESULTS
+# ============================================================================
+
+def converted_fields(currency: str) -> List[str]:
+    """Batch result columns added for `currency`: monthly_inr, fall_winter_inr, ..."""
+    return [f"{total}_{currency.lower()}" for total in TOTALS]
+
+def convert_results(results: Iterable[Dict], rates: RateTable, currency: str,
+                    chunk_size: int = 1024) -> Iterator[Dict]:
+    """
+    Add converted totals (rounded to cents) to a stream of batch-mode results.
+
+    Rows keep their CAD totals; each chunk is converted with one array multiply.
+    """
+    from batch import chunked
+
+    fields = converted_fields(currency)
+    rate = rates.rate(currency)
+    for chunk in chunked(results, chunk_size):
+        valid = [row for row in chunk if 'error' not in row]
+        if valid:
+            amounts = np.array([[row[t] for t in TOTALS] for row in valid], dtype=np.float64)
+            for row, values in zip(valid, np.round(amounts * rate, 2).tolist()):
+                row.update(zip(fields, values))
+        yield from chunk
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: List[str] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Exchange rates used for display and exports")
+    parser.add_argument('command', choices=['refresh', 'show'])
+    parser.add_argument('--source', help="rates URL or JSON file (default: $BUDGET_RATES_URL)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'refresh':
+        source = args.source or os.environ.get('BUDGET_RATES_URL')
+        if not source:
+            print("✗ No rates source: pass --source or set BUDGET_RATES_URL", file=sys.stderr)
+            return 1
+        try:
+            table = fetch_rates(source)
+        except (OSError, ValueError) as exc:
+            print(f"✗ {exc}", file=sys.stderr)
+            return 1
+        print(f"✓ Cached {len(table.rates)} rates from {source} (as of {table.as_of})")
+        return 0
+
+    table = load_rates(args.source)
+    print(f"💱 1 {BASE_CURRENCY} in each currency — {table.source}, as of {table.as_of}")
+    for code in table.codes:
+        print(f"   {code}  {table.rates[code]:>12,.4f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
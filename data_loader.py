@@ -0,0 +1,213 @@
+"""
+Reference Data Loader
+Loads city, university and program tables from the bundled JSON files, with
+an optional on-disk cache that is revalidated against a remote copy.
+
+Without a remote (the default) only the bundled files are read. With one,
+lookup order for each load() is:
+  1. the local cache, if it was checked within `max_age` seconds
+  2. a concurrent conditional refresh from the remote (ETag/Last-Modified),
+     keeping the cached copy on 304 or on any network error
+  3. the JSON files shipped with the repository
+
+A failed fetch also counts as a check, so an unreachable remote is retried
+once per `max_age` rather than on every load.
+
+Environment:
+  BUDGET_DATA_URL    remote base URL, e.g. S3_BASE_URL (unset or empty: bundled files only)
+  BUDGET_DATA_CACHE  cache directory (default: ~/.cache/intl-student-budget)
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from instrument import span, timed
+
+S3_BASE_URL = "https://intl-student-budget-data.s3.amazonaws.com"
+
+BUNDLED_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# dataset → (bundled file name, remote object name)
+DATASETS = {
+    'programs': ('progams.json', 'programs.json'),
+    'city_data': ('city_data.json', 'city_data.json'),
+    'universities': ('universities.json', 'universities.json'),
+}
+
+MANIFEST = 'manifest.json'
+
+def default_cache_dir() -> str:
+    return os.environ.get('BUDGET_DATA_CACHE',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'intl-student-budget'))
+
+def default_remote_url() -> Optional[str]:
+    return os.environ.get('BUDGET_DATA_URL') or None
+
+def content_version(raw: bytes) -> str:
+    """Short content hash used as the dataset version."""
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+class DataLoader:
+    """Bundled reference data, optionally refreshed from a remote into a validated on-disk cache."""
+
+    def __init__(self, remote_url: Optional[str] = None, cache_dir: Optional[str] = None,
+                 bundled_dir: str = BUNDLED_DIR, timeout: float = 5, max_age: float = 3600,
+                 offline: bool = False):
+        self.remote_url = None if offline else (remote_url or default_remote_url())
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.bundled_dir = bundled_dir
+        self.timeout = timeout
+        self.max_age = max_age
+        # offline: bundled files only, ignoring both the remote and the cache
+        self.manifest = {} if offline else self._read_manifest()
+
+    # ------------------------------------------------------------------ cache
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(os.path.join(self.cache_dir, MANIFEST), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = os.path.join(self.cache_dir, MANIFEST + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.cache_dir, MANIFEST))
+
+    def _cache_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, DATASETS[name][1])
+
+    def _cached(self, name: str) -> Optional[bytes]:
+        entry = self.manifest.get(name)
+        if not entry:
+            return None
+        try:
+            with open(self._cache_path(name), 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return None
+        return raw if content_version(raw) == entry.get('version') else None
+
+    def _is_fresh(self, name: str) -> bool:
+        entry = self.manifest.get(name, {})
+        return time.time() - entry.get('checked_at', 0) < self.max_age
+
+    def _needs_fetch(self, name: str) -> bool:
+        """Stale, or never fetched successfully and not failed within max_age."""
+        if not self._is_fresh(name):
+            return True
+        return self._cached(name) is None and not self.manifest.get(name, {}).get('failed')
+
+    # ----------------------------------------------------------------- remote
+
+    @timed('data.fetch')
+    def _fetch(self, name: str) -> str:
+        """Conditionally fetch one dataset into the cache. Returns a status word."""
+        import requests
+
+        entry = self.manifest.setdefault(name, {})
+        headers = {}
+        if self._cached(name) is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        url = f"{self.remote_url.rstrip('/')}/{DATASETS[name][1]}"
+        try:
+            response = requests.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                entry['checked_at'] = time.time()
+                entry.pop('failed', None)
+                return 'not-modified'
+            response.raise_for_status()
+            raw = response.content
+            json.loads(raw)
+        except (requests.RequestException, ValueError):
+            # back off for max_age; any cached copy stays in use
+            entry.update(checked_at=time.time(), failed=True)
+            return 'error'
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self._cache_path(name) + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp, self._cache_path(name))
+        except OSError:
+            # unwritable cache: keep using the bundled copy and back off like a failed fetch
+            entry.update(checked_at=time.time(), failed=True)
+            return 'error'
+        self.manifest[name] = {
+            'version': content_version(raw), 'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'), 'checked_at': time.time(),
+        }
+        return 'updated'
+
+    def refresh(self, names=None) -> Dict[str, str]:
+        """Revalidate datasets against the remote concurrently."""
+        names = list(names or DATASETS)
+        if not self.remote_url:
+            return {name: 'offline' for name in names}
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            statuses = dict(zip(names, pool.map(self._fetch, names)))
+        try:
+            self._write_manifest()
+        except OSError:
+            pass  # unwritable cache: the in-memory manifest still applies to this loader
+        return statuses
+
+    def discard(self, names=None):
+        """Drop cached remote copies (e.g. ones that failed validation) and back off for max_age."""
+        for name in names or DATASETS:
+            if self._cached(name) is not None:
+                try:
+                    os.remove(self._cache_path(name))
+                except OSError:
+                    pass
+            self.manifest[name] = {'checked_at': time.time(), 'failed': True}
+        if self.remote_url:
+            try:
+                self._write_manifest()
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------- load
+
+    def _bundled(self, name: str) -> bytes:
+        with open(os.path.join(self.bundled_dir, DATASETS[name][0]), 'rb') as f:
+            return f.read()
+
+    def sync(self, refresh: bool = False) -> Dict[str, str]:
+        """Revalidate stale datasets (if a remote is configured) and return their versions."""
+        stale = [n for n in DATASETS if refresh or self._needs_fetch(n)]
+        if stale and self.remote_url:
+            self.refresh(stale)
+        return self.versions()
+
+    def load(self, refresh: bool = False) -> Dict[str, Dict]:
+        """Return {'programs', 'city_data', 'universities'} from the best available source."""
+        with span('data.sync'):
+            self.sync(refresh)
+        data = {}
+        with span('data.parse'):
+            for name in DATASETS:
+                raw = self._cached(name)
+                data[name] = json.loads(raw if raw is not None else self._bundled(name))
+        return data
+
+    def versions(self) -> Dict[str, str]:
+        """Version of each dataset as it would be loaded right now."""
+        return {name: self.manifest[name]['version'] if self._cached(name) is not None
+                else content_version(self._bundled(name)) for name in DATASETS}
+
+def load_reference_data(**kwargs) -> Dict[str, Dict]:
+    """Convenience wrapper: DataLoader(**kwargs).load()."""
+    return DataLoader(**kwargs).load()
@@ -0,0 +1,116 @@
+"""
+Dependency Graph
+Small memoizing graph for the app's per-rerun computations. Widget values
+are set as inputs; derived values are nodes declared with their
+dependencies, evaluated lazily and recomputed only when a dependency
+actually changed since the node last ran.
+
+Each input and node carries a version that is bumped only when its value
+changes (by ==), so a recomputed node that produces an equal value, e.g. the
+same tuition for a different program with the same multiplier, leaves its
+dependents cached. Per-node hit/miss counts, compute time and rerun
+latencies are kept for the app's performance panel.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+def _same(a, b) -> bool:
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):  # e.g. DataFrames: treat as changed
+        return False
+
+class Node:
+    __slots__ = ('name', 'fn', 'deps', 'value', 'version', 'seen', 'rerun', 'hits', 'misses', 'seconds')
+
+    def __init__(self, name: str, fn: Callable, deps: Sequence[str]):
+        self.name, self.fn, self.deps = name, fn, tuple(deps)
+        self.value, self.version, self.seen, self.rerun = None, 0, None, -1
+        self.hits = self.misses = 0
+        self.seconds = 0.0
+
+class Graph:
+    """
+    Inputs and lazily evaluated nodes:
+
+        graph = Graph()
+
+        @graph.node('uni', 'program')
+        def tuition(uni, program): ...
+
+        graph.set(uni=..., program=...)
+        graph.get('tuition')
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Node] = {}
+        self.inputs: Dict[str, Any] = {}
+        self._input_versions: Dict[str, int] = {}
+        self.reruns: List[float] = []
+        self._rerun = 0
+        self._started = None
+
+    def node(self, *deps: str) -> Callable:
+        """Register the decorated function as a node named after it."""
+        def register(fn: Callable) -> Callable:
+            self.nodes[fn.__name__] = Node(fn.__name__, fn, deps)
+            return fn
+        return register
+
+    def set(self, **values):
+        for name, value in values.items():
+            if name not in self._input_versions or not _same(self.inputs[name], value):
+                self.inputs[name] = value
+                self._input_versions[name] = self._input_versions.get(name, 0) + 1
+
+    def get(self, name: str) -> Any:
+        if name in self.inputs:
+            return self.inputs[name]
+        return self._evaluate(self.nodes[name]).value
+
+    def _version(self, name: str) -> int:
+        if name in self.nodes:
+            return self._evaluate(self.nodes[name]).version
+        if name not in self._input_versions:
+            raise KeyError(f"input not set: {name}")
+        return self._input_versions[name]
+
+    def _evaluate(self, node: Node) -> Node:
+        seen = tuple(self._version(dep) for dep in node.deps)
+        if seen == node.seen:
+            if node.rerun != self._rerun:  # count once per rerun, not once per dependent
+                node.hits += 1
+                node.rerun = self._rerun
+            return node
+        start = time.perf_counter()
+        value = node.fn(*(self.get(dep) for dep in node.deps))
+        node.seconds += time.perf_counter() - start
+        node.misses += 1
+        if node.seen is None or not _same(node.value, value):
+            node.value = value
+            node.version += 1
+        node.seen, node.rerun = seen, self._rerun
+        return node
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+
+    def start_rerun(self):
+        self._rerun += 1
+        self._started = time.perf_counter()
+
+    def end_rerun(self, keep: int = 200):
+        """Record the latency since start_rerun(); the last `keep` are retained."""
+        if self._started is not None:
+            self.reruns.append(time.perf_counter() - self._started)
+            del self.reruns[:-keep]
+            self._started = None
+
+    def stats(self) -> List[Dict]:
+        """One row per node: hits, misses and total compute time."""
+        return [{'node': n.name, 'hits': n.hits, 'misses': n.misses, 'compute_ms': n.seconds * 1000}
+                for n in self.nodes.values()]
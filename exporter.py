@@ -0,0 +1,193 @@
+"""
+Bulk Estimate Exporter
+Appends many estimates to one tidy, typed file instead of one small CSV per
+estimate. Each line item becomes a row:
+
+    estimate_id, university, program, city, section, category, amount_cad
+
+where `section` is 'monthly' (fall/winter monthly amounts) or 'annual'
+(Fall & Winter, Summer, Tuition, TOTAL). A batch record that failed becomes
+one 'error' row with the message as its category and no amount; a record
+without an `id` is written as record_<position in the batch>, so ids are
+unique within a file. Rows are buffered and flushed every
+`flush_rows` rows — as one write() for CSV or one row group for Parquet.
+
+With `currency`, an `amount_<code>` column (e.g. amount_inr) follows
+amount_cad, converted once per flush as a single array multiply.
+"""
+
+import csv
+import io
+import os
+from typing import Dict, Iterable, Iterator, Tuple
+
+from currency import BASE_CURRENCY, RateTable, load_rates
+from instrument import timed
+from models import CostBreakdown, Scenario
+
+FIELDS = ('estimate_id', 'university', 'program', 'city', 'section', 'category', 'amount_cad')
+
+DEFAULT_FLUSH_ROWS = 50_000
+
+NO_AMOUNT = float('nan')  # written as an empty CSV field / a Parquet null
+
+Row = Tuple[str, str, str, str, str, str, float]
+
+# ============================================================================
+# ROWS
+# ============================================================================
+
+def breakdown_rows(estimate_id, scenario: Scenario, costs: CostBreakdown) -> Iterator[Row]:
+    """Tidy rows for one fully itemized estimate (interactive CLI / app); `costs` must be in CAD."""
+    if costs.currency != BASE_CURRENCY:
+        raise ValueError(f"exports take {BASE_CURRENCY} breakdowns, got {costs.currency}")
+    key = (str(estimate_id), scenario.university or '', scenario.program or '', scenario.city)
+    for category, amount in costs.monthly_items():
+        yield (*key, 'monthly', category, float(amount))
+    yield (*key, 'annual', 'Fall & Winter', costs.fall_winter)
+    yield (*key, 'annual', 'Summer', costs.summer)
+    yield (*key, 'annual', 'Tuition', costs.tuition)
+    yield (*key, 'annual', 'TOTAL', costs.total)
+
+def result_id(result: Dict, position: int) -> str:
+    """The result's `id`, or record_<position> for a record that has none."""
+    record_id = result.get('id')
+    return f"record_{position:06d}" if record_id is None or str(record_id) == '' else str(record_id)
+
+def result_rows(result: Dict, position: int = 0) -> Iterator[Row]:
+    """Tidy rows for one batch-mode result dict (totals only; an error becomes one 'error' row)."""
+    if 'error' in result:
+        yield (result_id(result, position), result.get('university') or '', result.get('program') or '',
+               result.get('city') or '', 'error', result['error'], NO_AMOUNT)
+        return
+    key = (result_id(result, position), result['university'] or '', result['program'] or '', result['city'])
+    yield (*key, 'monthly', 'Total', result['monthly'])
+    yield (*key, 'annual', 'Fall & Winter', result['fall_winter'])
+    yield (*key, 'annual', 'Summer', result['summer'])
+    yield (*key, 'annual', 'Tuition', result['tuition'])
+    yield (*key, 'annual', 'TOTAL', result['total'])
+
+def _csv_amount(amount: float) -> str:
+    return '' if amount != amount else f"{amount:.2f}"  # NaN: no amount
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+class EstimateWriter:
+    """
+    Buffered appender for tidy estimate rows.
+
+    Use as a context manager; `fmt` is 'csv' or 'parquet' (inferred from the
+    file extension when omitted). CSV files opened with append=True keep
+    their existing header, which must match this writer's columns.
+    """
+
+    def __init__(self, path, fmt: str = None, flush_rows: int = DEFAULT_FLUSH_ROWS, append: bool = False,
+                 currency: str = None, rates: RateTable = None):
+        self.fmt = fmt or ('parquet' if str(path).endswith('.parquet') else 'csv')
+        self.flush_rows = flush_rows
+        self.rows_written = 0
+        self.results_written = 0
+        self._pending = []
+        self._parquet = None
+        self._rate = None
+        self.fields = FIELDS
+        if currency and currency != BASE_CURRENCY:
+            self._rate = (rates or load_rates()).rate(currency)
+            self.fields = FIELDS + (f"amount_{currency.lower()}",)
+
+        if self.fmt == 'csv':
+            is_file = isinstance(path, (str, os.PathLike))
+            has_header = is_file and append and os.path.exists(path) and os.path.getsize(path) > 0
+            self._file = open(path, 'a' if append else 'w', newline='', encoding='utf-8') if is_file else path
+            self._owns_file = is_file
+            if has_header:
+                with open(path, encoding='utf-8') as existing:
+                    header = existing.readline().strip()
+                if header != ','.join(self.fields):
+                    self._file.close()
+                    raise ValueError(f"{path} has columns {header!r}; cannot append {','.join(self.fields)!r}")
+            else:
+                self._file.write(','.join(self.fields) + '\r\n')
+        elif self.fmt == 'parquet':
+            if append:
+                raise ValueError("Parquet output cannot be appended to; write a new file")
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from None
+            self._pa = pa
+            schema = pa.schema([(f, pa.string()) for f in FIELDS[:-1]] + [(f, pa.float64()) for f in self.fields[6:]])
+            self._parquet = pq.ParquetWriter(path, schema)
+        else:
+            raise ValueError(f"unknown export format: {self.fmt}")
+
+    def __enter__(self) -> 'EstimateWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_rows(self, rows: Iterable[Row]):
+        pending = self._pending
+        for row in rows:
+            pending.append(row)
+            if len(pending) >= self.flush_rows:
+                self.flush()
+                pending = self._pending
+
+    def write_estimate(self, estimate_id, scenario: Scenario, costs: CostBreakdown):
+        self.write_rows(breakdown_rows(estimate_id, scenario, costs))
+
+    def write_results(self, results: Iterable[Dict]) -> int:
+        """Append batch-mode results; returns the number of results consumed."""
+        count = 0
+        for result in results:
+            self.write_rows(result_rows(result, self.results_written))
+            self.results_written += 1
+            count += 1
+        return count
+
+    @timed('export.flush')
+    def flush(self):
+        if not self._pending:
+            return
+        converted = None
+        if self._rate is not None:
+            import numpy as np
+            converted = np.fromiter((row[-1] for row in self._pending), np.float64, len(self._pending)) * self._rate
+        if self._parquet is not None:
+            columns = [list(values) for values in zip(*self._pending)]
+            if converted is not None:
+                columns.append(converted)
+            columns[6:] = [self._pa.array(values, self._pa.float64(), from_pandas=True) for values in columns[6:]]
+            self._parquet.write_table(self._pa.table(dict(zip(self.fields, columns)), schema=self._parquet.schema))
+        else:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            if converted is None:
+                writer.writerows((*row[:-1], _csv_amount(row[-1])) for row in self._pending)
+            else:
+                writer.writerows((*row[:-1], _csv_amount(row[-1]), _csv_amount(amount))
+                                 for row, amount in zip(self._pending, converted.tolist()))
+            self._file.write(buf.getvalue())
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        if self._parquet is not None:
+            self._parquet.close()
+        elif self._owns_file:
+            self._file.close()
+
+@timed('export.estimate_csv')
+def estimate_csv(estimate_id, scenario: Scenario, costs: CostBreakdown, currency: str = None,
+                 rates: RateTable = None) -> str:
+    """A single estimate in the tidy CSV layout (e.g. for a download button)."""
+    buf = io.StringIO()
+    with EstimateWriter(buf, fmt='csv', currency=currency, rates=rates) as writer:
+        writer.write_estimate(estimate_id, scenario, costs)
+    return buf.getvalue()
@@ -0,0 +1,631 @@
+"""
+Export Ingestion
+Collects previously exported estimate CSVs into one typed, queryable
+dataset, whatever layout (and version of the tool) wrote them:
+
+  tidy       exporter.py / the app's download button / --format tidy:
+             estimate_id,university,program,city,section,category,amount_cad
+  summary    the CLI's export_csv: University/City/Date/Currency rows, then
+             MONTHLY EXPENSES and ANNUAL SUMMARY sections
+  app_table  older app downloads: a "Category,Amount" frame with the same
+             sections (Fall & Winter Total, ANNUAL TOTAL, ...)
+  seasonal   older CLI exports: FALL & WINTER EXPENSES (8 months) and
+             SUMMER EXPENSES (4 months) sections, each with its own total
+
+    python ingest.py load exports/ --db estimates.db --workers 0
+    python ingest.py load exports/ -o estimates.parquet          # requires pyarrow
+    python ingest.py query estimates.db --by city                # median annual total per city
+
+Section files are typically many small files and are parsed across a
+process pool; tidy files can hold a whole cohort and are streamed row by row
+in the main process. Both are written in buffered batches, so memory stays
+bounded by the batch size rather than the input size. Each tidy file is
+written atomically (a SQLite savepoint, or temporary Parquet parts appended
+on success), so a file with a bad row is recorded as failed with none of
+its estimates.
+
+The dataset has one `estimates` row per estimate (university, program, city,
+summer city, date, currency and the monthly / fall_winter / summer / tuition
+/ total amounts) and one `items` row per line item (section 'monthly' or
+'summer', category, amount), joined on `estimates.id`. Amounts are kept in
+the currency they were exported in. The SQLite store remembers each file's
+size and mtime, so loading the same directory again only reads new or
+changed files.
+"""
+
+import argparse
+import csv
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from currency import BASE_CURRENCY
+from exporter import FIELDS as TIDY_FIELDS
+from instrument import timed
+
+ESTIMATE_FIELDS = ('id', 'source', 'estimate_id', 'layout', 'university', 'program', 'city', 'summer_city',
+                   'date', 'currency', 'monthly', 'fall_winter', 'summer', 'tuition', 'total')
+ITEM_FIELDS = ('estimate', 'section', 'category', 'amount')
+GROUP_COLUMNS = ('city', 'university', 'program', 'summer_city', 'currency', 'layout')
+VALUE_COLUMNS = ('total', 'monthly', 'fall_winter', 'summer', 'tuition')
+
+DEFAULT_FLUSH_ROWS = 50_000
+FILES_PER_TASK = 64
+
+Estimate = Dict
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,
+    layout TEXT, estimates INTEGER NOT NULL, error TEXT
+);
+CREATE TABLE IF NOT EXISTS estimates (
+    id INTEGER PRIMARY KEY, source TEXT NOT NULL, estimate_id TEXT, layout TEXT NOT NULL,
+    university TEXT, program TEXT, city TEXT, summer_city TEXT, date TEXT, currency TEXT NOT NULL,
+    monthly REAL, fall_winter REAL, summer REAL, tuition REAL, total REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    estimate INTEGER NOT NULL REFERENCES estimates(id) ON DELETE CASCADE,
+    section TEXT NOT NULL, category TEXT NOT NULL, amount REAL NOT NULL,
+    PRIMARY KEY (estimate, section, category)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_estimates_source ON estimates (source);
+CREATE INDEX IF NOT EXISTS ix_estimates_city ON estimates (currency, city, total);
+CREATE INDEX IF NOT EXISTS ix_estimates_university ON estimates (currency, university, total);
+CREATE INDEX IF NOT EXISTS ix_estimates_program ON estimates (currency, program, total);
+"""
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+# Section headers (upper-cased, before any "(8 months)" suffix) → section
+SECTIONS = {'MONTHLY EXPENSES': 'monthly', 'FALL & WINTER EXPENSES': 'monthly',
+            'SUMMER EXPENSES': 'summer', 'ANNUAL SUMMARY': 'annual'}
+# Annual labels across layouts → estimate field
+ANNUAL_LABELS = {'fall & winter': 'fall_winter', 'fall & winter total': 'fall_winter',
+                 'summer': 'summer', 'summer total': 'summer', 'tuition': 'tuition',
+                 'total': 'total', 'annual total': 'total', 'living expenses': 'living'}
+# Metadata rows before the first section → estimate field
+META_LABELS = {'university': 'university', 'city': 'city', 'program': 'program', 'currency': 'currency',
+               'date': 'date', 'date generated': 'date'}
+
+_NUMBER = re.compile(r'[^\d.\-]')
+_CURRENCY_HEADER = re.compile(r'\(([A-Z]{3})\)')
+_FILE_DATE = re.compile(r'_(\d{8})(?:_\d{6})?(?:\.|_|$)')
+
+def parse_amount(text: str) -> float:
+    """'1,234.50', '$1,234.50' or '₹74,210' → float. Raises ValueError."""
+    cleaned = _NUMBER.sub('', text)
+    if not cleaned:
+        raise ValueError(f"not an amount: {text!r}")
+    return float(cleaned)
+
+def parse_date(text: str) -> Optional[str]:
+    """'2025-11-17 15:35', '2025-11-17' or '20251117' → '2025-11-17' (None if unrecognized)."""
+    text = text.strip()
+    for fmt, width in (('%Y-%m-%d', 10), ('%Y%m%d', 8)):
+        try:
+            return datetime.strptime(text[:width], fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+def sniff_layout(path: str) -> str:
+    """'tidy' or 'sections', from the first line."""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        header = next(csv.reader(f), [])
+    return 'tidy' if tuple(header[:len(TIDY_FIELDS)]) == TIDY_FIELDS else 'sections'
+
+def _new_estimate(source: str, layout: str) -> Estimate:
+    estimate = dict.fromkeys(ESTIMATE_FIELDS)
+    estimate.update(source=source, layout=layout, items=[])
+    return estimate
+
+def _finish(estimate: Estimate) -> Estimate:
+    """Fill derivable totals, or raise ValueError if the estimate has none."""
+    monthly = [amount for section, _, amount in estimate['items'] if section == 'monthly']
+    if estimate['monthly'] is None and monthly:
+        estimate['monthly'] = round(sum(monthly), 2)
+    living = estimate.pop('living', None)
+    if estimate['total'] is None:
+        raise ValueError("no TOTAL row")
+    if living is not None and estimate['tuition'] is None:
+        estimate['tuition'] = round(estimate['total'] - living, 2)
+    estimate['currency'] = estimate['currency'] or BASE_CURRENCY
+    return estimate
+
+def parse_sections(path: str) -> Estimate:
+    """One estimate from a summary / app_table / seasonal file. Raises ValueError."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    estimate = _new_estimate(path, 'summary')
+    estimate['estimate_id'] = stem
+    section = None
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        for line_no, row in enumerate(csv.reader(f), 1):
+            cells = [cell.strip() for cell in row]
+            if not any(cells):
+                continue
+            label = cells[0]
+            value = cells[1] if len(cells) > 1 else ''
+            key = label.lower()
+            if line_no == 1 and key == 'category' and value.lower() == 'amount':
+                estimate['layout'] = 'app_table'
+                continue
+            name = re.sub(r'\s*\(.*\)$', '', label).upper()
+            if not value and name in SECTIONS:
+                section = SECTIONS[name]
+                if name == 'FALL & WINTER EXPENSES':
+                    estimate['layout'] = 'seasonal'
+                continue
+            if not value:
+                continue  # title row ("International Student Cost Estimate") or a blank amount
+            if key == 'category':  # column header, e.g. "Category,Monthly Amount (CAD)"
+                found = _CURRENCY_HEADER.search(value)
+                if found:
+                    estimate['currency'] = found.group(1)
+                continue
+            try:
+                if section is None:
+                    field = META_LABELS.get(key)
+                    if field == 'date':
+                        estimate['date'] = parse_date(value)
+                    elif field:
+                        estimate[field] = value
+                elif section == 'annual':
+                    field = ANNUAL_LABELS.get(key)
+                    if field:
+                        estimate[field] = parse_amount(value)
+                elif key == 'location':
+                    estimate['summer_city'] = value
+                elif key.startswith('total'):
+                    estimate['fall_winter' if section == 'monthly' else 'summer'] = parse_amount(value)
+                else:
+                    estimate['items'].append((section, label, parse_amount(value)))
+            except ValueError as exc:
+                raise ValueError(f"line {line_no}: {exc}") from None
+    if estimate['date'] is None:
+        found = _FILE_DATE.search(os.path.basename(path))
+        estimate['date'] = parse_date(found.group(1)) if found else None
+    if estimate['summer_city'] is None and estimate['layout'] == 'seasonal':
+        estimate['summer_city'] = estimate['city']
+    return _finish(estimate)
+
+def parse_tidy(path: str) -> Iterator[Estimate]:
+    """
+    Stream estimates from a tidy export, one group of consecutive estimate_id rows at a time.
+
+    A section/category that repeats within a group starts a new estimate (two
+    exports that share an id), and batch records that failed (a single 'error'
+    row with no amount) are skipped.
+    """
+    found = _FILE_DATE.search(os.path.basename(path))
+    date = parse_date(found.group(1)) if found else None
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = csv.DictReader(f)
+        for estimate_id, group in groupby(rows, key=lambda row: row['estimate_id']):
+            estimate, seen = None, set()
+            for row in group:
+                key = (row['section'], row['category'])
+                if key in seen or row['section'] == 'error':
+                    if estimate is not None:
+                        yield _finish(estimate)
+                    estimate, seen = None, set()
+                    if row['section'] == 'error':
+                        continue
+                if estimate is None:
+                    estimate = _new_estimate(path, 'tidy')
+                    estimate['estimate_id'] = estimate_id
+                    estimate['date'] = date
+                seen.add(key)
+                estimate['university'] = row['university'] or None
+                estimate['program'] = row['program'] or None
+                estimate['city'] = row['city'] or None
+                amount = parse_amount(row['amount_cad'])
+                if row['section'] == 'annual':
+                    field = ANNUAL_LABELS.get(row['category'].lower())
+                    if field:
+                        estimate[field] = amount
+                elif row['section'] == 'monthly' and row['category'] == 'Total':
+                    estimate['monthly'] = amount  # batch-mode rows carry only the monthly total
+                else:
+                    estimate['items'].append((row['section'], row['category'], amount))
+            if estimate is not None:
+                yield _finish(estimate)
+
+def _file_stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def parse_files(paths: List[str]) -> List[Dict]:
+    """Pool task: parse section files into {'source', 'size', 'mtime_ns', 'layout', 'estimates', 'error'}."""
+    results = []
+    for path in paths:
+        size, mtime_ns = _file_stat(path)
+        result = {'source': path, 'size': size, 'mtime_ns': mtime_ns, 'layout': None, 'estimates': [],
+                  'error': None}
+        try:
+            estimate = parse_sections(path)
+            result.update(layout=estimate['layout'], estimates=[estimate])
+        except (OSError, UnicodeDecodeError, csv.Error, ValueError) as exc:
+            result['error'] = str(exc)
+        results.append(result)
+    return results
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+class DatasetWriter:
+    """
+    Buffered writer for the estimates/items dataset.
+
+    `fmt` is 'sqlite' or 'parquet' (inferred from a .parquet extension).
+    Parquet writes `path` (estimates) and `<stem>.items.parquet` from
+    scratch; SQLite appends and remembers which files it has seen. Writes
+    inside `atomic()` are kept only if the block completes.
+    """
+
+    def __init__(self, path: str, fmt: str = None, flush_rows: int = DEFAULT_FLUSH_ROWS):
+        self.path = path
+        self.fmt = fmt or ('parquet' if str(path).endswith('.parquet') else 'sqlite')
+        self.flush_rows = flush_rows
+        self.estimates_written = 0
+        self._estimates: List[tuple] = []
+        self._items: List[tuple] = []
+        self._sources: List[tuple] = []
+        self._atomic = False
+        if self.fmt == 'sqlite':
+            self._conn = sqlite3.connect(path)
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(SCHEMA_SQL)
+            self._next_id = (self._conn.execute("SELECT MAX(id) FROM estimates").fetchone()[0] or 0) + 1
+        elif self.fmt == 'parquet':
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from None
+            self._pa, self._pq = pa, pq
+            text, number = pa.string(), pa.float64()
+            self._schemas = (
+                pa.schema([('id', pa.int64())] + [(f, text) for f in ESTIMATE_FIELDS[1:10]]
+                          + [(f, number) for f in ESTIMATE_FIELDS[10:]]),
+                pa.schema([('estimate', pa.int64()), ('section', text), ('category', text), ('amount', number)]))
+            self._writers = (pq.ParquetWriter(path, self._schemas[0]),
+                             pq.ParquetWriter(items_path(path), self._schemas[1]))
+            self._next_id = 1
+        else:
+            raise ValueError(f"unknown dataset format: {self.fmt}")
+
+    def __enter__(self) -> 'DatasetWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def seen(self) -> Dict[str, Tuple[int, int]]:
+        """path → (size, mtime_ns) of every file already ingested (empty for Parquet)."""
+        if self.fmt != 'sqlite':
+            return {}
+        return {path: (size, mtime) for path, size, mtime in
+                self._conn.execute("SELECT path, size, mtime_ns FROM sources")}
+
+    def write_estimates(self, estimates: Iterable[Estimate]) -> int:
+        count = 0
+        for estimate in estimates:
+            estimate_id = self._next_id
+            self._next_id += 1
+            self._estimates.append((estimate_id, *(estimate[f] for f in ESTIMATE_FIELDS[1:])))
+            self._items.extend((estimate_id, *item) for item in estimate['items'])
+            count += 1
+            if len(self._estimates) + len(self._items) >= self.flush_rows:
+                self.flush()
+        return count
+
+    def write_source(self, source: str, size: int, mtime_ns: int, layout: str, estimates: int,
+                     error: str = None):
+        """Record a file as ingested; replaces (and, in SQLite, deletes the estimates of) an earlier load."""
+        self._sources.append((source, size, mtime_ns, layout, estimates, error))
+
+    def forget(self, sources: Iterable[str]):
+        """Drop earlier loads of changed files before they are read again (SQLite only)."""
+        if self.fmt != 'sqlite':
+            return
+        with self._conn:
+            for source in sources:
+                self._conn.execute("DELETE FROM estimates WHERE source = ?", (source,))
+                self._conn.execute("DELETE FROM sources WHERE path = ?", (source,))
+
+    @contextmanager
+    def atomic(self):
+        """
+        Keep the estimates written inside the block only if it completes (one input file).
+
+        SQLite streams them into a savepoint; Parquet into temporary part files
+        that are copied into the dataset, one row group at a time, on success.
+        """
+        self.flush()
+        next_id, written = self._next_id, self.estimates_written
+        if self.fmt == 'sqlite':
+            self._conn.execute("SAVEPOINT source")
+        else:
+            parts = tempfile.mkdtemp(prefix='ingest-', dir=os.path.dirname(os.path.abspath(self.path)))
+            dataset, part_paths = self._writers, [os.path.join(parts, f"{i}.parquet") for i in range(2)]
+            self._writers = tuple(map(self._pq.ParquetWriter, part_paths, self._schemas))
+        self._atomic = True
+        try:
+            yield
+            self.flush()
+        except BaseException:
+            self._estimates, self._items = [], []
+            self._next_id, self.estimates_written = next_id, written
+            if self.fmt == 'sqlite':
+                self._conn.execute("ROLLBACK TO source")
+                self._conn.execute("RELEASE source")
+            raise
+        else:
+            if self.fmt == 'sqlite':
+                self._conn.execute("RELEASE source")  # the outermost savepoint: commits
+            else:
+                for part, part_path, writer in zip(self._writers, part_paths, dataset):
+                    part.close()
+                    for batch in self._pq.ParquetFile(part_path).iter_batches():
+                        writer.write_table(self._pa.Table.from_batches([batch], schema=writer.schema))
+        finally:
+            self._atomic = False
+            if self.fmt == 'parquet':
+                for part in self._writers:
+                    part.close()
+                self._writers = dataset
+                shutil.rmtree(parts, ignore_errors=True)
+
+    def _insert(self):
+        self._conn.executemany(f"INSERT INTO estimates VALUES ({', '.join('?' * len(ESTIMATE_FIELDS))})",
+                               self._estimates)
+        self._conn.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)", self._items)
+        self._conn.executemany("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?)", self._sources)
+
+    @timed('ingest.flush')
+    def flush(self):
+        if self.fmt == 'sqlite':
+            if self._atomic:
+                self._insert()  # committed when atomic() releases its savepoint
+            else:
+                with self._conn:
+                    self._insert()
+        else:
+            for writer, schema, fields, rows in zip(self._writers, self._schemas, (ESTIMATE_FIELDS, ITEM_FIELDS),
+                                                    (self._estimates, self._items)):
+                if rows:
+                    columns = [list(values) for values in zip(*rows)]
+                    writer.write_table(self._pa.table(dict(zip(fields, columns)), schema=schema))
+        self.estimates_written += len(self._estimates)
+        self._estimates, self._items, self._sources = [], [], []
+
+    def close(self):
+        self.flush()
+        if self.fmt == 'sqlite':
+            self._conn.close()
+        else:
+            for writer in self._writers:
+                writer.close()
+
+def items_path(path: str) -> str:
+    """estimates.parquet → estimates.items.parquet"""
+    return f"{os.path.splitext(path)[0]}.items.parquet"
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def find_csv_files(paths: Iterable[str]) -> Iterator[str]:
+    """Files as given, plus every *.csv under given directories, in sorted order."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith('.csv'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def ingest(paths: Iterable[str], writer: DatasetWriter, workers: int = None,
+           files_per_task: int = FILES_PER_TASK, prefetch: int = 2) -> Dict[str, int]:
+    """
+    Parse every file under `paths` into `writer`, skipping files it has already seen unchanged.
+
+    Returns counts of files read, skipped and failed, and estimates written.
+    Failed files are recorded with their error (in SQLite's `sources`) and do
+    not stop the run.
+    """
+    from batch import chunked
+    from parallel import default_workers, ordered_map
+
+    counts = {'files': 0, 'skipped': 0, 'failed': 0, 'estimates': 0}
+    seen = writer.seen()
+    tidy, sections, changed = [], [], []
+    for path in find_csv_files(paths):
+        path = os.path.abspath(path)
+        try:
+            stat = _file_stat(path)
+            if seen.get(path) == stat:
+                counts['skipped'] += 1
+                continue
+            (tidy if sniff_layout(path) == 'tidy' else sections).append(path)
+        except (OSError, UnicodeDecodeError, csv.Error) as exc:
+            writer.write_source(path, 0, 0, None, 0, str(exc))
+            counts['failed'] += 1
+            continue
+        if path in seen:
+            changed.append(path)
+    writer.forget(changed)
+
+    def record(result: Dict):
+        counts['files'] += 1
+        counts['failed'] += result['error'] is not None
+        counts['estimates'] += writer.write_estimates(result['estimates'])
+        writer.write_source(result['source'], result['size'], result['mtime_ns'], result['layout'],
+                            len(result['estimates']), result['error'])
+
+    workers = workers or default_workers()
+    tasks = chunked(sections, files_per_task)
+    batches = map(parse_files, tasks) if workers == 1 else ordered_map(parse_files, tasks, workers, prefetch)
+    for results in batches:
+        for result in results:
+            record(result)
+
+    for path in tidy:
+        size, mtime_ns = _file_stat(path)
+        counts['files'] += 1
+        try:
+            with writer.atomic():  # all or nothing: a bad row must not leave part of a file
+                written = writer.write_estimates(parse_tidy(path))
+        except (OSError, UnicodeDecodeError, csv.Error, KeyError, ValueError) as exc:
+            counts['failed'] += 1
+            writer.write_source(path, size, mtime_ns, 'tidy', 0, str(exc))
+            continue
+        counts['estimates'] += written
+        writer.write_source(path, size, mtime_ns, 'tidy', written)
+    writer.flush()
+    return counts
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def _quantile(sorted_at, n: int, q: float) -> float:
+    """Linear-interpolated quantile given `sorted_at(offset, count)` → the values at those ranks."""
+    position = q * (n - 1)
+    low = int(position)
+    values = sorted_at(low, 2 if position > low else 1)
+    return values[0] + (values[-1] - values[0]) * (position - low)
+
+def summarize(path: str, by: str = 'city', value: str = 'total', currency: str = BASE_CURRENCY,
+              quantiles: Tuple[float, ...] = (0.1, 0.5, 0.9)) -> List[Dict]:
+    """
+    Count, mean and quantiles (P10/P50/P90 by default) of `value` per `by`, for one currency.
+
+    SQLite reads a handful of rows per group through the (currency, by,
+    total) indexes; Parquet scans only the two columns involved, batch by batch.
+    """
+    if by not in GROUP_COLUMNS or value not in VALUE_COLUMNS:
+        raise ValueError(f"group by one of {', '.join(GROUP_COLUMNS)}; summarize one of {', '.join(VALUE_COLUMNS)}")
+    if str(path).endswith('.parquet'):
+        return _summarize_parquet(path, by, value, currency, quantiles)
+    if not os.path.exists(path):
+        raise ValueError(f"no such dataset: {path}")
+
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        groups = conn.execute(
+            f"SELECT {by}, COUNT({value}), AVG({value}) FROM estimates WHERE currency = ? AND {value} IS NOT NULL "
+            f"GROUP BY {by} ORDER BY {by} IS NULL, {by}", (currency,)).fetchall()
+        rows = []
+        for group, n, mean in groups:
+            where = f"{by} IS ?"
+            sorted_at = lambda offset, count: [v for v, in conn.execute(
+                f"SELECT {value} FROM estimates WHERE currency = ? AND {where} AND {value} IS NOT NULL "
+                f"ORDER BY {value} LIMIT ? OFFSET ?", (currency, group, count, offset))]
+            rows.append({by: group, 'count': n, 'mean': mean,
+                         **{f"P{round(q * 100)}": _quantile(sorted_at, n, q) for q in quantiles}})
+        return rows
+    finally:
+        conn.close()
+
+def _summarize_parquet(path: str, by: str, value: str, currency: str, quantiles: Tuple[float, ...]) -> List[Dict]:
+    try:
+        import numpy as np
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise RuntimeError("Parquet queries require pyarrow (pip install pyarrow)") from None
+
+    dataset = ds.dataset(path, format='parquet')
+    values: Dict[Optional[str], List] = {}
+    for batch in dataset.to_batches(columns=[by, value],
+                                    filter=(pc.field('currency') == currency) & pc.field(value).is_valid()):
+        encoded = batch.column(0).dictionary_encode()
+        codes = encoded.indices.fill_null(-1).to_numpy()
+        amounts = batch.column(1).to_numpy(zero_copy_only=False)
+        for code, group in enumerate([*encoded.dictionary.to_pylist(), None]):
+            selected = amounts[codes == (code if group is not None else -1)]
+            if len(selected):
+                values.setdefault(group, []).append(selected)
+    rows = []
+    for group in sorted(values, key=lambda g: (g is None, g or '')):
+        amounts = np.sort(np.concatenate(values[group]))
+        sorted_at = lambda offset, count: amounts[offset:offset + count].tolist()
+        rows.append({by: group, 'count': len(amounts), 'mean': float(amounts.mean()),
+                     **{f"P{round(q * 100)}": _quantile(sorted_at, len(amounts), q) for q in quantiles}})
+    return rows
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: List[str] = None) -> int:
+    from batch import positive_int
+    from currency import format_amount
+    from parallel import worker_count
+
+    parser = argparse.ArgumentParser(description="Ingest exported estimate CSVs and query them")
+    commands = parser.add_subparsers(dest='command', required=True)
+    load = commands.add_parser('load', help="parse CSV files/directories into a dataset")
+    load.add_argument('paths', nargs='+', help="CSV files or directories (searched recursively)")
+    load.add_argument('--db', '--output', '-o', dest='output', default='estimates.db',
+                      help="SQLite file, or a .parquet path (default: estimates.db)")
+    load.add_argument('--workers', type=worker_count, default=0, help="parser processes; 0 uses every core (default)")
+    load.add_argument('--flush-rows', type=positive_int, default=DEFAULT_FLUSH_ROWS,
+                      help="rows buffered per write (default: 50000)")
+    query = commands.add_parser('query', help="per-group count, mean and P10/P50/P90 of a total")
+    query.add_argument('dataset', help="SQLite file or .parquet written by 'load'")
+    query.add_argument('--by', choices=GROUP_COLUMNS, default='city')
+    query.add_argument('--value', choices=VALUE_COLUMNS, default='total')
+    query.add_argument('--currency', default=BASE_CURRENCY, type=str.upper,
+                       help="only estimates exported in this currency (default: CAD)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'load':
+        start = time.perf_counter()
+        try:
+            with DatasetWriter(args.output, flush_rows=args.flush_rows) as writer:
+                counts = ingest(args.paths, writer, args.workers)
+        except (OSError, RuntimeError, sqlite3.Error) as exc:
+            print(f"✗ {exc}", file=sys.stderr)
+            return 1
+        print(f"✓ Ingested {counts['estimates']:,} estimates from {counts['files']:,} files into {args.output} "
+              f"in {time.perf_counter() - start:.1f}s ({counts['skipped']:,} unchanged files skipped)")
+        if counts['failed']:
+            print(f"✗ {counts['failed']:,} files could not be parsed"
+                  + ("; see the sources table" if not args.output.endswith('.parquet') else ""), file=sys.stderr)
+        return 0
+
+    try:
+        rows = summarize(args.dataset, args.by, args.value, args.currency)
+    except (ValueError, RuntimeError, sqlite3.Error) as exc:
+        print(f"✗ {exc}", file=sys.stderr)
+        return 1
+    if not rows:
+        print(f"No {args.currency} estimates in {args.dataset}")
+        return 0
+    money = lambda amount: format_amount(amount, args.currency, 0)
+    print(f"\n📊 {args.value} by {args.by} ({args.currency})")
+    print(f"   {args.by.replace('_', ' ').title():<40} {'Count':>8} {'Median':>14} {'P10':>14} {'P90':>14}")
+    for row in rows:
+        print(f"   {str(row[args.by] or '(unknown)')[:40]:<40} {row['count']:>8,} {money(row['P50']):>14} "
+              f"{money(row['P10']):>14} {money(row['P90']):>14}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
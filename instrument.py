@@ -0,0 +1,170 @@
+"""
+Instrumentation
+Timing spans for the hot paths (data load, engine, DataFrame styling, chart
+rendering, CSV export) plus optional cProfile/tracemalloc capture, enabled
+with an environment variable:
+
+    BUDGET_PROFILE=1 python cost_estimator.py              # span timings only
+    BUDGET_PROFILE=cprofile,tracemalloc streamlit run app.py
+    BUDGET_PROFILE_DIR=/tmp/profiles ...                    # default: ./profiles
+
+Each CLI run or Streamlit rerun writes one JSON report (and a .prof file
+when cProfile is on) to the profile directory.
+
+When BUDGET_PROFILE is unset, timed() returns the function unchanged and
+span() returns a shared no-op context manager, so instrumented code pays
+one function call per span and nothing per decorated call. Spans are
+process-wide, so reports from concurrent app sessions can interleave; this
+is a development tool.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+PROFILE_ENV = 'BUDGET_PROFILE'
+PROFILE_DIR_ENV = 'BUDGET_PROFILE_DIR'
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+
+MODES = frozenset(m.strip() for m in os.environ.get(PROFILE_ENV, '').lower().split(',') if m.strip())
+ENABLED = bool(MODES) and not MODES <= {'0', 'off', 'false'}
+
+# span name → [count, total seconds, max seconds]
+_SPANS: Dict[str, List[float]] = {}
+_NOOP = contextlib.nullcontext()
+
+# ============================================================================
+# SPANS
+# ============================================================================
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stats = _SPANS.get(self.name)
+        if stats is None:
+            _SPANS[self.name] = [1, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+def span(name: str):
+    """Context manager timing the enclosed block under `name` (a no-op when disabled)."""
+    return _Span(name) if ENABLED else _NOOP
+
+def timed(name: str = None) -> Callable:
+    """Decorator form of span(); leaves the function untouched when disabled."""
+    def decorate(fn: Callable) -> Callable:
+        if not ENABLED:
+            return fn
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def spans() -> Dict[str, Dict[str, float]]:
+    return {name: {'count': int(count), 'total_ms': total * 1000, 'mean_ms': total / count * 1000,
+                   'max_ms': peak * 1000}
+            for name, (count, total, peak) in sorted(_SPANS.items(), key=lambda kv: -kv[1][1])}
+
+# ============================================================================
+# CAPTURE
+# ============================================================================
+
+class Capture:
+    """One profiled run: spans, and cProfile/tracemalloc when BUDGET_PROFILE asks for them."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.path = None
+        self._profiler = None
+        self._tracing = False
+        _SPANS.clear()
+        if 'tracemalloc' in MODES:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+            tracemalloc.reset_peak()
+        if 'cprofile' in MODES:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError:  # another profiler is active (e.g. a rerun cut short by st.stop)
+                self._profiler = None
+        self._started = time.perf_counter()
+
+    def stop(self) -> Dict:
+        """Finish the capture and write its JSON report; returns the report."""
+        wall = time.perf_counter() - self._started
+        report = {'label': self.label, 'timestamp': datetime.now().isoformat(timespec='seconds'),
+                  'wall_ms': wall * 1000, 'modes': sorted(MODES), 'spans': spans()}
+
+        directory = os.environ.get(PROFILE_DIR_ENV, 'profiles')
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"{self.label}-{datetime.now():%Y%m%d-%H%M%S-%f}")
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            import pstats
+            self._profiler.dump_stats(f"{stem}.prof")
+            stats = pstats.Stats(self._profiler)
+            rows = sorted(stats.stats.items(), key=lambda kv: -kv[1][3])[:TOP_FUNCTIONS]
+            report['cprofile'] = {'file': f"{stem}.prof", 'top_cumulative': [
+                {'function': f"{os.path.basename(file)}:{line}({func})", 'calls': nc,
+                 'total_ms': tt * 1000, 'cumulative_ms': ct * 1000}
+                for (file, line, func), (cc, nc, tt, ct, callers) in rows]}
+
+        if 'tracemalloc' in MODES:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:TOP_ALLOCATIONS]
+            report['tracemalloc'] = {'current_kb': current / 1024, 'peak_kb': peak / 1024, 'top_lines': [
+                {'line': str(stat.traceback[0]), 'size_kb': stat.size / 1024, 'blocks': stat.count}
+                for stat in top]}
+            if self._tracing:
+                tracemalloc.stop()
+
+        self.path = f"{stem}.json"
+        with open(self.path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+class _NoCapture:
+    label, path = None, None
+
+    def stop(self):
+        return None
+
+def start(label: str):
+    """Begin capturing one run/rerun (a no-op object when disabled); call .stop() at the end."""
+    return Capture(label) if ENABLED else _NoCapture()
+
+@contextlib.contextmanager
+def capture(label: str):
+    """`with capture('batch'): ...` — start()/stop() around a block."""
+    session = start(label)
+    try:
+        yield session
+    finally:
+        session.stop()
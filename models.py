@@ -0,0 +1,152 @@
+"""
+Scenario & Result Types
+Compact __slots__ records replacing the loose dicts passed between the
+collectors, the cost engine and the output functions.
+
+Per-object footprint measured with sys.getsizeof on 64-bit CPython 3.11
+(floats are 24 bytes each and counted separately; label tuples are shared):
+
+    Housing         80 bytes   (272 as the old 6-key dict)
+    Lifestyle       48 bytes   + values tuple, 40 + 8 per category (184 as a 5-key dict)
+    SummerPlan      64 bytes   (184 as {'type': 'staying'})
+    Scenario        96 bytes   (272 as an 8-key dict)
+    CostBreakdown   88 bytes   + monthly values tuple (vs a dict-of-dicts result)
+
+A staying-in-city scenario with five lifestyle categories comes to ~580
+bytes including its floats, against ~1.1 KB for the equivalent nested dicts.
+"""
+
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+from result_cache import ResultCache, cached_totals
+
+BASE_CATEGORIES = ("Rent", "Groceries", "Utilities", "Internet & Phone", "Transportation")
+LIFESTYLE_CATEGORIES = ("Dining Out", "Entertainment", "Social Activities", "Shopping", "Miscellaneous")
+
+# Label tuples are interned here so records built from the same categories share one object
+_LABELS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+def _shared(labels: Sequence[str]) -> Tuple[str, ...]:
+    labels = tuple(labels)
+    return _LABELS.setdefault(labels, labels)
+
+class _Record:
+    """Base for slot records: positional/keyword init, repr and equality."""
+    __slots__ = ()
+    _defaults: Dict = {}
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name in self.__slots__[len(args):]:
+            setattr(self, name, kwargs.pop(name, self._defaults.get(name)))
+        if kwargs:
+            raise TypeError(f"unexpected fields: {sorted(kwargs)}")
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and all(
+            getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+# ============================================================================
+# INPUTS
+# ============================================================================
+
+class Housing(_Record):
+    """Monthly housing inputs; utilities/internet are already resolved to amounts."""
+    __slots__ = ('rent', 'utilities', 'internet', 'transport_covered', 'util_incl', 'net_incl')
+    _defaults = {'transport_covered': False, 'util_incl': False, 'net_incl': False}
+
+class Lifestyle(_Record):
+    """
+    Monthly lifestyle spending as parallel (shared) labels and values tuples.
+
+    Without `labels`, values name the first LIFESTYLE_CATEGORIES in order;
+    explicit labels must match the values one to one. Raises ValueError.
+    """
+    __slots__ = ('labels', 'values')
+
+    def __init__(self, values: Sequence[float] = (), labels: Sequence[str] = None):
+        values = tuple(values)
+        if labels is None:
+            if len(values) > len(LIFESTYLE_CATEGORIES):
+                raise ValueError(f"{len(values)} lifestyle values but only {len(LIFESTYLE_CATEGORIES)} "
+                                 "default categories; pass labels")
+            labels = LIFESTYLE_CATEGORIES[:len(values)]
+        elif len(labels) != len(values):
+            raise ValueError(f"{len(values)} lifestyle values for {len(labels)} labels")
+        super().__init__(_shared(labels), values)
+
+    @classmethod
+    def from_dict(cls, amounts: Mapping[str, float]) -> 'Lifestyle':
+        return cls(tuple(amounts.values()), tuple(amounts.keys()))
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        return zip(self.labels, self.values)
+
+    def total(self) -> float:
+        return sum(self.values)
+
+class SummerPlan(_Record):
+    """'staying', 'home', or 'moving' with the summer city's housing and lifestyle."""
+    __slots__ = ('type', 'city', 'housing', 'lifestyle')
+
+    def __init__(self, type: str, city: str = None, housing: Housing = None, lifestyle: Lifestyle = None):
+        # a move with no lifestyle spending given costs only the base categories
+        super().__init__(type, city, housing, lifestyle or (Lifestyle() if type == 'moving' else None))
+
+class Scenario(_Record):
+    """One student's inputs: everything calculate_costs needs."""
+    __slots__ = ('city', 'tuition', 'housing', 'lifestyle', 'summer', 'university', 'program', 'id')
+
+    def __init__(self, city: str, tuition: float, housing: Housing, lifestyle: Lifestyle = None,
+                 summer: SummerPlan = None, university: str = None, program: str = None, id=None):
+        super().__init__(city, tuition, housing, lifestyle or Lifestyle(),
+                         summer or SummerPlan('staying'), university, program, id)
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+class CostBreakdown(_Record):
+    """Monthly category amounts (fall/winter) plus annual totals for one scenario, in `currency`."""
+    __slots__ = ('labels', 'monthly', 'fall_winter', 'summer', 'tuition', 'total', 'currency')
+    _defaults = {'currency': 'CAD'}
+
+    def monthly_items(self) -> Iterator[Tuple[str, float]]:
+        return zip(self.labels, self.monthly)
+
+    @property
+    def monthly_total(self) -> float:
+        return sum(self.monthly)
+
+    def as_dict(self) -> Dict:
+        return {'monthly': dict(self.monthly_items()), 'fall_winter': self.fall_winter,
+                'summer': self.summer, 'tuition': self.tuition, 'total': self.total, 'currency': self.currency}
+
+def summary_rows(costs: CostBreakdown) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+    """(monthly, annual) (label, amount) rows shown in the summary; zero monthly categories are dropped."""
+    monthly = [(cat, val) for cat, val in costs.monthly_items() if val > 0]
+    annual = [("Fall & Winter (8 months)", costs.fall_winter), ("Summer (4 months)", costs.summer),
+              ("Tuition", costs.tuition), ("TOTAL", costs.total)]
+    return monthly, annual
+
+def monthly_values(scenario: Scenario, city_data: Mapping[str, Mapping[str, float]]) -> Tuple[float, ...]:
+    """Fall/winter monthly amounts in BASE_CATEGORIES + lifestyle order."""
+    city_costs = city_data[scenario.city]
+    housing = scenario.housing
+    return (housing.rent, city_costs['groceries'], housing.utilities, housing.internet,
+            0 if housing.transport_covered else city_costs['transportation'],
+            *scenario.lifestyle.values)
+
+def breakdowns(scenarios: List[Scenario], city_data: Mapping[str, Mapping[str, float]],
+               cache: ResultCache = None) -> List[CostBreakdown]:
+    """Evaluate scenarios in one batched engine call (through `cache`, if given) as CostBreakdowns."""
+    return [
+        CostBreakdown(_shared(BASE_CATEGORIES + s.lifestyle.labels), monthly_values(s, city_data),
+                      fall_winter, summer, tuition, total)
+        for s, (_, fall_winter, summer, tuition, total) in zip(scenarios, cached_totals(scenarios, city_data, cache))
+    ]
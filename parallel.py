@@ -0,0 +1,80 @@
+"""
+Parallel Scenario Runner
+Shards a scenario stream across a process pool while preserving input order.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
+
+from batch import DEFAULT_CHUNK_SIZE, chunked, evaluate_chunk
+from result_cache import ResultCache
+
+# Reference tables (and an optional result cache) installed once per worker by _init_worker
+_TABLES: Dict = {}
+_CACHE: ResultCache = None
+
+def _init_worker(tables: Dict, cache_size: int = 0, cache_path: str = None):
+    """Pool initializer: receive CITY_DATA/UNIVERSITIES/PROGRAMS once per process."""
+    global _TABLES, _CACHE
+    _TABLES = tables
+    _CACHE = ResultCache(cache_size, cache_path) if cache_size else None
+
+def _run_chunk(records: List[Dict]) -> List[Dict]:
+    return evaluate_chunk(records, _TABLES, _CACHE)
+
+def default_workers() -> int:
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+
+def worker_count(text: str) -> int:
+    """argparse type for --workers: a process count, or 0 for every core."""
+    import argparse
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {text!r}") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 (every core) or more, got {value}")
+    return value
+
+def ordered_map(fn: Callable, tasks: Iterable, workers: int, prefetch: int = 2,
+                initializer: Callable = None, initargs: Sequence = ()) -> Iterator:
+    """
+    fn(task) for every task on a pool of `workers` processes, yielded in task order.
+
+    At most `workers * prefetch` tasks are in flight, which keeps memory
+    bounded on endless streams. `fn` must be a picklable module-level function.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=tuple(initargs)) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(fn, task))
+            if len(pending) >= workers * prefetch:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def evaluate_parallel(records: Iterable[Dict], tables: Dict, workers: int = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE, prefetch: int = 2,
+                      cache: ResultCache = None) -> Iterator[Dict]:
+    """
+    Evaluate records on `workers` processes, yielding results in input order.
+
+    Tasks are whole chunks, so per-task pickling is one list of records rather
+    than one call per scenario. At most `workers * prefetch` chunks are in
+    flight (see ordered_map).
+
+    In-process runs use `cache` directly; each worker process gets its own
+    cache of the same size, sharing the SQLite file when `cache` has one.
+    """
+    workers = workers or default_workers()
+    if workers == 1:
+        for chunk in chunked(records, chunk_size):
+            yield from evaluate_chunk(chunk, tables, cache)
+        return
+
+    cache_args = (cache.maxsize, cache.path) if cache is not None else ()
+    for results in ordered_map(_run_chunk, chunked(records, chunk_size), workers, prefetch,
+                               _init_worker, (tables, *cache_args)):
+        yield from results
@@ -0,0 +1,199 @@
+"""
+Reference Data
+Single source of truth for PROGRAMS, CITY_DATA and UNIVERSITIES.
+
+The bundled JSON files are validated against SCHEMA and compiled into a
+marshal snapshot that both the CLI and the Streamlit app load at startup:
+
+    python reference_data.py build    # validate + write the snapshot
+    python reference_data.py check    # fail if sources drift or the snapshot is stale
+
+load_tables() rebuilds the snapshot automatically when the bundled files
+change (detected by size/mtime), so the build step is only required in CI
+or read-only deployments.
+"""
+
+import marshal
+import os
+import sys
+from typing import Dict, List
+
+from data_loader import BUNDLED_DIR, DATASETS, DataLoader
+
+SNAPSHOT_PATH = os.path.join(BUNDLED_DIR, 'reference_data.snapshot')
+SNAPSHOT_FORMAT = 1
+
+CUSTOM_UNIVERSITY = "Custom/Other"
+
+# dataset → field → allowed types (every record must have exactly these fields)
+SCHEMA = {
+    'programs': {'multiplier': (int, float), 'emoji': (str,)},
+    'city_data': {'groceries': (int, float), 'utilities': (int, float),
+                  'transportation': (int, float), 'internet_phone': (int, float)},
+    'universities': {'city': (str, type(None)), 'tuition': (int, float)},
+}
+
+class SchemaError(ValueError):
+    """Raised when reference data does not match SCHEMA."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("reference data failed validation:\n  " + "\n  ".join(errors))
+        self.errors = errors
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def validate(data: Dict[str, Dict]) -> List[str]:
+    """Return a list of schema and cross-reference problems (empty when valid)."""
+    errors = []
+    for dataset, fields in SCHEMA.items():
+        records = data.get(dataset)
+        if not isinstance(records, dict) or not records:
+            errors.append(f"{dataset}: expected a non-empty object")
+            continue
+        for name, record in records.items():
+            if not isinstance(record, dict):
+                errors.append(f"{dataset}[{name!r}]: expected an object")
+                continue
+            missing = fields.keys() - record.keys()
+            extra = record.keys() - fields.keys()
+            if missing:
+                errors.append(f"{dataset}[{name!r}]: missing {sorted(missing)}")
+            if extra:
+                errors.append(f"{dataset}[{name!r}]: unexpected {sorted(extra)}")
+            for field, types in fields.items():
+                value = record.get(field)
+                if field in record and (not isinstance(value, types) or isinstance(value, bool)):
+                    errors.append(f"{dataset}[{name!r}].{field}: unexpected type {type(value).__name__}")
+                elif isinstance(value, (int, float)) and not isinstance(value, bool) and value < 0:
+                    errors.append(f"{dataset}[{name!r}].{field}: must be >= 0")
+    if errors:
+        return errors
+
+    cities = data['city_data']
+    for name, record in data['universities'].items():
+        if record['city'] is None and name != CUSTOM_UNIVERSITY:
+            errors.append(f"universities[{name!r}].city: only {CUSTOM_UNIVERSITY} may omit a city")
+        elif record['city'] is not None and record['city'] not in cities:
+            errors.append(f"universities[{name!r}].city: unknown city {record['city']!r}")
+    if CUSTOM_UNIVERSITY not in data['universities']:
+        errors.append(f"universities: missing {CUSTOM_UNIVERSITY!r} entry")
+    for name, record in data['programs'].items():
+        if record['multiplier'] <= 0:
+            errors.append(f"programs[{name!r}].multiplier: must be > 0")
+    return errors
+
+def compile_tables(data: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Validate raw JSON tables and return them in canonical form. Raises SchemaError."""
+    errors = validate(data)
+    if errors:
+        raise SchemaError(errors)
+    return {dataset: {name: dict(record) for name, record in data[dataset].items()}
+            for dataset in SCHEMA}
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+def _source_stamp(bundled_dir: str = BUNDLED_DIR) -> Dict[str, tuple]:
+    """(size, mtime_ns) of each bundled JSON file; a few stat() calls."""
+    stamp = {}
+    for dataset, (filename, _) in DATASETS.items():
+        st = os.stat(os.path.join(bundled_dir, filename))
+        stamp[dataset] = (st.st_size, st.st_mtime_ns)
+    return stamp
+
+def build_snapshot(path: str = SNAPSHOT_PATH, bundled_dir: str = BUNDLED_DIR) -> Dict:
+    """Validate the bundled JSON and write the marshal snapshot. Raises SchemaError."""
+    loader = DataLoader(bundled_dir=bundled_dir, offline=True)
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'stamp': _source_stamp(bundled_dir),
+        'versions': loader.versions(),
+        'tables': compile_tables(loader.load()),
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        marshal.dump(snapshot, f)
+    os.replace(tmp, path)
+    return snapshot
+
+def read_snapshot(path: str = SNAPSHOT_PATH) -> Dict:
+    """Return the snapshot dict, or None when it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            snapshot = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+def load_tables(loader: DataLoader = None, path: str = SNAPSHOT_PATH) -> Dict[str, Dict]:
+    """
+    Load {'programs', 'city_data', 'universities'} for the CLI or the app.
+
+    Without a loader the bundled data is used: the snapshot is returned as-is
+    when its source stamp matches, otherwise it is rebuilt (or, if the
+    directory is read-only, compiled in memory). With a loader (remote/cache),
+    the snapshot is used only when its content versions match the loader's;
+    remote data that fails validation is discarded from the cache and the
+    bundled tables are returned instead.
+    """
+    snapshot = read_snapshot(path)
+    if loader is None:
+        if snapshot is not None and snapshot['stamp'] == _source_stamp():
+            return snapshot['tables']
+        try:
+            return build_snapshot(path)['tables']
+        except OSError:
+            return compile_tables(DataLoader(offline=True).load())
+
+    if snapshot is not None and snapshot['versions'] == loader.sync():
+        return snapshot['tables']
+    try:
+        return compile_tables(loader.load())
+    except SchemaError:
+        loader.discard()
+        return load_tables(path=path)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def check(path: str = SNAPSHOT_PATH) -> List[str]:
+    """Problems with the bundled sources or the snapshot built from them."""
+    loader = DataLoader(offline=True)
+    errors = validate(loader.load())
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        errors.append(f"snapshot missing or unreadable: {path}")
+    elif snapshot['versions'] != loader.versions():
+        errors.append("snapshot is stale; run `python reference_data.py build`")
+    return errors
+
+def main(argv: List[str] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    command = args[0] if args else 'build'
+    if command == 'build':
+        try:
+            snapshot = build_snapshot()
+        except SchemaError as exc:
+            print(f"✗ {exc}", file=sys.stderr)
+            return 1
+        counts = ", ".join(f"{len(v)} {k}" for k, v in snapshot['tables'].items())
+        print(f"✓ Wrote {SNAPSHOT_PATH} ({counts})")
+        return 0
+    if command == 'check':
+        errors = check()
+        for error in errors:
+            print(f"✗ {error}", file=sys.stderr)
+        if not errors:
+            print("✓ Reference data and snapshot are consistent")
+        return 1 if errors else 0
+    print("usage: python reference_data.py [build|check]", file=sys.stderr)
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
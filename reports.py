@@ -0,0 +1,255 @@
+"""
+Cohort Reports
+One printable report per student (summary table plus monthly pie and annual
+bar charts) for a whole intake, from a batch-mode JSONL file:
+
+    python reports.py intake.jsonl -o reports/ --format pdf --workers 0
+    python cost_estimator.py reports intake.jsonl --format png --currency INR
+
+Pages are drawn with the Agg canvas (no GUI backend, no pyplot) across a
+process pool. Each worker builds one ReportTemplate — figure, axes, table
+text and bars — and only updates its artists per student, so a report costs
+one pie, a few set_text/set_height calls and the save. Scenarios are
+evaluated in one batched engine call per chunk.
+
+Reports are named after each record's `id` (the input position when it has
+none, and appended when two ids map to the same file). `manifest.csv` in the output directory lists every record with its
+file, total, render time in milliseconds, or the error that skipped it.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from batch import chunked, normalize_record, positive_int, read_records
+from charts import BAR_COLORS, PIE_COLORMAP
+from currency import BASE_CURRENCY, RateTable, format_amount
+from instrument import span
+from models import CostBreakdown, breakdowns, summary_rows
+
+FORMATS = ('pdf', 'png')
+MANIFEST_FIELDS = ['index', 'id', 'university', 'city', 'file', 'total', 'currency', 'render_ms', 'error']
+
+DEFAULT_CHUNK_SIZE = 32
+PAGE_SIZE = (11, 8.5)  # inches, US letter landscape
+
+# ============================================================================
+# TEMPLATE
+# ============================================================================
+
+class ReportTemplate:
+    """A report page built once; render() swaps in one student's numbers."""
+
+    def __init__(self, currency: str = BASE_CURRENCY, dpi: int = 100):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.currency = currency
+        self.dpi = dpi
+        self.fig = Figure(figsize=PAGE_SIZE)
+        FigureCanvasAgg(self.fig)
+        grid = self.fig.add_gridspec(2, 2, width_ratios=[1, 1.1], left=0.05, right=0.95, top=0.86,
+                                     bottom=0.07, wspace=0.25, hspace=0.35)
+        table_ax = self.fig.add_subplot(grid[:, 0])
+        table_ax.axis('off')
+        self.pie_ax = self.fig.add_subplot(grid[0, 1])
+        self.bar_ax = self.fig.add_subplot(grid[1, 1])
+
+        self.title = self.fig.text(0.5, 0.95, '', ha='center', fontsize=16, fontweight='bold')
+        self.subtitle = self.fig.text(0.5, 0.915, '', ha='center', fontsize=11, color='#555555')
+        text = dict(va='top', family='monospace', fontsize=10, linespacing=1.6)
+        self.labels = table_ax.text(0, 1, '', ha='left', **text)
+        self.amounts = table_ax.text(1, 1, '', ha='right', **text)
+
+        self.bars = list(self.bar_ax.bar(['Fall/Winter', 'Summer', 'Tuition'], [0, 0, 0], color=BAR_COLORS))
+        self.bar_values = [self.bar_ax.text(bar.get_x() + bar.get_width()/2, 0, '', ha='center', va='bottom',
+                                            fontweight='bold') for bar in self.bars]
+        self.bar_ax.set_ylabel(f"Amount ({currency})", fontweight='bold')
+        self.bar_ax.yaxis.set_major_formatter(lambda value, _: format_amount(value, currency, 0))
+        self._pie = []
+
+    def render(self, title: str, subtitle: str, costs: CostBreakdown):
+        """Fill the page for one (already converted) breakdown."""
+        from matplotlib import colormaps
+
+        money = lambda value: format_amount(value, self.currency)
+        self.title.set_text(title)
+        self.subtitle.set_text(subtitle)
+
+        monthly, annual = summary_rows(costs)
+        labels = ["MONTHLY (Fall/Winter)", *(f"  {label}" for label, _ in monthly), "  Total", "",
+                  "ANNUAL BREAKDOWN", *(f"  {label}" for label, _ in annual)]
+        amounts = ["", *(money(value) for _, value in monthly), money(costs.monthly_total), "",
+                   "", *(money(value) for _, value in annual)]
+        self.labels.set_text("\n".join(labels))
+        self.amounts.set_text("\n".join(amounts))
+
+        for artist in self._pie:
+            artist.remove()
+        wedges, texts, autotexts = self.pie_ax.pie(
+            [value for _, value in monthly], labels=[label for label, _ in monthly], autopct='%1.1f%%',
+            colors=colormaps[PIE_COLORMAP](range(len(monthly))), startangle=90, textprops={'fontsize': 8})
+        self._pie = [*wedges, *texts, *autotexts]
+        self.pie_ax.set_title(f"Monthly Breakdown - {format_amount(costs.monthly_total, self.currency, 0)}",
+                              fontweight='bold')
+
+        for bar, label, value in zip(self.bars, self.bar_values, (costs.fall_winter, costs.summer, costs.tuition)):
+            bar.set_height(value)
+            label.set_y(value)
+            label.set_text(format_amount(value, self.currency, 0))
+        self.bar_ax.set_ylim(0, max(costs.fall_winter, costs.summer, costs.tuition, 1) * 1.15)
+        self.bar_ax.set_title(f"Annual Breakdown - {format_amount(costs.total, self.currency, 0)}",
+                              fontweight='bold')
+
+    def save(self, path: str, fmt: str):
+        self.fig.savefig(path, format=fmt, dpi=self.dpi)
+
+# ============================================================================
+# RENDERING
+# ============================================================================
+
+def report_name(index: int, record_id) -> str:
+    """File stem for a record: its id with unsafe characters replaced, or its input position."""
+    if record_id is None or str(record_id).strip() == '':
+        return f"report_{index:06d}"
+    return re.sub(r'[^\w.-]+', '_', str(record_id).strip()).strip('.') or f"report_{index:06d}"
+
+def report_names(records: Iterable[Dict]) -> Iterator[Tuple[int, str, Dict]]:
+    """(input position, file stem, record), appending the position when a stem is already taken."""
+    taken = set()  # lower-cased, so names stay distinct on case-insensitive filesystems
+    for index, record in enumerate(records):
+        name = report_name(index, record.get('id') if isinstance(record, dict) else None)
+        while name.lower() in taken:
+            name = f"{name}_{index:06d}"
+        taken.add(name.lower())
+        yield index, name, record
+
+def render_chunk(chunk: List[Tuple[int, str, Dict]], tables: Dict, template: ReportTemplate, out_dir: str,
+                 fmt: str, rates: RateTable = None) -> List[Dict]:
+    """Render one chunk of (input position, file stem, record); returns one manifest row per record."""
+    rows, valid, positions, names = [], [], [], []
+    for index, name, record in chunk:
+        row = {'index': index, 'id': record.get('id') if isinstance(record, dict) else None}
+        try:
+            valid.append(normalize_record(record, tables))
+            positions.append(len(rows))
+            names.append(name)
+        except (ValueError, TypeError, AttributeError) as exc:
+            row['error'] = str(exc)
+        rows.append(row)
+
+    for position, name, scenario, costs in zip(positions, names, valid, breakdowns(valid, tables['city_data'])):
+        row = rows[position]
+        if template.currency != BASE_CURRENCY:
+            costs = rates.convert_breakdown(costs, template.currency)
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        program = f" · {scenario.program}" if scenario.program else ""
+        start = time.perf_counter()
+        with span('reports.render'):
+            template.render(f"Cost Estimate - {scenario.university}", f"{scenario.city}{program}"
+                            + (f" · Student {scenario.id}" if scenario.id is not None else ""), costs)
+            template.save(path, fmt)
+        row.update(university=scenario.university, city=scenario.city, file=path, total=round(costs.total, 2),
+                   currency=template.currency, render_ms=round((time.perf_counter() - start) * 1000, 2))
+    return rows
+
+# Worker state installed once per process by _init_worker
+_WORKER: Dict = {}
+
+def _init_worker(tables: Dict, out_dir: str, fmt: str, currency: str, rates: RateTable, dpi: int):
+    _WORKER.update(tables=tables, out_dir=out_dir, fmt=fmt, rates=rates, template=ReportTemplate(currency, dpi))
+
+def _render_chunk(chunk: List[Tuple[int, str, Dict]]) -> List[Dict]:
+    w = _WORKER
+    return render_chunk(chunk, w['tables'], w['template'], w['out_dir'], w['fmt'], w['rates'])
+
+def generate_reports(records: Iterable[Dict], tables: Dict, out_dir: str, fmt: str = 'pdf',
+                     currency: str = BASE_CURRENCY, rates: RateTable = None, workers: int = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, dpi: int = 100, prefetch: int = 2) -> Iterator[Dict]:
+    """
+    Write one report per record into `out_dir`, yielding manifest rows in input order.
+
+    At most `workers * prefetch` chunks are in flight (see parallel.ordered_map),
+    so memory stays bounded for any intake size.
+    """
+    from parallel import default_workers, ordered_map
+
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    if currency != BASE_CURRENCY and (rates is None or currency not in rates):
+        raise ValueError(f"unknown currency: {currency}")
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = chunked(report_names(records), chunk_size)
+    workers = workers or default_workers()
+    if workers == 1:
+        template = ReportTemplate(currency, dpi)
+        for chunk in chunks:
+            yield from render_chunk(chunk, tables, template, out_dir, fmt, rates)
+        return
+
+    for rows in ordered_map(_render_chunk, chunks, workers, prefetch, _init_worker,
+                            (tables, out_dir, fmt, currency, rates, dpi)):
+        yield from rows
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: List[str] = None) -> int:
+    from currency import load_rates
+    from parallel import worker_count
+    from reference_data import load_tables
+    from student_profile import currency_error
+
+    parser = argparse.ArgumentParser(description="Render a PDF/PNG cost report for every student in a JSONL file")
+    parser.add_argument('input', help="batch-mode JSONL scenarios ('-' for stdin)")
+    parser.add_argument('--output-dir', '-o', default='reports', help="directory for reports (default: reports)")
+    parser.add_argument('--format', choices=FORMATS, default='pdf')
+    parser.add_argument('--currency', default=BASE_CURRENCY, type=str.upper, help="amounts in this currency")
+    parser.add_argument('--workers', type=worker_count, default=0, help="worker processes; 0 uses every core (default)")
+    parser.add_argument('--chunk-size', type=positive_int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"students per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--dpi', type=positive_int, default=100, help="PNG resolution (default: 100)")
+    args = parser.parse_args(argv)
+
+    rates = load_rates()
+    error = currency_error(args.currency, rates)
+    if error:
+        print(f"✗ {error}", file=sys.stderr)
+        return 2
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    manifest_path = os.path.join(args.output_dir, 'manifest.csv')
+    timings, errors = [], 0
+    start = time.perf_counter()
+    try:
+        rows = generate_reports(read_records(source), load_tables(), args.output_dir, args.format, args.currency,
+                                rates, args.workers, args.chunk_size, args.dpi)
+        os.makedirs(args.output_dir, exist_ok=True)
+        with open(manifest_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                if 'error' in row:
+                    errors += 1
+                else:
+                    timings.append(row['render_ms'])
+    finally:
+        if source is not sys.stdin: source.close()
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    pick = lambda q: timings[min(len(timings) - 1, int(q * len(timings)))] if timings else 0
+    print(f"✓ Rendered {len(timings):,} reports to {args.output_dir}/ in {elapsed:.1f}s "
+          f"({len(timings) / elapsed if elapsed else 0:,.1f}/s)", file=sys.stderr)
+    print(f"   per report: p50 {pick(0.5):.0f} ms · p95 {pick(0.95):.0f} ms · max {pick(1):.0f} ms", file=sys.stderr)
+    if errors:
+        print(f"✗ {errors:,} records skipped; see {manifest_path}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Result Cache
+Content-addressed memoization for the cost engine. A scenario's key is the
+canonical tuple of everything its totals depend on (city, tuition, housing
+amounts, lifestyle values, summer plan, and the CITY_DATA rows involved),
+so identical scenarios from different users or batch rows share one entry,
+and editing the reference data can never serve a stale result.
+
+Entries live in a bounded in-memory LRU keyed on the tuple itself (building
+and hashing it costs well under a microsecond, far less than the engine's
+per-scenario cost). With `path`, entries are also written through to a
+SQLite file under a blake2b digest of the key, so they survive restarts and
+are found again after being evicted from memory. The file is opened in WAL
+mode with a busy timeout, so worker processes can share it.
+"""
+
+import hashlib
+import numbers
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from cost_engine import calculate_scenarios
+
+DEFAULT_CACHE_SIZE = 100_000
+DB_TIMEOUT = 30  # seconds a writer waits for another process's lock
+
+TOTALS = ('monthly', 'fall_winter', 'summer', 'tuition', 'total')
+
+Totals = Tuple[float, float, float, float, float]
+
+Key = tuple
+
+def city_fingerprints(city_data: Mapping[str, Mapping[str, float]]) -> Dict[str, tuple]:
+    """city → its CITY_DATA row as a sorted tuple, for embedding in scenario keys."""
+    return {city: tuple(sorted(costs.items())) for city, costs in city_data.items()}
+
+def scenario_key(scenario, fingerprints: Mapping[str, tuple]) -> Key:
+    """
+    Canonical key of the inputs that determine a scenario's totals.
+
+    Numbers compare by value (1200 == 1200.0), so equal inputs give equal
+    keys whatever their source types.
+    """
+    h, summer = scenario.housing, scenario.summer
+    key = (scenario.city, fingerprints[scenario.city], scenario.tuition, h.rent, h.utilities, h.internet,
+           h.transport_covered, scenario.lifestyle.values, summer.type)
+    if summer.type == 'moving':
+        sh = summer.housing
+        key += (summer.city, fingerprints[summer.city], sh.rent, sh.utilities, sh.internet,
+                sh.transport_covered, summer.lifestyle.values)
+    return key
+
+def _canonical(value):
+    if isinstance(value, tuple):
+        return tuple(map(_canonical, value))
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+def digest(key: Key) -> str:
+    """Stable content hash of a key (the on-disk identifier)."""
+    return hashlib.blake2b(repr(_canonical(key)).encode(), digest_size=16).hexdigest()
+
+class ResultCache:
+    """Bounded LRU of scenario key → totals, optionally written through to SQLite."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, path: str = None):
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be 0 or more, got {maxsize}")
+        self.maxsize = maxsize
+        self.path = path
+        self._entries: "OrderedDict[Key, Totals]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=DB_TIMEOUT, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+                             "monthly REAL, fall_winter REAL, summer REAL, tuition REAL, total REAL)")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_many(self, keys: List[Key]) -> Dict[Key, Totals]:
+        """Cached totals for whichever keys are present (memory first, then disk)."""
+        found = {}
+        with self._lock:
+            entries = self._entries
+            for key in keys:
+                totals = entries.get(key)
+                if totals is not None:
+                    entries.move_to_end(key)
+                    found[key] = totals
+            if self._db is not None and len(found) < len(keys):
+                missing = {digest(k): k for k in keys if k not in found}
+                digests = list(missing)
+                for start in range(0, len(digests), 500):
+                    batch = digests[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, {', '.join(TOTALS)} FROM results WHERE key IN ({','.join('?' * len(batch))})",
+                        batch).fetchall()
+                    for hashed, *totals in rows:
+                        key = missing[hashed]
+                        found[key] = tuple(totals)
+                        self._remember(key, found[key])
+                        self.disk_hits += 1
+            self.hits += sum(1 for k in keys if k in found)
+            self.misses += sum(1 for k in keys if k not in found)
+        return found
+
+    def put_many(self, items: Dict[Key, Totals]):
+        with self._lock:
+            for key, totals in items.items():
+                self._remember(key, totals)
+            if self._db is not None and items:
+                with self._db:
+                    self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                                         [(digest(key), *totals) for key, totals in items.items()])
+
+    def _remember(self, key: Key, totals: Totals):
+        self._entries[key] = totals
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {'entries': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits,
+                'disk_hits': self.disk_hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+# ============================================================================
+# CACHED ENGINE CALL
+# ============================================================================
+
+def cached_totals(scenarios: List, city_data: Mapping, cache: Optional[ResultCache] = None) -> List[Totals]:
+    """
+    (monthly, fall_winter, summer, tuition, total) per models.Scenario.
+
+    Only scenarios missing from the cache reach the engine, once per distinct
+    key; without a cache this is a plain calculate_scenarios call.
+    """
+    if not scenarios:
+        return []
+    if cache is None:
+        result = calculate_scenarios(scenarios, city_data)
+        return list(zip(*(result[c].tolist() for c in TOTALS)))
+
+    fingerprints = city_fingerprints(city_data)
+    keys = [scenario_key(s, fingerprints) for s in scenarios]
+    found = cache.get_many(keys)
+    todo = {}
+    for key, scenario in zip(keys, scenarios):
+        if key not in found:
+            todo.setdefault(key, scenario)
+    if todo:
+        result = calculate_scenarios(list(todo.values()), city_data)
+        computed = dict(zip(todo, zip(*(result[c].tolist() for c in TOTALS))))
+        cache.put_many(computed)
+        found.update(computed)
+    return [found[key] for key in keys]
@@ -0,0 +1,292 @@
+"""
+Estimate API Service
+Asyncio HTTP/JSON API over the cost engine (requires starlette + uvicorn):
+
+    python service.py --port 8000
+
+    POST /estimate        one scenario (batch-mode record format, see batch.py)
+                          → totals plus the itemized monthly breakdown
+    POST /estimate/batch  a list of records (or {"scenarios": [...]})
+                          → one batch-mode result row per record, in order
+    GET  /metrics         request counts, p50/p90/p99 latency, coalesced batch sizes
+    GET  /health
+
+Concurrent /estimate requests are coalesced: they queue for at most
+`max_wait_ms` (or until `max_batch` are waiting) and are evaluated together
+in one vectorized engine call on a worker thread.
+
+request() drives the app in-process over ASGI, so the service can be
+exercised without a network or an HTTP client library.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Tuple
+
+from batch import evaluate_chunk, normalize_record
+from models import Scenario, breakdowns
+
+DEFAULT_MAX_BATCH = 512
+DEFAULT_MAX_WAIT_MS = 2.0
+MAX_BATCH_RECORDS = 10_000
+LATENCY_WINDOW = 10_000
+
+# ============================================================================
+# COALESCING
+# ============================================================================
+
+class Coalescer:
+    """
+    Collects items submitted concurrently and evaluates them in one call.
+
+    `evaluate` takes a list of items and returns one result per item; it runs
+    on the default executor so the event loop keeps accepting requests. If a
+    batch raises, its items are re-evaluated one at a time, so only the ones
+    that fail on their own see the error.
+    """
+
+    def __init__(self, evaluate: Callable[[List], List], max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.evaluate = evaluate
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[object, asyncio.Future]] = []
+        self._timer = None
+        self._tasks = set()  # running batches; the loop only keeps weak references
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[object, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        items = [item for item, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(None, self.evaluate, items)
+        except Exception as exc:
+            if len(batch) == 1:
+                results = [exc]
+            else:
+                results = await loop.run_in_executor(None, self._evaluate_each, items)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _evaluate_each(self, items: List) -> List:
+        """One result or exception per item, evaluating each on its own."""
+        results = []
+        for item in items:
+            try:
+                results.append(self.evaluate([item])[0])
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    def stats(self) -> Dict:
+        return {'batches': self.batches, 'items': self.items, 'largest_batch': self.largest_batch,
+                'mean_batch': self.items / self.batches if self.batches else 0.0}
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+class LatencyTracker:
+    """Per-endpoint request counts and latency percentiles over a sliding window."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, error: bool = False):
+        self._samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+        self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+        if error:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self) -> Dict[str, Dict]:
+        report = {}
+        for endpoint, samples in self._samples.items():
+            ordered = sorted(samples)
+            pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+            report[endpoint] = {'count': self.counts[endpoint], 'errors': self.errors.get(endpoint, 0),
+                                'p50_ms': pick(0.50), 'p90_ms': pick(0.90), 'p99_ms': pick(0.99),
+                                'max_ms': ordered[-1] * 1000}
+        return report
+
+# ============================================================================
+# APP
+# ============================================================================
+
+def estimate_rows(scenarios: List[Scenario], city_data: Dict) -> List[Dict]:
+    """Batch-mode result rows plus each scenario's itemized monthly amounts, in one engine call."""
+    return [
+        {'id': s.id, 'university': s.university, 'program': s.program, 'city': s.city,
+         'monthly': costs.monthly_total, 'fall_winter': costs.fall_winter, 'summer': costs.summer,
+         'tuition': costs.tuition, 'total': costs.total, 'items': dict(costs.monthly_items())}
+        for s, costs in zip(scenarios, breakdowns(scenarios, city_data))
+    ]
+
+def create_app(tables: Dict = None, max_batch: int = DEFAULT_MAX_BATCH, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+    """Starlette app over `tables` (default: reference_data.load_tables())."""
+    try:
+        from starlette.applications import Starlette
+        from starlette.responses import JSONResponse
+        from starlette.routing import Route
+    except ImportError:
+        raise RuntimeError("The API service requires starlette (pip install starlette uvicorn)") from None
+
+    if tables is None:
+        from reference_data import load_tables
+        tables = load_tables()
+    city_data = tables['city_data']
+    coalescer = Coalescer(lambda scenarios: estimate_rows(scenarios, city_data), max_batch, max_wait_ms)
+    latency = LatencyTracker()
+
+    def timed(endpoint: str):
+        def wrap(handler):
+            async def timed_handler(request):
+                start = time.perf_counter()
+                response = await handler(request)
+                latency.record(endpoint, time.perf_counter() - start, error=response.status_code >= 400)
+                return response
+            return timed_handler
+        return wrap
+
+    async def read_json(request):
+        try:
+            return await request.json()
+        except ValueError as exc:
+            raise ValueError(f"invalid JSON: {exc}") from None
+
+    @timed('estimate')
+    async def estimate(request):
+        try:
+            record = await read_json(request)
+            if not isinstance(record, dict):
+                raise ValueError("record must be a JSON object")
+            scenario = normalize_record(record, tables)
+        except (ValueError, TypeError, AttributeError) as exc:
+            return JSONResponse({'error': str(exc)}, status_code=422)
+        try:
+            return JSONResponse(await coalescer.submit(scenario))
+        except Exception as exc:
+            return JSONResponse({'error': f"estimate failed: {exc}"}, status_code=500)
+
+    @timed('estimate_batch')
+    async def estimate_batch(request):
+        try:
+            payload = await read_json(request)
+        except ValueError as exc:
+            return JSONResponse({'error': str(exc)}, status_code=422)
+        records = payload.get('scenarios') if isinstance(payload, dict) else payload
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            return JSONResponse({'error': "expected a list of record objects"}, status_code=422)
+        if len(records) > MAX_BATCH_RECORDS:
+            return JSONResponse({'error': f"at most {MAX_BATCH_RECORDS:,} records per request"}, status_code=413)
+        results = await asyncio.get_running_loop().run_in_executor(None, evaluate_chunk, records, tables)
+        return JSONResponse({'results': results})
+
+    async def metrics(request):
+        return JSONResponse({'latency': latency.summary(), 'coalescing': coalescer.stats()})
+
+    async def health(request):
+        return JSONResponse({'status': 'ok'})
+
+    app = Starlette(routes=[
+        Route('/estimate', estimate, methods=['POST']),
+        Route('/estimate/batch', estimate_batch, methods=['POST']),
+        Route('/metrics', metrics),
+        Route('/health', health),
+    ])
+    app.state.coalescer, app.state.latency = coalescer, latency
+    return app
+
+# ============================================================================
+# LOCAL CLIENT
+# ============================================================================
+
+async def request(app, method: str, path: str, payload=None) -> Tuple[int, object]:
+    """Call an ASGI app in-process; returns (status, decoded JSON body)."""
+    body = b'' if payload is None else json.dumps(payload).encode()
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+             'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+             'root_path': '', 'headers': [(b'content-type', b'application/json'),
+                                          (b'content-length', str(len(body)).encode())],
+             'client': ('127.0.0.1', 0), 'server': ('127.0.0.1', 80)}
+    sent = False
+    status, chunks = None, []
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        await asyncio.Event().wait()  # nothing more to send; the app stops listening when done
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await app(scope, receive, send)
+    return status, json.loads(b''.join(chunks) or b'null')
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP/JSON API for the cost estimator")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help=f"largest coalesced batch (default: {DEFAULT_MAX_BATCH})")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help=f"how long a request may wait for others to join its batch (default: {DEFAULT_MAX_WAIT_MS})")
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+        app = create_app(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    except (ImportError, RuntimeError) as exc:
+        print(f"✗ {exc if isinstance(exc, RuntimeError) else 'The API service requires uvicorn (pip install uvicorn)'}",
+              file=sys.stderr)
+        return 1
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Startup Profiler
+Reports per-module import cost for the CLI and the app using CPython's
+`-X importtime`, run in a fresh interpreter so caches don't hide the cost:
+
+    python startup.py                    # cost_estimator and batch
+    python startup.py app --top 25       # app imports (runs the script in bare mode)
+    python startup.py cost_estimator --json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+def measure_imports(module: str) -> List[Dict]:
+    """Import `module` in a subprocess and return one row per imported module."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                          capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append({'module': name.strip(), 'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+                     'self_us': int(self_us), 'cumulative_us': int(cumulative_us)})
+    if proc.returncode != 0 and not rows:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr.strip()[-2000:]}")
+    return rows
+
+def direct_imports(module: str, rows: List[Dict]) -> List[Dict]:
+    """Rows for the modules `module` imports directly (importtime lists children first)."""
+    children = []
+    for row in rows:
+        if row['depth'] == 1:
+            children.append(row)
+        elif row['depth'] == 0:
+            if row['module'] == module:
+                return children
+            children = []
+    return []
+
+def summarize(module: str, rows: List[Dict], top: int) -> Dict:
+    """Total import time plus the heaviest direct imports and self-time hot spots."""
+    own = next((r for r in rows if r['depth'] == 0 and r['module'] == module), None)
+    return {
+        'module': module,
+        'total_ms': round(own['cumulative_us'] / 1000, 1) if own else 0.0,
+        'modules_imported': len(rows),
+        'heaviest_imports': sorted(direct_imports(module, rows), key=lambda r: -r['cumulative_us'])[:top],
+        'heaviest_self': sorted(rows, key=lambda r: -r['self_us'])[:top],
+    }
+
+def print_report(report: Dict):
+    print(f"\n{'='*60}\n⏱️  {report['module']}: {report['total_ms']:,.1f} ms "
+          f"({report['modules_imported']} modules)\n{'='*60}")
+    print(f"   {'Direct import':<40} {'cumulative':>12}")
+    for row in report['heaviest_imports']:
+        print(f"   {row['module']:<40} {row['cumulative_us']/1000:>9,.1f} ms")
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-module import cost report")
+    parser.add_argument('modules', nargs='*', default=['cost_estimator', 'batch'])
+    parser.add_argument('--top', type=int, default=15, help="rows per report (default: 15)")
+    parser.add_argument('--json', action='store_true', help="emit machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    reports = [summarize(m, measure_imports(m), args.top) for m in args.modules]
+    if args.json:
+        json.dump(reports, sys.stdout, indent=2)
+        print()
+    else:
+        for report in reports:
+            print_report(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Reference Data Store
+Optional SQLite backend for institution lists too large to keep in memory
+(e.g. every Canadian DLI campus with per-program tuition). Cities and
+programs stay small and are read whole; institutions are only ever read a
+page or a row at a time through indexed queries.
+
+    python store.py import                         # bundled JSON → reference_data.db
+    python store.py import --universities dli.json # add/replace institutions
+    python store.py stats
+
+Set BUDGET_DATA_DB (or pass --db to the CLI) to make the CLI menu and the
+app's university picker page through the store instead of the JSON tables.
+
+Institution files use the universities.json layout, with optional
+'province' and per-program 'programs' tuition:
+
+    {"University of Toronto": {"city": "Toronto", "tuition": 58160,
+                               "province": "ON", "programs": {"Engineering": 69000}}}
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from catalog import ALIASES, acronym, normalize
+from data_loader import BUNDLED_DIR
+from reference_data import SchemaError
+
+DB_ENV = 'BUDGET_DATA_DB'
+DEFAULT_DB_PATH = os.path.join(BUNDLED_DIR, 'reference_data.db')
+PAGE_SIZE = 20
+
+CITY_PROVINCES = {
+    'Toronto': 'ON', 'Ottawa': 'ON', 'Waterloo': 'ON', 'Guelph': 'ON',
+    'Vancouver': 'BC', 'Montreal': 'QC', 'Quebec City': 'QC',
+    'Calgary': 'AB', 'Edmonton': 'AB', 'Winnipeg': 'MB', 'Halifax': 'NS',
+}
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS cities (
+    name TEXT PRIMARY KEY, province TEXT,
+    groceries REAL NOT NULL, utilities REAL NOT NULL,
+    transportation REAL NOT NULL, internet_phone REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS programs (
+    name TEXT PRIMARY KEY, multiplier REAL NOT NULL, emoji TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS institutions (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, name_key TEXT NOT NULL,
+    city TEXT REFERENCES cities(name), province TEXT, tuition REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS program_tuition (
+    institution_id INTEGER NOT NULL REFERENCES institutions(id) ON DELETE CASCADE,
+    program TEXT NOT NULL, tuition REAL NOT NULL,
+    PRIMARY KEY (institution_id, program)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS aliases (
+    alias_key TEXT PRIMARY KEY,
+    institution_id INTEGER NOT NULL REFERENCES institutions(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_institutions_menu ON institutions (city IS NULL, city, name);
+CREATE INDEX IF NOT EXISTS ix_institutions_city ON institutions (city, name);
+CREATE INDEX IF NOT EXISTS ix_institutions_province ON institutions (province, city, name);
+CREATE INDEX IF NOT EXISTS ix_institutions_name_key ON institutions (name_key);
+CREATE INDEX IF NOT EXISTS ix_program_tuition_program ON program_tuition (program, tuition);
+"""
+
+# Menu order: grouped by city, Custom/Other (no city) last
+_ORDER = "ORDER BY city IS NULL, city, name"
+
+class ReferenceStore:
+    """
+    SQLite-backed reference data; use as a context manager or call close().
+
+    One connection may be shared across threads (e.g. Streamlit sessions);
+    queries are serialized on a lock.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(SCHEMA_SQL)
+
+    def __enter__(self) -> 'ReferenceStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+
+    def import_tables(self, tables: Mapping[str, Mapping]) -> Dict[str, int]:
+        """Load compiled reference tables (see reference_data.load_tables); returns row counts."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cities VALUES (?, ?, ?, ?, ?, ?)",
+                [(name, CITY_PROVINCES.get(name), c['groceries'], c['utilities'],
+                  c['transportation'], c['internet_phone']) for name, c in tables['city_data'].items()])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO programs VALUES (?, ?, ?)",
+                [(name, p['multiplier'], p['emoji']) for name, p in tables['programs'].items()])
+        count = self.import_universities(tables['universities'])
+        return {'cities': len(tables['city_data']), 'programs': len(tables['programs']), 'universities': count}
+
+    def import_universities(self, records: Mapping[str, Mapping]) -> int:
+        """Insert or replace institutions (optionally with 'province' and per-program 'programs'). Raises SchemaError."""
+        cities = dict(self._conn.execute("SELECT name, province FROM cities"))
+        programs = {name for name, in self._conn.execute("SELECT name FROM programs")}
+        errors = []
+        for name, record in records.items():
+            if record.get('city') is not None and record['city'] not in cities:
+                errors.append(f"universities[{name!r}].city: unknown city {record['city']!r}")
+            if not isinstance(record.get('tuition'), (int, float)) or record['tuition'] < 0:
+                errors.append(f"universities[{name!r}].tuition: expected a number >= 0")
+            for program in record.get('programs', {}):
+                if program not in programs:
+                    errors.append(f"universities[{name!r}].programs: unknown program {program!r}")
+        if errors:
+            raise SchemaError(errors)
+
+        with self._conn:
+            for name, record in records.items():
+                city = record.get('city')
+                province = record.get('province') or cities.get(city)
+                self._conn.execute("DELETE FROM institutions WHERE name = ?", (name,))
+                cursor = self._conn.execute(
+                    "INSERT INTO institutions (name, name_key, city, province, tuition) VALUES (?, ?, ?, ?, ?)",
+                    (name, normalize(name), city, province, record['tuition']))
+                self._conn.executemany(
+                    "INSERT INTO program_tuition VALUES (?, ?, ?)",
+                    [(cursor.lastrowid, program, amount) for program, amount in record.get('programs', {}).items()])
+            self._rebuild_aliases()
+        return len(records)
+
+    def _rebuild_aliases(self):
+        """Unique generated acronyms plus catalog.ALIASES, as in Catalog.lookup()."""
+        by_acronym: Dict[str, List[int]] = {}
+        for row_id, name in self._conn.execute("SELECT id, name FROM institutions"):
+            by_acronym.setdefault(acronym(name), []).append(row_id)
+        rows = {key: ids[0] for key, ids in by_acronym.items() if key and len(ids) == 1}
+        for alias, name in ALIASES.items():
+            found = self._conn.execute("SELECT id FROM institutions WHERE name = ?", (name,)).fetchone()
+            if found:
+                rows.setdefault(normalize(alias), found[0])
+        self._conn.execute("DELETE FROM aliases")
+        self._conn.executemany("INSERT INTO aliases VALUES (?, ?)", rows.items())
+
+    # ------------------------------------------------------------------
+    # Small tables, read whole
+    # ------------------------------------------------------------------
+
+    def city_data(self) -> Dict[str, Dict[str, float]]:
+        return {name: {'groceries': g, 'utilities': u, 'transportation': t, 'internet_phone': i}
+                for name, g, u, t, i in self._query(
+                    "SELECT name, groceries, utilities, transportation, internet_phone FROM cities")}
+
+    def programs(self) -> Dict[str, Dict]:
+        return {name: {'multiplier': m, 'emoji': e}
+                for name, m, e in self._query("SELECT name, multiplier, emoji FROM programs")}
+
+    def provinces(self) -> List[str]:
+        return [p for p, in self._query(
+            "SELECT DISTINCT province FROM institutions WHERE province IS NOT NULL ORDER BY province")]
+
+    def cities(self, province: str = None) -> List[str]:
+        if province is None:
+            return [c for c, in self._query("SELECT name FROM cities ORDER BY name")]
+        return [c for c, in self._query(
+            "SELECT DISTINCT city FROM institutions WHERE province = ? ORDER BY city", (province,))]
+
+    # ------------------------------------------------------------------
+    # Institutions, paged
+    # ------------------------------------------------------------------
+
+    def _where(self, city: str = None, province: str = None, search: str = None) -> Tuple[str, list]:
+        clauses, params = [], []
+        if city is not None:
+            clauses.append("city = ?")
+            params.append(city)
+        if province is not None:
+            clauses.append("province = ?")
+            params.append(province)
+        if search:
+            key = normalize(search)
+            # word-prefix match on the normalized name, or an exact alias ("UBC", "U of T")
+            clauses.append("(' ' || name_key LIKE ? ESCAPE '\\' OR id IN (SELECT institution_id FROM aliases "
+                           "WHERE alias_key = ?))")
+            escaped = key.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.extend([f"% {escaped}%", key])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, city: str = None, province: str = None, search: str = None) -> int:
+        where, params = self._where(city, province, search)
+        return self._query(f"SELECT COUNT(*) FROM institutions{where}", params)[0][0]
+
+    def page(self, page: int = 0, page_size: int = PAGE_SIZE, city: str = None, province: str = None,
+             search: str = None) -> List[Tuple[str, Optional[str], float]]:
+        """(name, city, base tuition) rows for one page, grouped by city."""
+        where, params = self._where(city, province, search)
+        return self._query(
+            f"SELECT name, city, tuition FROM institutions{where} {_ORDER} LIMIT ? OFFSET ?",
+            params + [page_size, page * page_size])
+
+    def university(self, name: str) -> Optional[Dict]:
+        """{'city', 'province', 'tuition'} for one institution, or None."""
+        row = self._query(
+            "SELECT city, province, tuition FROM institutions WHERE name = ?", (name,))
+        return dict(zip(('city', 'province', 'tuition'), row[0])) if row else None
+
+    def tuition(self, name: str, program: str = None) -> Optional[float]:
+        """Per-program tuition when the store has it, else base tuition × the program multiplier."""
+        row = self._query(
+            "SELECT COALESCE(pt.tuition, i.tuition * COALESCE(p.multiplier, 1.0)) FROM institutions i "
+            "LEFT JOIN programs p ON p.name = ? "
+            "LEFT JOIN program_tuition pt ON pt.institution_id = i.id AND pt.program = p.name "
+            "WHERE i.name = ?", (program, name))
+        return row[0][0] if row else None
+
+    def stats(self) -> Dict[str, int]:
+        return {table: self._query(f"SELECT COUNT(*) FROM {table}")[0][0]
+                for table in ('cities', 'programs', 'institutions', 'program_tuition', 'aliases')}
+
+def open_store(path: str = None) -> Optional[ReferenceStore]:
+    """The store at `path` or $BUDGET_DATA_DB (None when neither is set), importing the bundled JSON if empty."""
+    path = path or os.environ.get(DB_ENV)
+    if not path:
+        return None
+    store = ReferenceStore(path)
+    if not store.count():
+        from reference_data import load_tables
+        store.import_tables(load_tables())
+    return store
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="SQLite reference data store")
+    parser.add_argument('command', choices=['import', 'stats'])
+    parser.add_argument('--db', default=os.environ.get(DB_ENV, DEFAULT_DB_PATH),
+                        help=f"database path (default: ${DB_ENV} or {DEFAULT_DB_PATH})")
+    parser.add_argument('--universities', metavar='FILE', action='append', default=[],
+                        help="extra institutions JSON to import (repeatable)")
+    args = parser.parse_args(argv)
+
+    with ReferenceStore(args.db) as store:
+        if args.command == 'import':
+            from reference_data import load_tables
+            try:
+                counts = store.import_tables(load_tables())
+                for path in args.universities:
+                    with open(path, encoding='utf-8') as f:
+                        counts['universities'] += store.import_universities(json.load(f))
+            except (OSError, ValueError) as exc:
+                print(f"✗ {exc}", file=sys.stderr)
+                return 1
+            print(f"✓ Imported into {args.db}: " + ", ".join(f"{n:,} {k}" for k, n in counts.items()))
+        else:
+            for table, n in store.stats().items():
+                print(f"   {table:<16} {n:>10,}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
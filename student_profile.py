@@ -0,0 +1,45 @@
+"""
+Student Profile Options
+Command-line options shared by the tools that describe one student (rent,
+lifestyle, transit pass, summer plan) and show amounts in a chosen currency:
+comparison.py, affordability.py, reports.py and cost_estimator.py.
+"""
+
+import argparse
+from typing import Optional
+
+from models import Housing, Lifestyle, SummerPlan
+
+DEFAULT_RENT = 1200
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """--rent, --lifestyle, --transit-pass and --summer."""
+    from sweep import DEFAULT_LIFESTYLE
+
+    parser.add_argument('--rent', type=float, default=DEFAULT_RENT, help=f"monthly rent (default: {DEFAULT_RENT})")
+    parser.add_argument('--lifestyle', type=float, metavar='AMOUNT',
+                        help=f"monthly lifestyle spending (default: {sum(DEFAULT_LIFESTYLE.values()):,.0f}, "
+                             "the app's defaults)")
+    parser.add_argument('--transit-pass', action='store_true', help="university includes a transit pass")
+    parser.add_argument('--summer', choices=['staying', 'home'], default='staying')
+
+def profile_lifestyle(args: argparse.Namespace) -> Lifestyle:
+    """The app's default categories, or one 'Lifestyle' line of --lifestyle AMOUNT."""
+    from sweep import DEFAULT_LIFESTYLE
+
+    if args.lifestyle is None:
+        return Lifestyle.from_dict(DEFAULT_LIFESTYLE)
+    return Lifestyle((args.lifestyle,), ("Lifestyle",))
+
+def profile_housing(args: argparse.Namespace, city_costs: dict) -> Housing:
+    """--rent plus the city's default utilities and internet."""
+    return Housing(args.rent, city_costs['utilities'], city_costs['internet_phone'], args.transit_pass)
+
+def profile_summer(args: argparse.Namespace) -> SummerPlan:
+    return SummerPlan(args.summer)
+
+def currency_error(currency: str, rates) -> Optional[str]:
+    """Error message when `rates` has no rate for `currency`, else None."""
+    if currency in rates:
+        return None
+    return f"Unknown currency {currency}; choose from {', '.join(rates.codes)}"
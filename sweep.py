@@ -0,0 +1,210 @@
+"""
+Cartesian Sweep Generator
+Evaluates every university × program × summer plan × rent level combination
+and writes the result as a columnar file (.npz, or .parquet with pyarrow).
+
+Rows are generated lazily from flat indices, so no per-row Python objects are
+ever built and memory is bounded by the chunk size:
+
+    python sweep.py --rents 800:2400:100 -o sweep.npz
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import zipfile
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from cost_engine import SUMMER_CODES, calculate_batch
+
+# Lifestyle profile used for every row (same defaults as the Streamlit sidebar)
+DEFAULT_LIFESTYLE = {"Dining Out": 200, "Entertainment": 100, "Social Activities": 150,
+                     "Shopping": 100, "Miscellaneous": 100}
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+# ============================================================================
+# GRID
+# ============================================================================
+
+class SweepGrid:
+    """
+    Lazily enumerated university × program × summer × rent grid.
+
+    Row i maps to axis positions via np.unravel_index, so any slice of the grid
+    can be produced directly as arrays of integer codes.
+    """
+
+    def __init__(self, tables: Dict, rents: Sequence[float],
+                 summer_plans: Sequence[str] = ('staying', 'home'),
+                 lifestyle: Dict[str, float] = None, transport_covered: bool = False):
+        self.city_data = tables['city_data']
+        self.city_names = list(self.city_data)
+        city_index = {c: i for i, c in enumerate(self.city_names)}
+
+        universities = {u: d for u, d in tables['universities'].items() if d['city'] is not None}
+        self.university_names = list(universities)
+        self.uni_city = np.array([city_index[d['city']] for d in universities.values()], dtype=np.int16)
+        self.uni_tuition = np.array([d['tuition'] for d in universities.values()], dtype=np.float64)
+
+        self.program_names = list(tables['programs'])
+        self.multipliers = np.array([p['multiplier'] for p in tables['programs'].values()])
+
+        self.utilities = np.array([self.city_data[c]['utilities'] for c in self.city_names], dtype=np.float64)
+        self.internet = np.array([self.city_data[c]['internet_phone'] for c in self.city_names], dtype=np.float64)
+
+        # 'moving:<City>' relocates for the summer at the same rent with city defaults
+        self.summer_names = list(summer_plans)
+        codes, summer_cities = [], []
+        for plan in summer_plans:
+            kind, _, dest = plan.partition(':')
+            if kind not in SUMMER_CODES or (kind == 'moving') != (dest in city_index):
+                raise ValueError(f"unknown summer plan: {plan!r}")
+            codes.append(SUMMER_CODES[kind])
+            summer_cities.append(city_index.get(dest, 0))
+        self.summer_codes = np.array(codes, dtype=np.int8)
+        self.summer_cities = np.array(summer_cities, dtype=np.int16)
+
+        self.rents = np.asarray(rents, dtype=np.float64)
+        self.lifestyle = np.array(list((lifestyle or DEFAULT_LIFESTYLE).values()), dtype=np.float64)
+        self.transport_covered = transport_covered
+
+        self.shape = (len(self.university_names), len(self.program_names),
+                      len(self.summer_names), len(self.rents))
+
+    def __len__(self) -> int:
+        return int(np.prod(self.shape))
+
+    def labels(self) -> Dict[str, List[str]]:
+        """Code → name tables for the categorical columns."""
+        return {'university': self.university_names, 'program': self.program_names,
+                'summer_plan': self.summer_names, 'city': self.city_names}
+
+    def evaluate(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        """Compute rows [start, stop) of the grid as column arrays."""
+        u, p, s, r = np.unravel_index(np.arange(start, stop), self.shape)
+        city = self.uni_city[u]
+        lifestyle = np.broadcast_to(self.lifestyle, (stop - start, len(self.lifestyle)))
+        summer_city = self.summer_cities[s]
+        costs = calculate_batch(
+            city, self.uni_tuition[u] * self.multipliers[p], self.rents[r], self.utilities[city],
+            self.internet[city], self.transport_covered, lifestyle, self.summer_codes[s], self.city_data,
+            summer_city=summer_city, summer_rent=self.rents[r],
+            summer_utilities=self.utilities[summer_city], summer_internet=self.internet[summer_city],
+            summer_transport_covered=self.transport_covered, summer_lifestyle=lifestyle,
+        )
+        return {
+            'university': u.astype(np.int16), 'program': p.astype(np.int16),
+            'summer_plan': s.astype(np.int8), 'city': city, 'rent': self.rents[r],
+            'tuition': costs['tuition'], 'monthly': costs['monthly'],
+            'fall_winter': costs['fall_winter'], 'summer': costs['summer'], 'total': costs['total'],
+        }
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+        """Stream the grid in column-array chunks of at most chunk_size rows."""
+        for start in range(0, len(self), chunk_size):
+            yield self.evaluate(start, min(start + chunk_size, len(self)))
+
+# ============================================================================
+# WRITERS
+# ============================================================================
+
+def write_npz(grid: SweepGrid, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Write the sweep as an .npz archive.
+
+    The final length is known up front, so each column is written as an .npy
+    header followed by chunk bytes appended in order, then packed into the
+    archive; peak memory is one chunk regardless of grid size.
+    """
+    total = len(grid)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as tmp:
+        files = {}
+        try:
+            for chunk in grid.chunks(chunk_size):
+                for name, values in chunk.items():
+                    if name not in files:
+                        files[name] = open(os.path.join(tmp, f"{name}.npy"), 'wb')
+                        header = {'descr': np.lib.format.dtype_to_descr(values.dtype),
+                                  'fortran_order': False, 'shape': (total,)}
+                        np.lib.format.write_array_header_2_0(files[name], header)
+                    files[name].write(np.ascontiguousarray(values).tobytes())
+        finally:
+            for f in files.values():
+                f.close()
+
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for name in files:
+                zf.write(os.path.join(tmp, f"{name}.npy"), f"{name}.npy")
+            for name, values in grid.labels().items():
+                with zf.open(f"{name}_labels.npy", 'w') as f:
+                    np.lib.format.write_array(f, np.array(values))
+    return total
+
+def write_parquet(grid: SweepGrid, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write the sweep as Parquet, one row group per chunk (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from None
+
+    labels = {name: pa.array(values) for name, values in grid.labels().items()}
+    writer = None
+    try:
+        for chunk in grid.chunks(chunk_size):
+            arrays = {
+                name: (pa.DictionaryArray.from_arrays(pa.array(values.astype(np.int32)), labels[name])
+                       if name in labels else pa.array(values))
+                for name, values in chunk.items()
+            }
+            table = pa.table(arrays)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return len(grid)
+
+def run_sweep(grid: SweepGrid, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write the sweep in the format implied by the file extension."""
+    if path.endswith('.parquet'):
+        return write_parquet(grid, path, chunk_size)
+    if path.endswith('.npz'):
+        return write_npz(grid, path, chunk_size)
+    raise ValueError("output must end in .npz or .parquet")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def parse_rents(spec: str) -> np.ndarray:
+    """'800:2400:100' → 800, 900, ..., 2400; '900,1200' → [900, 1200]."""
+    if ':' in spec:
+        start, stop, step = (float(x) for x in spec.split(':'))
+        return np.arange(start, stop + step / 2, step)
+    return np.array([float(x) for x in spec.split(',')])
+
+def main(argv: List[str] = None) -> int:
+    from batch import positive_int
+
+    parser = argparse.ArgumentParser(description="University × program × summer × rent sweep")
+    parser.add_argument('--rents', default='800:2400:100', help="START:STOP:STEP or comma list")
+    parser.add_argument('--summer', default='staying,home',
+                        help="comma list of summer plans: staying, home, moving:<City>")
+    parser.add_argument('--chunk-size', type=positive_int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--output', '-o', default='sweep.npz', help="output .npz or .parquet file")
+    args = parser.parse_args(argv)
+
+    from cost_estimator import reference_tables
+    grid = SweepGrid(reference_tables(), parse_rents(args.rents), args.summer.split(','))
+    rows = run_sweep(grid, args.output, args.chunk_size)
+    print(f"✓ Wrote {rows:,} rows to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Cash-Flow Timeline
+Month-by-month cash flow for one scenario over 1-4 academic years, starting
+in September: tuition installments, the move-in deposit, fall/winter living
+costs, and the summer (staying, home, or a move to another city).
+
+Each component lives in its own array and only writes the months it owns, so
+Timeline.update() recomputes just the components an input change touches,
+e.g. a new summer rent rewrites the four summer months of each year and
+nothing else. That keeps the app's sidebar responsive across reruns.
+"""
+
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from cost_engine import FALL_WINTER_MONTHS
+from models import Scenario, monthly_values
+
+MONTH_NAMES = ('Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug')
+MAX_YEARS = 4
+
+DEFAULT_INFLATION = 0.03                     # annual, applied each September
+DEFAULT_INSTALLMENTS = ((0, 0.5), (4, 0.5))  # (month offset, share of tuition): Sep and Jan
+
+COMPONENTS = ('tuition', 'deposit', 'living', 'summer')
+
+# ============================================================================
+# TIMELINE
+# ============================================================================
+
+class Timeline:
+    """
+    Cash-flow series for one scenario; `components[name][m]` is the amount due
+    in month m (0 = September of year one).
+
+    `inflation` is one annual rate or a {city: rate} mapping (missing cities
+    use DEFAULT_INFLATION). Year one matches calculate_costs exactly when
+    `deposit_months` is 0.
+    """
+
+    def __init__(self, scenario: Scenario, city_data: Mapping[str, Mapping[str, float]], years: int = 1,
+                 inflation: Union[float, Mapping[str, float]] = DEFAULT_INFLATION,
+                 installments: Sequence[Tuple[int, float]] = DEFAULT_INSTALLMENTS,
+                 tuition_increase: float = 0.0, deposit_months: float = 0.0):
+        if not 1 <= years <= MAX_YEARS:
+            raise ValueError(f"years must be between 1 and {MAX_YEARS}")
+        self.city_data = city_data
+        self.years = years
+        self.inflation = inflation
+        self.installments = tuple(installments)
+        self.tuition_increase = tuition_increase
+        self.deposit_months = deposit_months
+
+        month = np.arange(12 * years)
+        self._year = month // 12
+        self._term = month % 12 < FALL_WINTER_MONTHS
+        self.components: Dict[str, np.ndarray] = {name: np.zeros(12 * years) for name in COMPONENTS}
+
+        self.scenario = scenario
+        self.recomputed: Tuple[str, ...] = ()
+        self._recompute(COMPONENTS)
+
+    def __len__(self) -> int:
+        return 12 * self.years
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def update(self, scenario: Scenario) -> Tuple[str, ...]:
+        """Switch to `scenario`, recomputing only the affected components (returned)."""
+        old, self.scenario = self.scenario, scenario
+        dirty = set()
+        if scenario.tuition != old.tuition:
+            dirty.add('tuition')
+        if (scenario.city, scenario.housing, scenario.lifestyle) != (old.city, old.housing, old.lifestyle):
+            dirty.update(('living', 'deposit'))
+            if scenario.summer.type == 'staying':
+                dirty.add('summer')
+        if scenario.summer != old.summer:
+            dirty.update(('summer', 'deposit'))
+        self._recompute(tuple(name for name in COMPONENTS if name in dirty))
+        return self.recomputed
+
+    def _recompute(self, names: Tuple[str, ...]):
+        for name in names:
+            getattr(self, f'_compute_{name}')(self.components[name])
+        self.recomputed = names
+
+    def _rate(self, city: str) -> float:
+        if isinstance(self.inflation, Mapping):
+            return self.inflation.get(city, DEFAULT_INFLATION)
+        return self.inflation
+
+    def _growth(self, city: str) -> np.ndarray:
+        """Per-month price level relative to year one for `city`."""
+        return (1 + self._rate(city)) ** self._year
+
+    def _summer_monthly(self) -> float:
+        plan = self.scenario.summer
+        if plan.type == 'home':
+            return 0.0
+        if plan.type == 'staying':
+            return sum(monthly_values(self.scenario, self.city_data))
+        moved = Scenario(plan.city, 0, plan.housing, plan.lifestyle)
+        return sum(monthly_values(moved, self.city_data))
+
+    # ------------------------------------------------------------------
+    # Components: each writes only the months it owns
+    # ------------------------------------------------------------------
+
+    def _compute_tuition(self, out: np.ndarray):
+        tuition = float(self.scenario.tuition)
+        for year in range(self.years):
+            for offset, share in self.installments:
+                out[12 * year + offset] = tuition * share * (1 + self.tuition_increase) ** year
+
+    def _compute_deposit(self, out: np.ndarray):
+        out[0] = self.scenario.housing.rent * self.deposit_months
+        plan = self.scenario.summer
+        for year in range(self.years):
+            move_in = 12 * year + FALL_WINTER_MONTHS
+            out[move_in] = plan.housing.rent * self.deposit_months if plan.type == 'moving' else 0.0
+
+    def _compute_living(self, out: np.ndarray):
+        monthly = sum(monthly_values(self.scenario, self.city_data))
+        term = self._term
+        out[term] = monthly * self._growth(self.scenario.city)[term]
+
+    def _compute_summer(self, out: np.ndarray):
+        plan = self.scenario.summer
+        summer = ~self._term
+        city = plan.city if plan.type == 'moving' else self.scenario.city
+        out[summer] = self._summer_monthly() * self._growth(city)[summer]
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def series(self) -> np.ndarray:
+        """Total cash needed in each month."""
+        return sum(self.components[name] for name in COMPONENTS)
+
+    def cumulative(self) -> np.ndarray:
+        return np.cumsum(self.series())
+
+    def annual_totals(self) -> np.ndarray:
+        return self.series().reshape(self.years, 12).sum(axis=1)
+
+    def labels(self, start_year: int = None) -> List[str]:
+        """'Sep 2025', 'Oct 2025', ... or 'Y1 Sep', ... when no start year is given."""
+        if start_year is None:
+            return [f"Y{m // 12 + 1} {MONTH_NAMES[m % 12]}" for m in range(len(self))]
+        return [f"{MONTH_NAMES[m % 12]} {start_year + (m + 8) // 12}" for m in range(len(self))]
+
+    def rows(self, start_year: int = None) -> List[Dict]:
+        """One dict per month: label, each component, total and cumulative."""
+        total, running = self.series(), self.cumulative()
+        return [{'month': label, **{name: float(self.components[name][m]) for name in COMPONENTS},
+                 'total': float(total[m]), 'cumulative': float(running[m])}
+                for m, label in enumerate(self.labels(start_year))]